@@ -0,0 +1,296 @@
+"""
+Citation throughput benchmark for rag_citation.
+
+Cites synthetic workloads (see workload.py) with each method and reports, per
+workload and method:
+    - latency: p50, p90 and p99 of the time per cite item, in ms.
+    - items/s: throughput over all repeats.
+    - stages: p50, p90 and p99 of each pipeline stage per cite item, in ms.
+    - counters: mean of each pipeline counter per cite item.
+
+The batch method times `Inference.batch` calls of `--batch-size` items, and its
+latencies are the per-item share of each call.
+
+By default the models are the offline stubs of stubs.py, so the numbers measure
+the pipeline rather than the models and are stable across machines. Pass
+`--spacy-model sm` and `--embedding-model sm` to measure the real models.
+
+Usage:
+    python benchmarks/citation.py
+    python benchmarks/citation.py --workloads large --methods non-llm batch
+    python benchmarks/citation.py --output after.json --baseline benchmarks/baselines/stub.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+# Benchmark the working tree, not an installed copy of the package.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from stubs import StubEmbeddingModel, StubLiteLLM, install_stub_spacy
+from workload import WORKLOADS, generate_cite_items
+
+METHODS = ("non-llm", "top-k", "batch", "llm", "hybrid")
+STAGES = (
+    "focus_word",
+    "pair",
+    "embed",
+    "cite",
+    "find_label",
+    "making_cite_pair",
+    "llm",
+)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """The q-th percentile of `values`, interpolated between the closest ranks."""
+    values = sorted(values)
+    rank = (len(values) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {f"p{q}": 1000 * percentile(values, q) for q in (50, 90, 99)}
+
+
+def build_inference(method: str, options: dict, metrics_hook):
+    """Create the Inference of a benchmark method."""
+    from rag_citation import Inference
+
+    kwargs = {
+        "method": "non-llm" if method in ("non-llm", "top-k", "batch") else method,
+        "therhold_value": options["threshold"],
+        "metrics_hook": metrics_hook,
+    }
+    if method == "top-k":
+        kwargs["pairing"] = "top-k"
+        kwargs["top_k"] = options["top_k"]
+    if method in ("llm", "hybrid"):
+        kwargs["model"] = "benchmark/stub"
+    if method in ("non-llm", "batch", "hybrid"):
+        kwargs["idf_filter"] = options["idf_filter"]
+        kwargs["min_idf"] = options["min_idf"]
+        kwargs["max_pairs_per_word"] = options["max_pairs_per_word"]
+    if method != "llm":
+        if options["spacy_model"] == "stub":
+            install_stub_spacy("sm")
+            kwargs["spacy_model"] = "sm"
+        else:
+            kwargs["spacy_model"] = options["spacy_model"]
+        if options["embedding_model"] == "stub":
+            kwargs["embedding_model"] = StubEmbeddingModel()
+        else:
+            kwargs["embedding_model"] = options["embedding_model"]
+
+    inference = Inference(**kwargs)
+    if method in ("llm", "hybrid"):
+        inference._llm_citation._litellm = StubLiteLLM(options["llm_latency_ms"])
+    return inference.warmup()
+
+
+def run_method(method: str, cite_items: list, options: dict) -> dict:
+    """Cite the items `repeat` times with a method and summarize the metrics."""
+    samples = []
+    inference = build_inference(method, options, samples.append)
+    batch_size = options["batch_size"]
+
+    def cite_all() -> None:
+        if method == "batch":
+            for start in range(0, len(cite_items), batch_size):
+                inference.batch(
+                    cite_items[start : start + batch_size], batch_size=batch_size
+                )
+        else:
+            for cite_item in cite_items:
+                inference(cite_item)
+
+    # One untimed pass, so caches and lazily loaded models are warm.
+    cite_all()
+    samples.clear()
+
+    start = time.perf_counter()
+    for _ in range(options["repeat"]):
+        cite_all()
+    elapsed = time.perf_counter() - start
+
+    items = sum(sample.items for sample in samples)
+    timings = defaultdict(list)
+    counters = defaultdict(int)
+    for sample in samples:
+        timings["total"].append(sample.total / sample.items)
+        for stage in STAGES:
+            if stage in sample.timings:
+                timings[stage].append(sample.timings[stage] / sample.items)
+        for name, value in sample.counters.items():
+            counters[name] += value
+
+    return {
+        "items": items,
+        "items_per_s": items / elapsed,
+        "latency_ms": summarize(timings.pop("total")),
+        "stages_ms": {stage: summarize(values) for stage, values in timings.items()},
+        "counters": {name: value / items for name, value in sorted(counters.items())},
+    }
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        List[str]: One line per workload and method whose throughput dropped, or
+                   whose p50 latency grew, by more than `max_regression`.
+    """
+    regressions = []
+    for workload, methods in results.items():
+        for method, result in methods.items():
+            previous = baseline.get(workload, {}).get(method)
+            if previous is None:
+                continue
+            throughput = result["items_per_s"] / previous["items_per_s"] - 1
+            latency = result["latency_ms"]["p50"] / previous["latency_ms"]["p50"] - 1
+            print(
+                f"{workload:<8}{method:<9} items/s {throughput:+7.1%}   "
+                f"p50 {latency:+7.1%}"
+            )
+            if throughput < -max_regression or latency > max_regression:
+                regressions.append(
+                    f"{workload}/{method}: items/s {throughput:+.1%}, p50 {latency:+.1%}"
+                )
+    return regressions
+
+
+def print_report(results: dict) -> None:
+    print(
+        f"{'workload':<10}{'method':<9}{'items/s':>10}"
+        f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+    )
+    for workload, methods in results.items():
+        for method, result in methods.items():
+            latency = result["latency_ms"]
+            print(
+                f"{workload:<10}{method:<9}{result['items_per_s']:>10.1f}"
+                f"{latency['p50']:>9.2f}{latency['p90']:>9.2f}{latency['p99']:>9.2f}"
+            )
+            for stage, stage_latency in result["stages_ms"].items():
+                print(
+                    f"{'':<10}  {stage:<17}{stage_latency['p50']:>9.2f}"
+                    f"{stage_latency['p90']:>9.2f}{stage_latency['p99']:>9.2f}"
+                )
+            counters = ", ".join(
+                f"{name}={value:.1f}" for name, value in result["counters"].items()
+            )
+            print(f"{'':<10}  {counters}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--workloads",
+        nargs="+",
+        choices=list(WORKLOADS),
+        default=["small", "medium"],
+        help="Workloads to cite. Defaults to small and medium.",
+    )
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=METHODS,
+        default=["non-llm", "top-k", "batch"],
+        help="Methods to measure. llm and hybrid call a stub LLM. "
+        "Defaults to non-llm, top-k and batch.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed passes per method."
+    )
+    parser.add_argument("--spacy-model", default="stub", help="stub, sm, md or lg.")
+    parser.add_argument("--embedding-model", default="stub", help="stub, sm or lg.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help="Citation threshold. Defaults to 0.6 with the stub embeddings, whose "
+        "similarities are lower than a sentence transformer's, and 0.88 otherwise.",
+    )
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument(
+        "--idf-filter",
+        choices=["context"],
+        help="Drop common focus nouns before focus-word pairing.",
+    )
+    parser.add_argument("--min-idf", type=float, default=2.0)
+    parser.add_argument("--max-pairs-per-word", type=int)
+    parser.add_argument(
+        "--llm-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated round trip of the stub LLM.",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--baseline", help="Compare with the results in this JSON file."
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Largest accepted slowdown against the baseline. Defaults to 0.2 (20%%).",
+    )
+    args = parser.parse_args()
+    if args.threshold is None:
+        args.threshold = 0.6 if args.embedding_model == "stub" else 0.88
+
+    options = {
+        "spacy_model": args.spacy_model,
+        "embedding_model": args.embedding_model,
+        "threshold": args.threshold,
+        "top_k": args.top_k,
+        "batch_size": args.batch_size,
+        "idf_filter": args.idf_filter,
+        "min_idf": args.min_idf,
+        "max_pairs_per_word": args.max_pairs_per_word,
+        "llm_latency_ms": args.llm_latency_ms,
+        "repeat": args.repeat,
+    }
+    results = {}
+    for name in args.workloads:
+        cite_items = generate_cite_items(WORKLOADS[name])
+        results[name] = {
+            method: run_method(method, cite_items, options) for method in args.methods
+        }
+    print_report(results)
+
+    if args.output:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "options": options,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        print()
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Cold-start benchmark for rag_citation.
+
+Every run starts a fresh Python process and reports, for each method:
+    - import: time to `import rag_citation`.
+    - init: time to construct `Inference`.
+    - first: time of the first citation, which includes loading the models.
+    - second: time of a second citation on the warm instance.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --model gpt-4o --runs 5 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ANSWER = (
+    "Elon Musk's net worth is estimated to be US$241 billion as of August 2024. "
+    "He founded SpaceX in 2002."
+)
+CONTEXT = [
+    {
+        "source_id": "doc-1",
+        "document": "As of August 2024, Forbes estimates his net worth to be "
+        "US$241 billion. Musk was born in Pretoria.",
+    },
+    {
+        "source_id": "doc-2",
+        "document": "Using $100 million of the money he made from the sale of "
+        "PayPal, Musk founded SpaceX, a spaceflight services company, in 2002.",
+    },
+]
+STAGES = ("import", "init", "first", "second")
+
+
+def run_child(method: str, options: dict) -> None:
+    """Measure one cold start in the current process and print it as JSON."""
+    start = time.perf_counter()
+    from rag_citation import CiteItem, Inference
+
+    imported = time.perf_counter()
+    kwargs = {
+        "spacy_model": options["spacy_model"],
+        "embedding_model": options["embedding_model"],
+    }
+    if method != "non-llm":
+        kwargs["model"] = options["model"]
+    inference = Inference(method=method, **kwargs)
+
+    initialized = time.perf_counter()
+    cite_item = CiteItem(answer=ANSWER, context=CONTEXT)
+    inference(cite_item)
+
+    first = time.perf_counter()
+    inference(cite_item)
+
+    second = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "import": imported - start,
+                "init": initialized - imported,
+                "first": first - initialized,
+                "second": second - first,
+            }
+        )
+    )
+
+
+def run_method(method: str, options: dict, runs: int) -> dict:
+    """Run `runs` cold starts of a method and return the median of each stage."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (PROJECT_ROOT, env.get("PYTHONPATH")) if path
+    )
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                method,
+                "--options",
+                json.dumps(options),
+            ],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        stage: statistics.median(sample[stage] for sample in samples)
+        for stage in STAGES
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=("non-llm", "llm", "hybrid"),
+        help="Methods to measure. Defaults to non-llm, plus llm and hybrid when "
+        "--model is given.",
+    )
+    parser.add_argument("--model", help="LiteLLM model for the llm and hybrid methods.")
+    parser.add_argument("--spacy-model", default="sm")
+    parser.add_argument("--embedding-model", default="sm")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per method.")
+    parser.add_argument(
+        "--json", action="store_true", help="Print the results as JSON."
+    )
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--options", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, json.loads(args.options))
+        return
+
+    methods = args.methods or (
+        ["non-llm", "llm", "hybrid"] if args.model else ["non-llm"]
+    )
+    if args.model is None and any(method != "non-llm" for method in methods):
+        parser.error("--model is required for the llm and hybrid methods.")
+
+    options = {
+        "model": args.model,
+        "spacy_model": args.spacy_model,
+        "embedding_model": args.embedding_model,
+    }
+    results = {method: run_method(method, options, args.runs) for method in methods}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'method':<10}" + "".join(f"{stage + ' (s)':>14}" for stage in STAGES))
+    for method, timings in results.items():
+        print(f"{method:<10}" + "".join(f"{timings[stage]:>14.3f}" for stage in STAGES))
+
+
+if __name__ == "__main__":
+    main()
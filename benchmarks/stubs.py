@@ -0,0 +1,147 @@
+"""
+Offline stand-ins for the models, so the benchmarks run without downloads.
+
+- StubEmbeddingModel: hashed bag-of-words vectors instead of a SentenceTransformer.
+- install_stub_spacy: registers a blank spaCy pipeline, with rule-based sentences,
+  entities and nouns for the synthetic vocabulary, in place of an en_core_web
+  package.
+- StubLiteLLM: a litellm replacement that answers with no citations after a
+  configurable delay.
+"""
+
+import asyncio
+import json
+import re
+import time
+import types
+import zlib
+from typing import List
+
+from rag_citation.base_model import BaseEmbeddingModel, registry
+from rag_citation.base_model.spacy_model import SPACY_MODELS
+
+from workload import MONTHS, NOUNS, ORGS, PEOPLE
+
+_WORD = re.compile(r"\w+")
+
+
+class StubEmbeddingModel(BaseEmbeddingModel):
+    """
+    Normalized hashed bag-of-words embeddings.
+
+    Sentences sharing words get a high cosine similarity, which is enough to
+    exercise the scoring and threshold logic. Hashing uses crc32, so vectors do
+    not depend on PYTHONHASHSEED.
+
+    Args:
+        dim (int, optional): Embedding size. Defaults to 384, the size of GIST-small.
+    """
+
+    def __init__(self, dim: int = 384) -> None:
+        self.dim = dim
+        self.model_name = f"stub-hashing-{dim}"
+
+    def embedding(self, sentence: str):
+        return self.embed_batch([sentence])
+
+    def embed_batch(self, sentences: List[str]):
+        import torch
+
+        rows, columns = [], []
+        for row, sentence in enumerate(sentences):
+            for word in _WORD.findall(sentence.lower()):
+                rows.append(row)
+                columns.append(zlib.crc32(word.encode("utf-8")) % self.dim)
+
+        embeddings = torch.zeros(len(sentences), self.dim)
+        embeddings.index_put_(
+            (
+                torch.tensor(rows, dtype=torch.long),
+                torch.tensor(columns, dtype=torch.long),
+            ),
+            torch.ones(len(rows)),
+            accumulate=True,
+        )
+        return torch.nn.functional.normalize(embeddings, dim=1)
+
+
+def build_stub_nlp():
+    """A blank English pipeline that tags the synthetic entities and nouns."""
+    import spacy
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns(
+        [{"label": "PERSON", "pattern": person} for person in PEOPLE]
+        + [{"label": "ORG", "pattern": org} for org in ORGS]
+        + [
+            {
+                "label": "DATE",
+                "pattern": [{"TEXT": {"IN": MONTHS}}, {"SHAPE": "dddd"}],
+            },
+            {
+                "label": "MONEY",
+                "pattern": [
+                    {"TEXT": "US$"},
+                    {"LIKE_NUM": True},
+                    {"LOWER": "billion"},
+                ],
+            },
+            {"label": "CARDINAL", "pattern": [{"IS_DIGIT": True}]},
+        ]
+    )
+
+    attribute_ruler = nlp.add_pipe("attribute_ruler")
+    attribute_ruler.add([[{"LOWER": {"IN": NOUNS}}]], {"POS": "NOUN"})
+    return nlp
+
+
+def install_stub_spacy(spacy_model: str = "sm") -> None:
+    """
+    Registers the stub pipeline under the package of a spaCy model size.
+
+    Every Inference created afterwards in this process with that `spacy_model`
+    uses the stub, whether or not the real package is installed.
+    """
+    key = ("spacy", SPACY_MODELS[spacy_model])
+    registry.unload(key)
+    registry.get(key, build_stub_nlp)
+
+
+class StubLiteLLM:
+    """
+    Stand-in for the litellm module with `completion` and `acompletion`.
+
+    Replies with an empty citation list after `latency_ms`, with a usage block
+    derived from the prompt size.
+
+    Args:
+        latency_ms (float, optional): Simulated round trip. Defaults to 0.
+    """
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self.latency_ms = latency_ms
+
+    def _response(self, messages: list):
+        prompt_chars = sum(
+            len(str(message.get("content") or "")) for message in messages
+        )
+        content = json.dumps({"citations": []})
+        return types.SimpleNamespace(
+            choices=[
+                types.SimpleNamespace(message=types.SimpleNamespace(content=content))
+            ],
+            usage=types.SimpleNamespace(
+                prompt_tokens=prompt_chars // 4, completion_tokens=len(content) // 4
+            ),
+        )
+
+    def completion(self, messages: list, **kwargs):
+        time.sleep(self.latency_ms / 1000)
+        return self._response(messages)
+
+    async def acompletion(self, messages: list, **kwargs):
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._response(messages)
@@ -0,0 +1,156 @@
+"""
+Synthetic CiteItem workloads for the benchmarks.
+
+Documents are made of sentences of random nouns, filler words and entities
+(people, organizations, dates, amounts of money and numbers). Each answer
+sentence restates the facts of a random document sentence, so most of them are
+cited, and a share of them is made up, so some are not. Generation is seeded and
+uses its own random generator, so a workload is the same on every run.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Dict, List
+
+from rag_citation import CiteItem
+
+NOUNS = (
+    "company market revenue product engine battery rocket factory contract network "
+    "satellite platform investor report policy research vehicle software service "
+    "energy customer system startup deal share license patent launch budget region "
+    "supplier facility device model station program mission fund partner agency"
+).split()
+FILLERS = (
+    "the a of with and for in to after before reported announced said expanded "
+    "reached built sold"
+).split()
+FIRST_NAMES = "Ada Alan Grace Linus Margaret Dennis Barbara Ken".split()
+LAST_NAMES = "Lovelace Turing Hopper Torvalds Hamilton Ritchie Liskov".split()
+ORG_PREFIXES = "Acme Globex Initech Umbrella Hooli Vandelay Stark".split()
+ORG_SUFFIXES = "Corp Labs Systems Dynamics Industries".split()
+MONTHS = (
+    "January February March April May June July August September October "
+    "November December"
+).split()
+PEOPLE = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+ORGS = [f"{prefix} {suffix}" for prefix in ORG_PREFIXES for suffix in ORG_SUFFIXES]
+
+
+@dataclass
+class Workload:
+    """
+    Shape of a synthetic workload.
+
+    Attributes:
+        name: Name of the workload in reports.
+        items: Number of CiteItems.
+        answer_sentences: Sentences per answer.
+        documents: Context documents per item.
+        document_sentences: Sentences per document.
+        sentence_words: Words per sentence.
+        entity_density: Share of the words of a sentence that are entities.
+        hallucination_rate: Share of the answer sentences made up rather than
+                            taken from the documents.
+        seed: Seed of the generator.
+    """
+
+    name: str
+    items: int = 50
+    answer_sentences: int = 4
+    documents: int = 5
+    document_sentences: int = 10
+    sentence_words: int = 14
+    entity_density: float = 0.15
+    hallucination_rate: float = 0.2
+    seed: int = 0
+
+
+WORKLOADS: Dict[str, Workload] = {
+    "small": Workload("small", items=50, answer_sentences=3, documents=3),
+    "medium": Workload("medium", items=40, answer_sentences=5, documents=10),
+    "large": Workload(
+        "large", items=20, answer_sentences=8, documents=20, document_sentences=20
+    ),
+    "dense": Workload("dense", items=40, documents=10, entity_density=0.4),
+}
+
+
+def _entity(rng: random.Random) -> str:
+    kind = rng.randrange(5)
+    if kind == 0:
+        return rng.choice(PEOPLE)
+    if kind == 1:
+        return rng.choice(ORGS)
+    if kind == 2:
+        return f"{rng.choice(MONTHS)} {rng.randint(1990, 2024)}"
+    if kind == 3:
+        return f"US${rng.randint(2, 900)} billion"
+    return str(rng.randint(11, 9999))
+
+
+def _sentence(rng: random.Random, workload: Workload) -> List[str]:
+    words = []
+    for _ in range(workload.sentence_words):
+        roll = rng.random()
+        if roll < workload.entity_density:
+            words.append(_entity(rng))
+        elif roll < workload.entity_density + (1 - workload.entity_density) / 2:
+            words.append(rng.choice(NOUNS))
+        else:
+            words.append(rng.choice(FILLERS))
+    return words
+
+
+def _restate(rng: random.Random, words: List[str]) -> List[str]:
+    """Keep the entities and most nouns of a sentence, in a new order."""
+    kept = [
+        word
+        for word in words
+        if word not in FILLERS and (word not in NOUNS or rng.random() < 0.7)
+    ]
+    rng.shuffle(kept)
+    fillers = rng.sample(FILLERS, k=min(len(FILLERS), max(2, len(kept) // 3)))
+    return kept + fillers
+
+
+def _text(words: List[str]) -> str:
+    text = " ".join(words)
+    return text[:1].upper() + text[1:] + "."
+
+
+def generate_cite_items(workload: Workload) -> List[CiteItem]:
+    """
+    Generates the CiteItems of a workload.
+
+    Args:
+        workload (Workload): The shape of the items.
+
+    Returns:
+        List[CiteItem]: `workload.items` items, the same for the same workload.
+    """
+    rng = random.Random(workload.seed)
+    cite_items = []
+    for index in range(workload.items):
+        documents = [
+            [_sentence(rng, workload) for _ in range(workload.document_sentences)]
+            for _ in range(workload.documents)
+        ]
+        answer = []
+        for _ in range(workload.answer_sentences):
+            if rng.random() < workload.hallucination_rate:
+                answer.append(_sentence(rng, workload))
+            else:
+                answer.append(_restate(rng, rng.choice(rng.choice(documents))))
+
+        context = [
+            {
+                "source_id": f"item-{index}-doc-{position}",
+                "document": " ".join(_text(words) for words in sentences),
+                "meta": {"position": position},
+            }
+            for position, sentences in enumerate(documents)
+        ]
+        cite_items.append(
+            CiteItem(answer=" ".join(_text(words) for words in answer), context=context)
+        )
+    return cite_items
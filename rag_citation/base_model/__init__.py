@@ -1,6 +1,21 @@
 from rag_citation.base_model.base import BaseEmbeddingModel
+from rag_citation.base_model.registry import ModelRegistry, registry
 from rag_citation.base_model.spacy_model import SpacyBaseModel
 from rag_citation.base_model.embedding_model import EmbeddingModel
+from rag_citation.base_model.cached_embedding_model import (
+    CachedEmbeddingModel,
+    EmbeddingCacheStats,
+)
+from rag_citation.base_model.batched_embedding_model import BatchedEmbeddingModel
 
 
-__all__ = ["SpacyBaseModel", "BaseEmbeddingModel", "EmbeddingModel"]
+__all__ = [
+    "SpacyBaseModel",
+    "BaseEmbeddingModel",
+    "EmbeddingModel",
+    "CachedEmbeddingModel",
+    "EmbeddingCacheStats",
+    "BatchedEmbeddingModel",
+    "ModelRegistry",
+    "registry",
+]
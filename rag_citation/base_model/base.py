@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 
 class BaseEmbeddingModel(ABC):
@@ -14,3 +15,22 @@ class BaseEmbeddingModel(ABC):
             Embeddings for the given sentence.
         """
         pass
+
+    def embed_batch(self, sentences: List[str]):
+        """
+        Generate embeddings for a list of sentences.
+
+        Subclasses that can encode several sentences in one forward pass should
+        override this method. The default implementation calls `embedding()` once
+        per sentence and stacks the results, so models that only implement
+        `embedding()` keep working.
+
+        Args:
+            sentences (List[str]): The sentences to embed.
+
+        Returns:
+            A tensor of shape (len(sentences), dim), one row per sentence.
+        """
+        import torch
+
+        return torch.cat([self.embedding(sentence) for sentence in sentences], dim=0)
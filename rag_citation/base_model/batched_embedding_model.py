@@ -0,0 +1,163 @@
+import os
+import threading
+from concurrent.futures import Future
+from typing import List
+
+from rag_citation.base_model.base import BaseEmbeddingModel
+from rag_citation.batcher import MicroBatcher, MicroBatcherStats
+
+_start_lock = threading.Lock()
+
+
+class BatchedEmbeddingModel(BaseEmbeddingModel):
+    """
+    Wrapper around any BaseEmbeddingModel that coalesces calls from many threads.
+
+    When one Inference instance is shared by the threads of a web server, each
+    request embeds its own few sentences, and the forward passes contend for the
+    model. This wrapper queues the sentences of concurrent `embed_batch()` calls
+    and a dedicated worker thread encodes them with one `embed_batch()` call on
+    the wrapped model, once `max_batch_size` sentences are queued or `max_wait_ms`
+    has passed. Sentences repeated across calls are encoded once. The PyTorch
+    forward pass releases the GIL, so the threads' concurrency turns into larger,
+    more efficient batches.
+
+    Calls from a single thread are only delayed by up to `max_wait_ms`.
+
+    Attributes:
+        model_name (str): The `model_name` of the wrapped model, if it has one.
+
+    Args:
+        embedding_model (BaseEmbeddingModel): The model to wrap.
+        max_batch_size (int, optional): Sentences that trigger a flush. Defaults to 64.
+        max_wait_ms (float, optional): How long queued sentences wait for more.
+                                       Defaults to 2.
+        max_queue (int, optional): Maximum calls waiting; further callers block
+                                   until there is room. Defaults to 1024.
+
+    Example:
+        >>> model = BatchedEmbeddingModel(EmbeddingModel("sm"), max_batch_size=64)
+        >>> inference = Inference(embedding_model=model)   # shared by all threads
+        >>> future = model.submit(["A sentence.", "Another one."])
+        >>> print(future.result().shape, model.stats)
+    """
+
+    def __init__(
+        self,
+        embedding_model: BaseEmbeddingModel,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        max_queue: int = 1024,
+    ):
+        self.embedding_model = embedding_model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue = max_queue
+        if hasattr(embedding_model, "model_name"):
+            self.model_name = embedding_model.model_name
+
+        self._batcher = None
+        self._pid = None
+        # Embedding size of the last batch, for the empty result of empty calls.
+        self._dim = None
+
+    def __getstate__(self) -> dict:
+        # The worker thread is not picklable; it is started again on first use.
+        state = self.__dict__.copy()
+        state["_batcher"] = None
+        state["_pid"] = None
+        return state
+
+    @property
+    def batcher(self) -> MicroBatcher:
+        """The MicroBatcher of this process, started on first use."""
+        # Threads do not survive a fork, so a forked worker starts its own.
+        with _start_lock:
+            if self._batcher is None or self._pid != os.getpid():
+                self._batcher = MicroBatcher(
+                    self._encode,
+                    max_batch_size=self.max_batch_size,
+                    max_wait_ms=self.max_wait_ms,
+                    max_queue=self.max_queue,
+                    name="rag-citation-embedding-batcher",
+                    item_size=len,
+                )
+                self._pid = os.getpid()
+            return self._batcher
+
+    @property
+    def stats(self) -> MicroBatcherStats:
+        """
+        A snapshot of the batcher counters. Items are `embed_batch()` calls.
+
+        All zero while the worker thread of this process is not started.
+        """
+        with _start_lock:
+            batcher = self._batcher if self._pid == os.getpid() else None
+        if batcher is None:
+            return MicroBatcherStats()
+        return batcher.stats
+
+    def _encode(self, requests: List[List[str]]) -> list:
+        import torch
+
+        sentence_index = {}
+        for sentences in requests:
+            for sentence in sentences:
+                sentence_index.setdefault(sentence, len(sentence_index))
+
+        embeddings = torch.as_tensor(
+            self.embedding_model.embed_batch(list(sentence_index))
+        )
+        self._dim = embeddings.shape[-1]
+        return [
+            embeddings[[sentence_index[sentence] for sentence in sentences]]
+            for sentences in requests
+        ]
+
+    def submit(self, sentences: List[str]) -> Future:
+        """
+        Queues sentences for the next batch.
+
+        Args:
+            sentences (List[str]): The sentences to embed.
+
+        Returns:
+            Future: Resolves to the embeddings of `sentences`, one row each.
+                    Resolved right away, to a (0, dim) tensor, if there are
+                    none. Before the first batch, the wrapped model embeds
+                    the empty list instead, so its result has its shape.
+
+        Raises:
+            RuntimeError: If `close()` is called at the same time.
+        """
+        sentences = list(sentences)
+        if not sentences:
+            import torch
+
+            future = Future()
+            if self._dim is None:
+                future.set_result(torch.as_tensor(self.embedding_model.embed_batch([])))
+            else:
+                future.set_result(torch.empty((0, self._dim)))
+            return future
+        return self.batcher.submit(sentences, block=True)
+
+    def embedding(self, sentence: str):
+        return self.embed_batch([sentence])
+
+    def embed_batch(self, sentences: List[str]):
+        return self.submit(sentences).result()
+
+    def close(self) -> None:
+        """
+        Stops the worker thread once the queued sentences are encoded.
+
+        Calls racing with `close()` either are encoded or raise RuntimeError.
+        Later calls start a new worker thread.
+        """
+        with _start_lock:
+            batcher = self._batcher if self._pid == os.getpid() else None
+            self._batcher = None
+        if batcher is not None:
+            batcher.close()
@@ -0,0 +1,212 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from rag_citation import metrics
+from rag_citation.base_model.base import BaseEmbeddingModel
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """
+    Dataclass to store the counters of a CachedEmbeddingModel.
+
+    Attributes:
+        hits: Number of sentences served from the in-memory LRU.
+        disk_hits: Number of sentences served from the on-disk store.
+        misses: Number of sentences that had to be encoded by the wrapped model.
+        evictions: Number of entries dropped from the in-memory LRU.
+        size: Number of entries currently held in the in-memory LRU.
+    """
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+class CachedEmbeddingModel(BaseEmbeddingModel):
+    """
+    Caching wrapper around any BaseEmbeddingModel.
+
+    Sentence embeddings are keyed by the model identity plus a hash of the text.
+    They are held in a bounded in-memory LRU and, if `path` is given, in a sqlite
+    file that survives restarts. Only sentences missing from both are sent to the
+    wrapped model, in a single `embed_batch()` call.
+
+    Args:
+        embedding_model (BaseEmbeddingModel): The model to wrap.
+        max_size (int, optional): Maximum number of embeddings kept in memory.
+                                  Defaults to 10000.
+        path (str, optional): Path of the sqlite file used as on-disk store.
+                              The disk store is not bounded by `max_size`.
+                              Defaults to None (memory only).
+        model_id (str, optional): Identity of the wrapped model used in cache keys.
+                                  Defaults to the wrapped model's `model_name`
+                                  attribute, or its class name.
+
+    Example:
+        >>> model = CachedEmbeddingModel(EmbeddingModel("sm"), path="embeddings.db")
+        >>> inference = Inference(embedding_model=model)
+        >>> print(model.stats)
+    """
+
+    def __init__(
+        self,
+        embedding_model: BaseEmbeddingModel,
+        max_size: int = 10000,
+        path: Optional[str] = None,
+        model_id: Optional[str] = None,
+    ):
+        self.embedding_model = embedding_model
+        self.max_size = max_size
+        self.path = path
+        self.model_id = model_id or getattr(
+            embedding_model, "model_name", type(embedding_model).__qualname__
+        )
+
+        self._cache = OrderedDict()
+        self._stats = EmbeddingCacheStats()
+        self._lock = threading.Lock()
+
+        self._db = self._connect(path) if path is not None else None
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        db.commit()
+        return db
+
+    def __getstate__(self) -> dict:
+        # The lock and sqlite connection cannot be pickled, e.g. for spawned pool
+        # workers. Each copy starts with an empty LRU and reopens `path`.
+        state = self.__dict__.copy()
+        state["_cache"] = OrderedDict()
+        state["_stats"] = EmbeddingCacheStats()
+        state["_lock"] = None
+        state["_db"] = self._db is not None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._db = self._connect(self.path) if state["_db"] else None
+
+    @property
+    def stats(self) -> EmbeddingCacheStats:
+        """A snapshot of the cache counters."""
+        with self._lock:
+            return EmbeddingCacheStats(
+                hits=self._stats.hits,
+                disk_hits=self._stats.disk_hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                size=len(self._cache),
+            )
+
+    def _key(self, sentence: str) -> str:
+        text = f"{self.model_id}\x00{sentence}".encode("utf-8")
+        return hashlib.sha256(text).hexdigest()
+
+    def _put(self, key: str, vector) -> None:
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _load_from_disk(self, keys: List[str]) -> dict:
+        import numpy as np
+        import torch
+
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            rows = self._db.execute(
+                "SELECT key, vector FROM embeddings WHERE key IN (%s)"
+                % ",".join("?" * len(chunk)),
+                chunk,
+            ).fetchall()
+            for key, blob in rows:
+                vector = np.frombuffer(blob, dtype=np.float32).copy()
+                found[key] = torch.from_numpy(vector)
+        return found
+
+    def _save_to_disk(self, vectors: dict) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [
+                (key, vector.numpy().astype("float32").tobytes())
+                for key, vector in vectors.items()
+            ],
+        )
+        self._db.commit()
+
+    def embedding(self, sentence: str):
+        return self.embed_batch([sentence])
+
+    def embed_batch(self, sentences: List[str]):
+        import torch
+
+        keys = [self._key(sentence) for sentence in sentences]
+        vectors = {}
+        missing = {}
+        hits = 0
+
+        with self._lock:
+            for key, sentence in zip(keys, sentences):
+                if key in vectors or key in missing:
+                    continue
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    vectors[key] = self._cache[key]
+                    self._stats.hits += 1
+                    hits += 1
+                else:
+                    missing[key] = sentence
+
+            if missing and self._db is not None:
+                for key, vector in self._load_from_disk(list(missing)).items():
+                    del missing[key]
+                    vectors[key] = vector
+                    self._put(key, vector)
+                    self._stats.disk_hits += 1
+                    hits += 1
+
+        if hits:
+            metrics.count("embedding_cache_hits", hits)
+        if missing:
+            encoded = self.embedding_model.embed_batch(list(missing.values()))
+            encoded = torch.as_tensor(encoded).detach().float().cpu()
+            # Clone each row: a row view would keep the whole encoded batch alive
+            # for as long as any of its rows is in the LRU.
+            new_vectors = {key: vector.clone() for key, vector in zip(missing, encoded)}
+
+            with self._lock:
+                self._stats.misses += len(new_vectors)
+                for key, vector in new_vectors.items():
+                    self._put(key, vector)
+                if self._db is not None:
+                    self._save_to_disk(new_vectors)
+            vectors.update(new_vectors)
+
+        return torch.stack([vectors[key] for key in keys])
+
+    def clear(self) -> None:
+        """Drop every in-memory entry. The on-disk store is left untouched."""
+        with self._lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        """Close the on-disk store, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
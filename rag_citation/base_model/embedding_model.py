@@ -1,5 +1,12 @@
-from sentence_transformers import SentenceTransformer
+from typing import List, Optional
 from rag_citation.base_model.base import BaseEmbeddingModel
+from rag_citation.base_model.registry import registry
+
+EMBEDDING_MODELS = {
+    "sm": "avsolatorio/GIST-small-Embedding-v0",
+    "md": "avsolatorio/GIST-Embedding-v0",
+    "lg": "avsolatorio/GIST-large-Embedding-v0",
+}
 
 
 class EmbeddingModel(BaseEmbeddingModel):
@@ -7,41 +14,47 @@ class EmbeddingModel(BaseEmbeddingModel):
     Base class for embedding models.
 
     This class provides a shared instance of a SentenceTransformer model based on the specified size.
+    The model comes from the process-wide model registry: it is loaded once per
+    process and device, on first use.
 
     Attributes:
-        _model (SentenceTransformer): Static attribute to store the shared SentenceTransformer instance.
+        model_name (str): The Hugging Face name of the model.
+        device (str): The device the model runs on, or None for the
+                      SentenceTransformer default.
 
     Args:
         embedding_model (str, optional): Size of the embedding model.
                                          Choose from "sm" (small), "md" (medium), or "lg" (large).
                                          Defaults to "sm".
+        device (str, optional): Device to run the model on, e.g. "cpu" or "cuda".
+                                Defaults to None (CUDA when available).
 
     default model: `sm`
     """
 
-    def __init__(self, embedding_model="sm"):
-        if embedding_model == "sm":
-            self.model = SentenceTransformer(
-                "avsolatorio/GIST-small-Embedding-v0", revision=None
-            )
+    def __init__(self, embedding_model="sm", device: Optional[str] = None):
+        if embedding_model not in EMBEDDING_MODELS:
+            print("Warning::please choose `small`, `medium`, or `large`")
+            print("Warning::choosing default model: small")
+            embedding_model = "sm"
 
-        elif embedding_model == "md":
-            self.model = SentenceTransformer(
-                "avsolatorio/GIST-Embedding-v0", revision=None
-            )
+        self.model_name = EMBEDDING_MODELS[embedding_model]
+        self.device = device
 
-        elif embedding_model == "lg":
-            self.model = SentenceTransformer(
-                "avsolatorio/GIST-large-Embedding-v0", revision=None
-            )
+    @property
+    def model(self):
+        """The shared SentenceTransformer model, loaded on first access."""
+        return registry.sentence_transformer(self.model_name, self.device)
 
-        else:
-            print("Warning::please choose `small`, `medium`, or `large`")
-            print("Warning::choosing default model: small")
-            self.model = SentenceTransformer(
-                "avsolatorio/GIST-small-Embedding-v0", revision=None
-            )
+    @property
+    def registry_key(self) -> tuple:
+        """The key of the model in the model registry."""
+        return ("sentence-transformers", self.model_name, self.device)
 
     def embedding(self, sentence: str) -> list:
         embeddings = self.model.encode([sentence], convert_to_tensor=True)
         return embeddings
+
+    def embed_batch(self, sentences: List[str]):
+        embeddings = self.model.encode(sentences, convert_to_tensor=True)
+        return embeddings
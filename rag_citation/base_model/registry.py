@@ -0,0 +1,114 @@
+import threading
+from typing import Callable, Hashable, List, Optional
+
+
+class ModelRegistry:
+    """
+    Process-wide registry that loads each model at most once per key.
+
+    SpaCy pipelines are keyed by ("spacy", package) and SentenceTransformer models
+    by ("sentence-transformers", name, device). Models are loaded on first use and
+    shared by every SpacyBaseModel and EmbeddingModel, so several Inference
+    instances with different configurations only pay once for each model they
+    have in common.
+
+    Loading is thread-safe: concurrent requests for the same key wait for a single
+    load, while different keys load in parallel.
+
+    Example:
+        >>> from rag_citation.base_model import registry
+        >>> print(registry.loaded())
+        >>> registry.unload(("spacy", "en_core_web_sm"))
+    """
+
+    def __init__(self) -> None:
+        self._models = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], object]):
+        """
+        Returns the model registered under a key, loading it on first use.
+
+        Args:
+            key (Hashable): The model key.
+            loader (Callable): Called without arguments to load the model when the
+                               key is not registered yet.
+
+        Returns:
+            The shared model.
+        """
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = loader()
+                self._models[key] = model
+        return model
+
+    def spacy(self, package: str):
+        """Returns the shared SpaCy pipeline of an installed package."""
+
+        def load():
+            import spacy
+
+            return spacy.load(package)
+
+        return self.get(("spacy", package), load)
+
+    def sentencizer(self, lang: str):
+        """Returns a shared blank pipeline with only SpaCy's rule-based sentencizer."""
+
+        def load():
+            import spacy
+
+            nlp = spacy.blank(lang)
+            nlp.add_pipe("sentencizer")
+            return nlp
+
+        return self.get(("spacy-sentencizer", lang), load)
+
+    def sentence_transformer(self, name: str, device: Optional[str] = None):
+        """Returns the shared SentenceTransformer model of a name and device."""
+
+        def load():
+            from sentence_transformers import SentenceTransformer
+
+            return SentenceTransformer(name, device=device, revision=None)
+
+        return self.get(("sentence-transformers", name, device), load)
+
+    def loaded(self) -> List[Hashable]:
+        """Returns the keys of the models currently loaded."""
+        return list(self._models)
+
+    def unload(self, *keys: Hashable) -> None:
+        """
+        Drops models from the registry so their memory can be reclaimed.
+
+        Instances using a dropped model load it again on their next use.
+
+        Args:
+            *keys (Hashable): The keys to drop. Drops every model when empty.
+        """
+        with self._lock:
+            for key in keys or list(self._models):
+                self._models.pop(key, None)
+                self._key_locks.pop(key, None)
+
+        import sys
+
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._models
+
+
+registry = ModelRegistry()
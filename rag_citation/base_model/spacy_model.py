@@ -1,18 +1,23 @@
-import spacy
+from rag_citation.base_model.registry import registry
 
+SPACY_MODELS = {
+    "sm": "en_core_web_sm",
+    "md": "en_core_web_md",
+    "lg": "en_core_web_lg",
+}
 
-class SpacyBaseModel:
-    _nlp = None
 
+class SpacyBaseModel:
     def __init__(self, spacy_model="sm"):
         """
         Base class for loading and sharing a SpaCy language model.
 
-        This class ensures that only one instance of the specified SpaCy model is loaded,
-        regardless of how many times the class is instantiated. This can save memory and time.
+        The pipeline is taken from the process-wide model registry, so each SpaCy
+        model is loaded at most once per process, however many instances use it.
+        It is loaded lazily, on the first access to `nlp`.
 
         Attributes:
-            _nlp (spacy.Language): Static attribute to store the shared SpaCy language model.
+            spacy_package (str): The name of the SpaCy package used.
 
         Args:
             spacy_model (str, optional): Size of the SpaCy model to load.
@@ -22,20 +27,27 @@ class SpacyBaseModel:
         default model: `sm`
         """
 
-        if SpacyBaseModel._nlp is None:
+        if spacy_model not in SPACY_MODELS:
+            print("Warning::Please provide correct input: sm, md, or lg")
+            print("Warning::Running use sm(en_core_web_sm)")
+            spacy_model = "sm"
 
-            if spacy_model == "sm":
-                SpacyBaseModel._nlp = spacy.load("en_core_web_sm")
+        self.spacy_package = SPACY_MODELS[spacy_model]
 
-            elif spacy_model == "md":
-                SpacyBaseModel._nlp = spacy.load("en_core_web_md")
+    @property
+    def nlp(self):
+        """The shared SpaCy pipeline, loaded on first access."""
+        return registry.spacy(self.spacy_package)
 
-            elif spacy_model == "lg":
-                SpacyBaseModel._nlp = spacy.load("en_core_web_lg")
+    @property
+    def registry_key(self) -> tuple:
+        """The key of the SpaCy pipeline in the model registry."""
+        return ("spacy", self.spacy_package)
 
-            else:
-                print("Warning::Please provide correct input: sm, md, or lg")
-                print("Warning::Running use sm(en_core_web_sm)")
-                SpacyBaseModel._nlp = spacy.load("en_core_web_sm")
+    def load_sentencizer(self):
+        """
+        Returns a shared blank pipeline with only SpaCy's rule-based sentencizer.
 
-        self.nlp = SpacyBaseModel._nlp
+        It uses the language of the loaded model and is created once per process.
+        """
+        return registry.sentencizer(self.nlp.lang)
@@ -0,0 +1,245 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+# Queued after the last item by `MicroBatcher.close()`.
+_STOP = object()
+
+
+@dataclass
+class MicroBatcherStats:
+    """
+    Dataclass to store the counters of a MicroBatcher.
+
+    Attributes:
+        submitted: Number of items accepted by `submit()`.
+        rejected: Number of items refused because the queue was full.
+        batches: Number of calls to the batch function.
+        items: Number of items passed to the batch function.
+        largest_batch: Size of the largest batch so far.
+        queue_depth: Number of items currently waiting in the queue.
+    """
+
+    submitted: int = 0
+    rejected: int = 0
+    batches: int = 0
+    items: int = 0
+    largest_batch: int = 0
+    queue_depth: int = 0
+
+
+class MicroBatcher:
+    """
+    Merges items submitted from many threads into batches run by one thread.
+
+    Each `submit()` returns a Future. A background thread takes the first waiting
+    item, then keeps collecting items for up to `max_wait_ms`, or until
+    `max_batch_size` items are collected, and runs them through `batch_fn` in one
+    call. While a batch runs, new items queue up and form the next batch, so
+    batches grow with the load.
+
+    With `item_size`, batches are limited by the summed size of their items
+    instead of their count, e.g. by the number of sentences of each item.
+
+    The queue holds at most `max_queue` items. By default `submit()` raises
+    `queue.Full` instead of blocking when it is full, so callers can shed load.
+
+    Args:
+        batch_fn (Callable[[List], List]): Called with a list of items, returns
+                                           one result per item, in order. An
+                                           exception instance in the results
+                                           fails the future of its item only.
+        max_batch_size (int, optional): A batch is closed once it holds this many
+                                        items, or this summed `item_size`.
+                                        Defaults to 32.
+        max_wait_ms (float, optional): How long a batch waits for more items
+                                       after its first one. Defaults to 5.
+        max_queue (int, optional): Maximum items waiting to be batched.
+                                   Defaults to 256.
+        name (str, optional): Name of the background thread.
+        item_size (Callable[[object], int], optional): Size of an item. Defaults to
+                                                       None (each item counts 1).
+
+    Example:
+        >>> batcher = MicroBatcher(inference.batch, max_batch_size=32, max_wait_ms=5)
+        >>> output = batcher.submit(cite_item).result()
+        >>> batcher.close()
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List], List],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_queue: int = 256,
+        name: str = "rag-citation-batcher",
+        item_size: Optional[Callable[[object], int]] = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(
+                f"max_batch_size must be at least 1, got {max_batch_size}."
+            )
+        if max_queue < 1:
+            raise ValueError(f"max_queue must be at least 1, got {max_queue}.")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.item_size = item_size
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats = MicroBatcherStats()
+        self._lock = threading.Lock()
+        # Notified when the background thread takes an item off a full queue.
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def stats(self) -> MicroBatcherStats:
+        """A snapshot of the batcher counters."""
+        with self._lock:
+            return MicroBatcherStats(
+                submitted=self._stats.submitted,
+                rejected=self._stats.rejected,
+                batches=self._stats.batches,
+                items=self._stats.items,
+                largest_batch=self._stats.largest_batch,
+                queue_depth=self._queue.qsize(),
+            )
+
+    def submit(self, item, block: bool = False) -> Future:
+        """
+        Queues an item for the next batch.
+
+        Args:
+            item: The item to pass to `batch_fn`.
+            block (bool, optional): Wait for room in the queue instead of raising
+                                    `queue.Full`. Defaults to False.
+
+        Returns:
+            Future: Resolves to the result of the item, or to the exception
+                    raised by `batch_fn`.
+
+        Raises:
+            queue.Full: If `max_queue` items are already waiting and `block` is False.
+            RuntimeError: If the batcher is closed.
+        """
+        future = Future()
+        # Checking for close() and queueing under one lock ensures that no item is
+        # queued after the stop marker, where it would never be processed.
+        with self._not_full:
+            while True:
+                if self._closed:
+                    raise RuntimeError("The batcher is closed.")
+                try:
+                    self._queue.put_nowait((item, future))
+                    break
+                except queue.Full:
+                    if not block:
+                        self._stats.rejected += 1
+                        raise
+                self._not_full.wait()
+            self._stats.submitted += 1
+        return future
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stops the batcher once the items already queued are processed.
+
+        Later calls to `submit()` raise RuntimeError. Blocked callers of `submit()`
+        are woken up and raise it too.
+
+        Args:
+            wait (bool, optional): Wait for the background thread to finish.
+                                   Defaults to True.
+        """
+        with self._not_full:
+            closing = not self._closed
+            self._closed = True
+            self._not_full.notify_all()
+        if closing:
+            self._queue.put(_STOP)
+        if wait:
+            self._thread.join()
+
+    def _get(self, timeout: Optional[float] = None):
+        entry = self._queue.get(timeout=timeout)
+        with self._not_full:
+            self._not_full.notify()
+        return entry
+
+    def _fail_queued(self) -> None:
+        """Fails the futures of items left in the queue once the thread stops."""
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if entry is not _STOP and entry[1].set_running_or_notify_cancel():
+                entry[1].set_exception(RuntimeError("The batcher is closed."))
+
+    def _run(self) -> None:
+        try:
+            self._process()
+        finally:
+            self._fail_queued()
+
+    def _process(self) -> None:
+        stopping = False
+        while not stopping:
+            entry = self._get()
+            if entry is _STOP:
+                return
+
+            batch = [entry]
+            size = self._size(entry)
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    entry = self._get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+                size += self._size(entry)
+
+            self._run_batch(batch)
+
+    def _size(self, entry: tuple) -> int:
+        return 1 if self.item_size is None else self.item_size(entry[0])
+
+    def _run_batch(self, batch: list) -> None:
+        # Items whose caller gave up (cancelled future) are dropped.
+        batch = [
+            (item, future)
+            for item, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        with self._lock:
+            self._stats.batches += 1
+            self._stats.items += len(batch)
+            self._stats.largest_batch = max(self._stats.largest_batch, len(batch))
+
+        try:
+            results = self.batch_fn([item for item, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -56,14 +56,15 @@ class CiteItem:
         self.context = [self._clean_text(item) for item in context]
         self.meta = {item.get("source_id"): item.get("meta") for item in context}
 
-    def _clean_text(self, text):
+    @staticmethod
+    def _clean_text(text):
         # Clean the input text by removing newline characters
         if isinstance(text, str):
             # text = text.replace("\n", "\n ")
             text = re.sub(r"^\d+\.\s*", "", text, flags=re.MULTILINE)
             return text
         elif isinstance(text, dict):
-            return {k: self._clean_text(v) for k, v in text.items()}
+            return {k: CiteItem._clean_text(v) for k, v in text.items()}
         else:
             return text
 
@@ -1,4 +1,3 @@
-import spacy
 from rag_citation.focus_word.schema import FocusWordDataType
 from rag_citation.base_model import SpacyBaseModel
 
@@ -34,7 +33,18 @@ class FocusWord(SpacyBaseModel):
                 - combined_list: A combined list of entity and focus word dictionaries.
         """
         doc = self.nlp(answer)
+        return self.get_focus_word_from_doc(doc)
 
+    def get_focus_word_from_doc(self, doc) -> FocusWordDataType:
+        """
+        Extracts and categorizes focus words from an already parsed answer.
+
+        Args:
+            doc (spacy.tokens.Doc): The parsed answer.
+
+        Returns:
+            FocusWordDataType: See `get_focus_word`.
+        """
         entities_list = [
             {"type": "ENTITY", "words": ent.text, "label": ent.label_}
             for ent in doc.ents
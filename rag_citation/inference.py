@@ -1,33 +1,113 @@
 import warnings
 
 warnings.filterwarnings("ignore")
+import asyncio
+import contextvars
+import copy
+import functools
 import logging
-from typing import List, Dict, Optional
+import re
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
 from collections import defaultdict
 
+from rag_citation import metrics
+from rag_citation.metrics import CitationMetrics
 from rag_citation.schema import RagCitationOutput
 
+if TYPE_CHECKING:
+    from rag_citation.pair import Pair
+
 logger = logging.getLogger(__name__)
 
+# A streamed sentence can only be closed once a boundary character is followed by
+# more text, so the pending answer text is only re-parsed after that.
+_SENTENCE_END = re.compile(r"[.!?:;\n]\s*\S")
+
 
 class Inference:
     """
     A class to perform inference for RAG citation.
 
-    Supports two methods:
+    Supports three methods:
       - "non-llm" (default): SpaCy NER + SentenceTransformers cosine similarity
       - "llm": LLM-based citation via LiteLLM with structured output
+      - "hybrid": the non-LLM pipeline first, then the LLM only for answer
+        sentences left uncited or carrying missing words. Takes both the
+        non-LLM and the LLM args.
 
     Non-LLM Args:
         spacy_model: The spaCy model size ("sm", "md", "lg").
         embedding_model: The embedding model size or a custom BaseEmbeddingModel instance.
         therhold_value: The threshold for cosine similarity scoring.
+        sentence_splitter: SpaCy pipeline used to split context documents into
+                           sentences: "full", "parser" (default; same boundaries
+                           as "full" with tagger/NER disabled) or "sentencizer"
+                           (rule-based). The answer always uses the full pipeline.
+        n_process: Number of processes used to split context documents.
+        context_store: Optional ContextStore (or its directory) with pre-split
+                       sentences and embeddings. Context documents whose
+                       source_id is in the store, with unchanged text, are
+                       neither parsed nor embedded.
+        device: Device of the built-in embedding model (e.g. "cpu", "cuda").
+                Defaults to None (CUDA when available).
+        pairing: How answer sentences are paired with document sentences:
+                 "focus-word" (default) pairs every two sentences sharing a
+                 focus word; "top-k" only pairs each answer sentence with its
+                 `top_k` most similar document sentences, among which they
+                 must share a focus word. With "top-k", every document
+                 sentence is embedded, and the work grows linearly with the
+                 context instead of with the number of shared focus words.
+        top_k: Candidate document sentences per answer sentence with
+               pairing="top-k" (default 5).
+        idf_filter: Drops common focus nouns before focus-word pairing: "context"
+                    computes their IDF over the context sentences of each item,
+                    an IdfTable holds precomputed corpus frequencies. Entities
+                    are never dropped. Defaults to None (no filter).
+        min_idf: Smallest IDF of a noun kept by idf_filter (default 2.0).
+        max_pairs_per_word: Maximum pairs each focus noun contributes to in
+                            focus-word pairing, over all answer sentences;
+                            those sharing the most focus words are kept.
+                            Entities are never capped. Defaults to None (no
+                            cap). Pairs left out by the filter and the cap are
+                            counted in the "skipped_pairs" metric, only with
+                            collect_metrics or metrics_hook, and always logged
+                            at debug level by rag_citation.pair.generate_pair.
+        window_chars: Context documents longer than this many characters are
+                      parsed in windows of about this size, and matched window
+                      by window in focus-word pairing, so memory stays bounded
+                      on huge documents (default 100,000).
+
+    Models are shared through the process-wide model registry and loaded on
+    first use. Call `warmup()` to load them up front and `release()` to unload
+    them.
+
+    Metrics Args:
+        collect_metrics: Attach per-stage timings and counters (a CitationMetrics)
+                         to each RagCitationOutput as `output.metrics`.
+        metrics_hook: Optional callable receiving the CitationMetrics of every
+                      call, e.g. to log them. Implies collect_metrics.
 
     LLM Args:
         model: LiteLLM model identifier (e.g., "gpt-4o", "azure/gpt-4o").
         api_key: Optional API key for the LLM provider.
         temperature: LLM temperature (default 0.0).
         max_tokens: Maximum tokens for LLM response.
+        llm_token_budget: Optional token budget for the documents in the LLM
+                          prompt. When set, only the document sentences sharing
+                          words with the answer are sent, up to this budget.
+        llm_prune_window: Neighbouring sentences kept around each matching
+                          sentence when pruning (default 0).
+        llm_cache: Optional BaseCitationCache (e.g. InMemoryCitationCache or
+                   SqliteCitationCache) for LLM citation responses.
         **litellm_kwargs: Additional LiteLLM parameters (e.g., api_base, api_version).
     """
 
@@ -38,49 +118,136 @@ class Inference:
         spacy_model: str = "sm",
         embedding_model="sm",
         therhold_value: float = 0.88,
+        sentence_splitter: str = "parser",
+        n_process: int = 1,
+        context_store=None,
+        device: Optional[str] = None,
+        pairing: str = "focus-word",
+        top_k: int = 5,
+        idf_filter=None,
+        min_idf: float = 2.0,
+        max_pairs_per_word: Optional[int] = None,
+        window_chars: int = 100_000,
         # LLM parameters
         model: Optional[str] = None,
         api_key: Optional[str] = None,
         temperature: float = 0.0,
         max_tokens: int = 4096,
+        llm_cache=None,
+        llm_token_budget: Optional[int] = None,
+        llm_prune_window: int = 0,
+        # Metrics parameters
+        collect_metrics: bool = False,
+        metrics_hook: Optional[Callable[[CitationMetrics], None]] = None,
         **litellm_kwargs,
     ) -> None:
         self.method = method
+        self._collect_metrics = collect_metrics or metrics_hook is not None
+        self._metrics_hook = metrics_hook
+
+        if method not in ("non-llm", "llm", "hybrid"):
+            raise ValueError(
+                f"Unknown method '{method}'. Choose 'non-llm', 'llm' or 'hybrid'."
+            )
+        if method in ("llm", "hybrid") and model is None:
+            raise ValueError(
+                f"The 'model' parameter is required when method='{method}'. "
+                "Example: model='gpt-4o' or model='anthropic/claude-sonnet-4-20250514'"
+            )
+
+        if method in ("non-llm", "hybrid"):
+            if pairing not in ("focus-word", "top-k"):
+                raise ValueError(
+                    f"Unknown pairing '{pairing}'. Choose 'focus-word' or 'top-k'."
+                )
+            if top_k < 1:
+                raise ValueError(f"top_k must be at least 1, got {top_k}.")
 
-        if method == "non-llm":
             from rag_citation.focus_word import FocusWord
             from rag_citation.pair import GeneratePair
             from rag_citation.score import Score
             from rag_citation.base_model import EmbeddingModel
 
             self._focus_word = FocusWord(spacy_model)
-            self._generate_pair = GeneratePair(spacy_model)
+            self._generate_pair = GeneratePair(
+                spacy_model,
+                sentence_splitter=sentence_splitter,
+                n_process=n_process,
+                idf_filter=idf_filter,
+                min_idf=min_idf,
+                max_pairs_per_word=max_pairs_per_word,
+                window_chars=window_chars,
+            )
             self._score = Score()
             if isinstance(embedding_model, str):
-                self._embedding_model = EmbeddingModel(embedding_model)
+                self._embedding_model = EmbeddingModel(embedding_model, device=device)
             else:
                 self._embedding_model = embedding_model
             self._therhold_value = therhold_value
+            self._pairing = pairing
+            self._top_k = top_k
+            if isinstance(context_store, str):
+                from rag_citation.store import ContextStore
 
-        elif method == "llm":
-            if model is None:
-                raise ValueError(
-                    "The 'model' parameter is required when method='llm'. "
-                    "Example: model='gpt-4o' or model='anthropic/claude-sonnet-4-20250514'"
-                )
+                context_store = ContextStore(context_store)
+            self._context_store = context_store
+            if context_store is not None:
+                model_id = getattr(self._embedding_model, "model_name", None)
+                if model_id is not None and model_id != context_store.model_id:
+                    logger.warning(
+                        f"Context store was embedded with '{context_store.model_id}' "
+                        f"but the embedding model is '{model_id}'."
+                    )
+
+        if method in ("llm", "hybrid"):
             from rag_citation.llm import LLMCitation
 
+            self._llm_token_budget = llm_token_budget
+            self._llm_prune_window = llm_prune_window
+
             self._llm_citation = LLMCitation(
                 model=model,
                 api_key=api_key,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                cache=llm_cache,
                 **litellm_kwargs,
             )
-        else:
-            raise ValueError(
-                f"Unknown method '{method}'. Choose 'non-llm' or 'llm'."
-            )
+
+    def warmup(self) -> "Inference":
+        """
+        Loads the models of the non-LLM pipeline and runs them once.
+
+        Models are otherwise loaded lazily by the first request. Warming up moves
+        that cost to startup. Does nothing with the LLM method.
+
+        Returns:
+            The instance itself.
+        """
+        if self.method in ("non-llm", "hybrid"):
+            self._focus_word.nlp("Warmup.")
+            self._generate_pair.split_sentences(["Warmup."])
+            self._embedding_model.embed_batch(["Warmup."])
+        return self
+
+    def release(self) -> None:
+        """
+        Unloads the SpaCy and built-in embedding models of this instance from the
+        model registry.
+
+        Other instances sharing these models load them again on their next use.
+        Custom embedding models are left untouched.
+        """
+        if self.method not in ("non-llm", "hybrid"):
+            return
+
+        from rag_citation.base_model import registry
+
+        keys = [self._focus_word.registry_key]
+        embedding_key = getattr(self._embedding_model, "registry_key", None)
+        if embedding_key is not None:
+            keys.append(embedding_key)
+        registry.unload(*keys)
 
     def __call__(self, cite_item, messages: Optional[list] = None) -> RagCitationOutput:
         """
@@ -95,31 +262,556 @@ class Inference:
         Returns:
             RagCitationOutput with citation, missing_word, and hallucination.
         """
+        if not self._collect_metrics:
+            return self._run(cite_item, messages)
+
+        with metrics.record(self.method) as collected:
+            output = self._run(cite_item, messages)
+        return self._report_metrics([output], collected())[0]
+
+    def _run(self, cite_item, messages: Optional[list] = None) -> RagCitationOutput:
         if self.method == "non-llm":
             return self._run_non_llm(cite_item)
         elif self.method == "llm":
             return self._run_llm(cite_item, messages)
+        elif self.method == "hybrid":
+            return self._run_hybrid(cite_item, messages)
+
+    def _report_metrics(
+        self, outputs: List[RagCitationOutput], collected: Optional[CitationMetrics]
+    ) -> List[RagCitationOutput]:
+        """
+        Attach the collected metrics to the outputs and pass them to the hook.
+
+        `collected` is None when the call is nested in another one that collects
+        metrics, which reports them instead.
+        """
+        if collected is not None:
+            for output in outputs:
+                output.metrics = collected
+            if self._metrics_hook is not None:
+                self._metrics_hook(collected)
+        return outputs
+
+    async def acall(
+        self, cite_item, messages: Optional[list] = None
+    ) -> RagCitationOutput:
+        """
+        Async version of `__call__`.
+
+        With the LLM method the provider is called through litellm.acompletion(),
+        so no thread is held during the round trip. The CPU-bound non-LLM
+        pipeline runs in the event loop's default executor.
+
+        Args:
+            cite_item: A CiteItem with answer and context.
+            messages: (LLM method only) Optional conversation messages list.
+
+        Returns:
+            RagCitationOutput with citation, missing_word, and hallucination.
+        """
+        if self.method == "non-llm":
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.__call__, cite_item, messages)
+
+        if not self._collect_metrics:
+            return await self._arun(cite_item, messages)
+
+        with metrics.record(self.method) as collected:
+            output = await self._arun(cite_item, messages)
+        return self._report_metrics([output], collected())[0]
+
+    async def _arun(self, cite_item, messages: Optional[list] = None):
+        if self.method == "llm":
+            return await self._arun_llm(cite_item, messages)
+        return await self._arun_hybrid(cite_item, messages)
+
+    async def abatch(
+        self,
+        cite_items: list,
+        messages: Optional[List[list]] = None,
+        max_concurrency: int = 16,
+    ) -> List[RagCitationOutput]:
+        """
+        Runs `acall` on many cite items concurrently.
+
+        Args:
+            cite_items: A list of CiteItem.
+            messages: (LLM method only) Optional list of conversation messages,
+                      one per item.
+            max_concurrency: Maximum number of requests in flight. Defaults to 16.
+
+        Returns:
+            A list of RagCitationOutput, one per item, in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        if messages is None:
+            messages = [None] * len(cite_items)
+
+        async def _bounded(cite_item, item_messages):
+            async with semaphore:
+                return await self.acall(cite_item, item_messages)
+
+        return await asyncio.gather(
+            *(
+                _bounded(cite_item, item_messages)
+                for cite_item, item_messages in zip(cite_items, messages)
+            )
+        )
+
+    def batch(self, cite_items: list, batch_size: int = 64) -> List[RagCitationOutput]:
+        """
+        Performs inference on many cite items.
+
+        With the non-LLM method, answers and documents are parsed with SpaCy's
+        `nlp.pipe` and the sentences of every item in a batch are embedded
+        together. The results are the same as calling the instance on each item.
+        With the LLM method, items are cited one after the other. When metrics
+        are collected, every output carries the metrics of the whole batch.
+
+        Args:
+            cite_items: A list of CiteItem.
+            batch_size: Number of items processed together. Defaults to 64.
+
+        Returns:
+            A list of RagCitationOutput, one per item, in input order.
+        """
+        if not self._collect_metrics:
+            return self._run_batch(cite_items, batch_size)
+
+        with metrics.record(self.method, items=len(cite_items)) as collected:
+            outputs = self._run_batch(cite_items, batch_size)
+        return self._report_metrics(outputs, collected())
+
+    def _run_batch(self, cite_items: list, batch_size: int) -> list:
+        if self.method != "non-llm":
+            return [self(cite_item) for cite_item in cite_items]
+
+        outputs = []
+        for start in range(0, len(cite_items), batch_size):
+            outputs.extend(
+                self._run_non_llm_batch(
+                    cite_items[start : start + batch_size], batch_size
+                )
+            )
+        return outputs
+
+    def imap(
+        self,
+        cite_items: Iterable,
+        workers: Optional[int] = None,
+        chunksize: int = 16,
+        batch_size: int = 64,
+        start_method: Optional[str] = None,
+        threads_per_worker: Optional[int] = 1,
+    ) -> Iterator[RagCitationOutput]:
+        """
+        Cites many items in a pool of worker processes, yielding results in order.
+
+        The non-LLM pipeline is CPU-bound and holds the GIL, so bulk jobs only
+        scale across cores with processes. Each worker loads the models once, in
+        the pool initializer, and cites chunks of `chunksize` items with `batch`.
+        With the "fork" start method, models this instance already loaded (e.g.
+        with `warmup()`) are shared copy-on-write. With "spawn" or "forkserver"
+        the instance is pickled to each worker, so custom models and
+        `metrics_hook` must be picklable (a module-level function, not a lambda);
+        the hook then runs in the workers. CachedEmbeddingModel and the sqlite
+        caches reopen their files in each worker, with an empty in-memory LRU.
+
+        Args:
+            cite_items: An iterable of CiteItem, read at most `2 * workers`
+                        chunks ahead of the consumed results.
+            workers: Number of worker processes. Defaults to the number of CPUs.
+                     With 1, items are cited in the current process.
+            chunksize: Items sent to a worker at a time. Defaults to 16.
+            batch_size: `batch_size` used by the workers. Defaults to 64.
+            start_method: multiprocessing start method ("fork", "spawn" or
+                          "forkserver"). Defaults to the platform default.
+                          Use "spawn" with device="cuda".
+            threads_per_worker: Torch threads per worker, so that workers do not
+                                oversubscribe the cores. None keeps the torch
+                                default. Defaults to 1.
+
+        Yields:
+            RagCitationOutput, one per item, in input order.
+        """
+        from rag_citation.parallel import imap_citations
+
+        return imap_citations(
+            self,
+            cite_items,
+            workers=workers,
+            chunksize=chunksize,
+            batch_size=batch_size,
+            start_method=start_method,
+            threads_per_worker=threads_per_worker,
+        )
+
+    def map(self, cite_items: Iterable, **kwargs) -> List[RagCitationOutput]:
+        """
+        Same as `imap`, but returns the list of outputs.
+
+        Args:
+            cite_items: An iterable of CiteItem.
+            **kwargs: The options of `imap`.
+
+        Returns:
+            A list of RagCitationOutput, one per item, in input order.
+        """
+        return list(self.imap(cite_items, **kwargs))
+
+    def stream(self, chunks: Iterable[str], context: list) -> Iterator[Dict]:
+        """
+        Cites an answer sentence by sentence while it is being generated.
+
+        The context documents are split and embedded once, before the first chunk
+        is read. The answer text is accumulated and re-parsed once a sentence may
+        have closed; every sentence followed by the start of another one is
+        cited and yielded right away. The last sentence is yielded when `chunks`
+        is exhausted. Only supported with the non-LLM method.
+
+        Sentence boundaries come from parsing the text received so far, so in rare
+        cases they can differ from the boundaries of a parse of the whole answer.
+        Citations above the threshold match the whole-answer ones. The fallback
+        for uncited entities only sees the current sentence, so it can cite an
+        entity that a later sentence cites.
+
+        Args:
+            chunks: An iterable of answer text chunks, e.g. LLM stream deltas.
+            context: The context documents, in the same format as CiteItem.
+
+        Yields:
+            One dict per answer sentence with "answer_sentences", "cite_document"
+            (empty when the sentence is not cited) and "missing_word" keys.
+        """
+        state = self._prepare_stream(context)
+        text = ""
+        for chunk in chunks:
+            text += chunk
+            yield from self._cite_closed_sentences(state, text)
+        yield from self._cite_closed_sentences(state, text, final=True)
+
+    async def astream(
+        self, chunks: AsyncIterable[str], context: list
+    ) -> AsyncIterable[Dict]:
+        """
+        Async version of `stream`, for an async iterable of chunks.
+
+        The parsing and embedding work runs in the event loop's default executor.
+
+        Args:
+            chunks: An async iterable of answer text chunks.
+            context: The context documents, in the same format as CiteItem.
+
+        Yields:
+            See `stream`.
+        """
+        loop = asyncio.get_running_loop()
+        state = await loop.run_in_executor(None, self._prepare_stream, context)
+        text = ""
+        async for chunk in chunks:
+            text += chunk
+            for entry in await loop.run_in_executor(
+                None, self._cite_closed_sentences, state, text
+            ):
+                yield entry
+        for entry in await loop.run_in_executor(
+            None, functools.partial(self._cite_closed_sentences, state, text, True)
+        ):
+            yield entry
 
     # ------------------------------------------------------------------ #
     #  Non-LLM pipeline
     # ------------------------------------------------------------------ #
 
-    def _run_non_llm(self, cite_item) -> RagCitationOutput:
+    def _run_non_llm(self, cite_item, answer_doc=None) -> RagCitationOutput:
         """Execute the existing non-LLM pipeline (SpaCy + SentenceTransformers)."""
-        from tqdm import tqdm
+        with metrics.stage("focus_word"):
+            if answer_doc is None:
+                answer_doc = self._focus_word.nlp(cite_item.answer)
+            focus_words = self._focus_word.get_focus_word_from_doc(answer_doc)
+        answer_sentences = [sent.text for sent in answer_doc.sents]
+        stored_ids = self._stored_source_ids(cite_item)
 
-        focus_words = self._focus_word.get_focus_word(cite_item.answer)
-        pair = self._generate_pair.pair(focus_words, cite_item)
+        if self._pairing == "top-k":
+            with metrics.stage("pair"):
+                document_sentences = self._generate_pair.split_documents(
+                    cite_item, self._stored_document_sentences(stored_ids)
+                )
+            embedded = self._embed_sentences(
+                self._item_sentences(answer_sentences, document_sentences),
+                self._stored_sentence_embeddings([stored_ids]),
+            )
+            with metrics.stage("pair"):
+                pair = self._top_k_pairs(
+                    focus_words,
+                    cite_item,
+                    answer_sentences,
+                    document_sentences,
+                    embedded,
+                )
+            return self._resolve_citations(cite_item, focus_words, pair, embedded)
+
+        with metrics.stage("pair"):
+            pair = self._generate_pair.pair(
+                focus_words,
+                cite_item,
+                answer_sentences=answer_sentences,
+                document_sentences=self._stored_document_sentences(stored_ids),
+            )
 
-        citated, less_than_therhold_value, finded_label = self._cite(
-            focus_words, pair
+        embedded = self._embed_pair_sentences(
+            pair, self._stored_sentence_embeddings([stored_ids])
         )
 
-        not_find = self._find_missing_labels(finded_label, focus_words)
+        return self._resolve_citations(cite_item, focus_words, pair, embedded)
 
-        results, not_found, found_word = self._find_label(
-            focus_words, not_find, less_than_therhold_value
+    def _stored_source_ids(self, cite_item) -> Optional[list]:
+        """
+        The source_id of each context document if the store holds that exact text,
+        else None; None without a context store. Documents changed since the store
+        was built are split again. Computed once per item, as it hashes every
+        document.
+        """
+        if self._context_store is None:
+            return None
+        return [
+            (
+                document_data.get("source_id")
+                if self._context_store.matches(
+                    document_data.get("source_id"), document_data.get("document")
+                )
+                else None
+            )
+            for document_data in cite_item.context
+        ]
+
+    def _stored_document_sentences(self, stored_ids: Optional[list]) -> Optional[list]:
+        """Stored sentences of each document of `_stored_source_ids`, else None."""
+        if stored_ids is None:
+            return None
+        return [
+            self._context_store.sentences(source_id) if source_id is not None else None
+            for source_id in stored_ids
+        ]
+
+    def _stored_sentence_embeddings(self, stored_ids_list: list) -> Optional[dict]:
+        """Stored embeddings of every sentence of the items' stored documents."""
+        if self._context_store is None:
+            return None
+        return self._context_store.sentence_embeddings(
+            source_id
+            for stored_ids in stored_ids_list
+            for source_id in stored_ids
+            if source_id is not None
+        )
+
+    def _item_sentences(
+        self, answer_sentences: List[str], document_sentences: List[List[str]]
+    ) -> List[str]:
+        """The answer sentences followed by every document sentence of an item."""
+        return answer_sentences + [
+            sentence for sentences in document_sentences for sentence in sentences
+        ]
+
+    def _top_k_pairs(
+        self,
+        focus_words,
+        cite_item,
+        answer_sentences: List[str],
+        document_sentences: List[List[str]],
+        embedded: tuple,
+    ) -> List["Pair"]:
+        """
+        Pair each answer sentence with its `top_k` nearest document sentences.
+
+        Candidates are ranked with one brute-force cosine matrix between the
+        answer sentences and the distinct document sentences. The focus-word
+        constraint then only applies to the candidates: each occurrence of a
+        candidate in the documents is paired when it shares a focus word with
+        the answer sentence.
+
+        Args:
+            focus_words: The focus words of the answer.
+            cite_item: The CiteItem being cited.
+            answer_sentences: The sentences of the answer.
+            document_sentences: The sentences of each context document.
+            embedded: (embeddings, sentence_index) covering every answer and
+                      document sentence, as returned by `_embed_sentences`.
+
+        Returns:
+            The pairs, ordered by answer sentence and then by document sentence.
+        """
+        documents = [
+            (document_data["source_id"], sentence)
+            for document_data, sentences in zip(cite_item.context, document_sentences)
+            for sentence in sentences
+        ]
+        if not answer_sentences or not documents:
+            return []
+
+        rows_by_sentence = defaultdict(list)
+        for row, (_, sentence) in enumerate(documents):
+            rows_by_sentence[sentence].append(row)
+        unique_sentences = list(rows_by_sentence)
+
+        embeddings, sentence_index = embedded
+        scores = self._score.cosine_matrix(
+            embeddings[[sentence_index[s] for s in answer_sentences]],
+            embeddings[[sentence_index[s] for s in unique_sentences]],
         )
+        nearest = scores.topk(min(self._top_k, len(unique_sentences)), dim=1).indices
+
+        candidates = [
+            [
+                row
+                for index in indices
+                for row in rows_by_sentence[unique_sentences[index]]
+            ]
+            for indices in nearest.tolist()
+        ]
+        return self._generate_pair.pair_candidates(
+            focus_words, answer_sentences, documents, candidates
+        )
+
+    def _run_non_llm_batch(self, cite_items: list, batch_size: int) -> list:
+        """Execute the non-LLM pipeline over several items with shared batches."""
+        with metrics.stage("focus_word"):
+            nlp = self._focus_word.nlp
+            answer_docs = list(
+                nlp.pipe(
+                    [cite_item.answer for cite_item in cite_items],
+                    batch_size=batch_size,
+                )
+            )
+            focus_words_list = [
+                self._focus_word.get_focus_word_from_doc(answer_doc)
+                for answer_doc in answer_docs
+            ]
+
+        stored_ids_list = [
+            self._stored_source_ids(cite_item) for cite_item in cite_items
+        ]
+        stored_sentences = [
+            self._stored_document_sentences(stored_ids)
+            or [None] * len(cite_item.context)
+            for cite_item, stored_ids in zip(cite_items, stored_ids_list)
+        ]
+        # Focus-word pairing matches long documents window by window instead.
+        max_chars = (
+            None if self._pairing == "top-k" else self._generate_pair.window_chars
+        )
+        documents = list(
+            dict.fromkeys(
+                document_data["document"]
+                for cite_item, item_sentences in zip(cite_items, stored_sentences)
+                for document_data, sentences in zip(cite_item.context, item_sentences)
+                if sentences is None
+                and (max_chars is None or len(document_data["document"]) <= max_chars)
+            )
+        )
+        with metrics.stage("pair"):
+            sentences_by_document = dict(
+                zip(
+                    documents,
+                    self._generate_pair.split_sentences(
+                        documents, batch_size=batch_size
+                    ),
+                )
+            )
+
+        answer_sentences_list = [
+            [sent.text for sent in answer_doc.sents] for answer_doc in answer_docs
+        ]
+        document_sentences_list = [
+            [
+                (
+                    sentences_by_document.get(document_data["document"])
+                    if sentences is None
+                    else sentences
+                )
+                for document_data, sentences in zip(cite_item.context, item_sentences)
+            ]
+            for cite_item, item_sentences in zip(cite_items, stored_sentences)
+        ]
+
+        if self._pairing == "top-k":
+            embedded = self._embed_sentences(
+                (
+                    sentence
+                    for answer_sentences, document_sentences in zip(
+                        answer_sentences_list, document_sentences_list
+                    )
+                    for sentence in self._item_sentences(
+                        answer_sentences, document_sentences
+                    )
+                ),
+                self._stored_sentence_embeddings(stored_ids_list),
+            )
+            with metrics.stage("pair"):
+                pairs = [
+                    self._top_k_pairs(
+                        focus_words,
+                        cite_item,
+                        answer_sentences,
+                        document_sentences,
+                        embedded,
+                    )
+                    for cite_item, focus_words, answer_sentences, document_sentences in zip(
+                        cite_items,
+                        focus_words_list,
+                        answer_sentences_list,
+                        document_sentences_list,
+                    )
+                ]
+        else:
+            with metrics.stage("pair"):
+                pairs = [
+                    self._generate_pair.pair(
+                        focus_words,
+                        cite_item,
+                        answer_sentences=answer_sentences,
+                        document_sentences=document_sentences,
+                    )
+                    for cite_item, focus_words, answer_sentences, document_sentences in zip(
+                        cite_items,
+                        focus_words_list,
+                        answer_sentences_list,
+                        document_sentences_list,
+                    )
+                ]
+            embedded = self._embed_pair_sentences(
+                [x for pair in pairs for x in pair],
+                self._stored_sentence_embeddings(stored_ids_list),
+            )
+
+        return [
+            self._resolve_citations(cite_item, focus_words, pair, embedded)
+            for cite_item, focus_words, pair in zip(cite_items, focus_words_list, pairs)
+        ]
+
+    def _resolve_citations(
+        self,
+        cite_item,
+        focus_words,
+        pair: List["Pair"],
+        embedded: Optional[tuple] = None,
+    ) -> RagCitationOutput:
+        """Score the pairs of one item and turn them into a RagCitationOutput."""
+        with metrics.stage("cite"):
+            label_index = self._label_index(focus_words)
+            citated, less_than_therhold_value, finded_label = self._cite(
+                label_index, pair, embedded
+            )
+        metrics.count("pairs", len(pair))
+        metrics.count("cited_pairs", len(citated))
+
+        with metrics.stage("find_label"):
+            not_find = self._find_missing_labels(finded_label, focus_words)
+
+            results, not_found, found_word = self._find_label(
+                label_index, not_find, less_than_therhold_value
+            )
 
         missing_word = self._find_missing_words(
             focus_words.combine, found_word + finded_label
@@ -127,96 +819,242 @@ class Inference:
         citated.update(results)
         hallucination = len(missing_word) > 0
 
-        return RagCitationOutput(
-            self._making_cite_pair(cite_item, citated), missing_word, hallucination
-        )
+        with metrics.stage("making_cite_pair"):
+            citation = self._making_cite_pair(cite_item, citated)
+
+        return RagCitationOutput(citation, missing_word, hallucination)
 
-    def _get_label_and_type(self, focus_words, word: str) -> tuple:
+    def _label_index(self, focus_words) -> Dict[str, tuple]:
+        """
+        Map each lowercased focus word to its (label, type).
+
+        When several focus words only differ in case, the first one wins.
+        """
+        label_index = {}
         for item in focus_words.combine:
-            if item["words"].lower() == word.lower():
-                return item["label"], item["type"]
-        return None, None
+            label_index.setdefault(item["words"].lower(), (item["label"], item["type"]))
+        return label_index
 
-    def _cite(self, focus_words, pair: List[Dict]):
-        from tqdm import tqdm
+    def _get_label_and_type(self, label_index: Dict[str, tuple], word: str) -> tuple:
+        return label_index.get(word.lower(), (None, None))
 
-        citation = {}
-        finded_label = []
-        less_than_threshold_value = {}
+    def _embed_pair_sentences(
+        self, pair: List["Pair"], known_embeddings: Optional[dict] = None
+    ) -> tuple:
+        """
+        Embed every unique answer and document sentence of the pairs in one batch.
+
+        Args:
+            pair: The pairs whose sentences are embedded.
+            known_embeddings: Optional mapping from sentence to a precomputed
+                              embedding. Those sentences are not re-encoded.
+
+        Returns:
+            A tuple of (embeddings, sentence_index) where sentence_index maps each
+            sentence to its row in the embeddings tensor.
+        """
+        return self._embed_sentences(
+            (
+                sentence
+                for x in pair
+                for sentence in (x.answer_sentences, x.document_sentences)
+            ),
+            known_embeddings,
+        )
+
+    def _embed_sentences(
+        self, sentences: Iterable[str], known_embeddings: Optional[dict] = None
+    ) -> tuple:
+        """
+        Embed every unique sentence in one batch.
+
+        Args:
+            sentences: The sentences to embed, possibly repeated.
+            known_embeddings: Optional mapping from sentence to a precomputed
+                              embedding. Those sentences are not re-encoded.
+
+        Returns:
+            A tuple of (embeddings, sentence_index) where sentence_index maps each
+            sentence to its row in the embeddings tensor.
+        """
+        sentence_index = {}
+        for sentence in sentences:
+            if sentence not in sentence_index:
+                sentence_index[sentence] = len(sentence_index)
+
+        if not sentence_index:
+            return None, sentence_index
 
-        for x in tqdm(pair):
-            word_label = []
-            answer_embedding = self._embedding_model.embedding(x["answer_sentences"])
-            document_embedding = self._embedding_model.embedding(
-                x["document_sentences"]
+        if not known_embeddings:
+            metrics.count("sentences_embedded", len(sentence_index))
+            with metrics.stage("embed"):
+                embeddings = self._embedding_model.embed_batch(list(sentence_index))
+            return embeddings, sentence_index
+
+        import torch
+
+        to_encode = [s for s in sentence_index if s not in known_embeddings]
+        metrics.count("sentences_embedded", len(to_encode))
+        metrics.count("stored_embeddings", len(sentence_index) - len(to_encode))
+        with metrics.stage("embed"):
+            encoded = {}
+            device = "cpu"
+            if to_encode:
+                rows = self._embedding_model.embed_batch(to_encode)
+                device = rows.device
+                encoded = dict(zip(to_encode, rows))
+
+            embeddings = torch.stack(
+                [
+                    (
+                        encoded[s]
+                        if s in encoded
+                        else torch.as_tensor(known_embeddings[s], device=device)
+                    )
+                    for s in sentence_index
+                ]
             )
-            cosine_score_ = self._score.cosine_score(
-                answer_embedding, document_embedding
+        return embeddings, sentence_index
+
+    def _score_pairs(
+        self, pair: List["Pair"], embedded: Optional[tuple] = None
+    ) -> tuple:
+        """
+        Score every pair with one cosine matrix and apply the threshold as a mask.
+
+        Args:
+            pair: The pairs to score.
+            embedded: Optional (embeddings, sentence_index) already covering every
+                      sentence of `pair`, as returned by `_embed_pair_sentences`.
+
+        Returns:
+            A tuple of (scores, above_therhold), two lists aligned with `pair`.
+        """
+        if not pair:
+            return [], []
+
+        if embedded is None:
+            embedded = self._embed_pair_sentences(pair)
+        embeddings, sentence_index = embedded
+
+        answer_rows = {}
+        document_rows = {}
+        for x in pair:
+            answer_rows.setdefault(sentence_index[x.answer_sentences], len(answer_rows))
+            document_rows.setdefault(
+                sentence_index[x.document_sentences], len(document_rows)
             )
 
-            if cosine_score_ >= self._therhold_value:
-                for _word in x["word"]:
-                    label_word = self._get_label_and_type(focus_words, _word)
+        scores = self._score.cosine_matrix(
+            embeddings[list(answer_rows)], embeddings[list(document_rows)]
+        )
+        pair_scores = scores[
+            [answer_rows[sentence_index[x.answer_sentences]] for x in pair],
+            [document_rows[sentence_index[x.document_sentences]] for x in pair],
+        ]
+        above_therhold = pair_scores >= self._therhold_value
+
+        return pair_scores.tolist(), above_therhold.tolist()
+
+    def _cite(
+        self, label_index: Dict[str, tuple], pair: List["Pair"], embedded=None
+    ) -> tuple:
+        citation = {}
+        finded_label = set()
+        less_than_threshold_value = {}
+
+        pair_scores, above_therhold = self._score_pairs(pair, embedded)
+
+        for x, cosine_score_, is_cited in zip(pair, pair_scores, above_therhold):
+            if is_cited:
+                word_label = []
+                labelled = set()
+                for _word in x.word:
+                    label_word = self._get_label_and_type(label_index, _word)
                     if label_word[1] == "ENTITY":
-                        if not any(item["word"] == _word for item in word_label):
+                        if _word not in labelled:
+                            labelled.add(_word)
                             word_label.append(
                                 {"word": _word, "entity_name": label_word[0]}
                             )
-                        finded_label.append(_word)
+                        finded_label.add(_word)
 
-                citation[x["_id"]] = {
-                    "answer_sentences": x["answer_sentences"],
-                    "document_sentences": x["document_sentences"],
-                    "word": list(set(x["word"])),
+                citation[x.id] = {
+                    "answer_sentences": x.answer_sentences,
+                    "document_sentences": x.document_sentences,
+                    "word": list(set(x.word)),
                     "label": word_label,
-                    "source_id": x["source_id"],
+                    "source_id": x.source_id,
                     "score": cosine_score_,
                 }
             else:
-                for _word in x["word"]:
-                    label_word = self._get_label_and_type(focus_words, _word)
+                for _word in x.word:
+                    label_word = self._get_label_and_type(label_index, _word)
                     if label_word[1] == "ENTITY" and _word not in finded_label:
-                        less_than_threshold_value[x["_id"]] = {
-                            "answer_sentences": x["answer_sentences"],
-                            "document_sentences": x["document_sentences"],
-                            "word": list(set(x["word"])),
-                            "label": list(set(word_label)),
-                            "source_id": x["source_id"],
+                        less_than_threshold_value[x.id] = {
+                            "answer_sentences": x.answer_sentences,
+                            "document_sentences": x.document_sentences,
+                            "word": list(set(x.word)),
+                            "label": [],
+                            "source_id": x.source_id,
                             "score": cosine_score_,
                         }
+                        break
 
-        return citation, less_than_threshold_value, list(set(finded_label))
+        return citation, less_than_threshold_value, list(finded_label)
 
     def _find_missing_labels(self, finded_label: list, focus_words):
+        finded_label = set(finded_label)
         non_common_elements = [
             item for item in focus_words.only_entity_word if item not in finded_label
         ]
         return non_common_elements
 
-    def _find_label(self, focus_words, not_find, less_than_therhold_value: dict) -> Dict:
+    def _find_label(self, label_index, not_find, less_than_therhold_value: dict) -> Dict:
+        """
+        Fall back to the best below-threshold pair for each entity left uncited.
+
+        A pair is a candidate for a word when the word is a substring of one of its
+        words, ignoring case, so pairs with the word itself and pairs with a longer
+        word containing it compete on score. Candidates come from an index of the
+        distinct lowercased pair words, built once per distinct uncited word; that
+        scan is linear in the number of distinct pair words. Candidates are visited
+        in the order of less_than_therhold_value.
+        """
+        word_pairs = defaultdict(list)
+        for key, data in less_than_therhold_value.items():
+            for w in {w.lower() for w in data["word"]}:
+                word_pairs[w].append(key)
+        candidates_by_word = {
+            lowered: sorted(
+                {key for w, keys in word_pairs.items() if lowered in w for key in keys}
+            )
+            for lowered in {word.lower() for word in not_find}
+        }
+
         results = {}
         not_found = []
         found_word = []
         for word in not_find:
+            candidates = candidates_by_word[word.lower()]
             max_score = -1
             selected_json_id = None
             selected_json_data = None
-            for key, data in less_than_therhold_value.items():
-                if any(word.lower() in w.lower() for w in data["word"]):
-                    if data["score"] > max_score:
-                        max_score = data["score"]
-                        selected_json_id = key
-                        data["score"] = 100
-                        selected_json_data = data
-            if selected_json_id and selected_json_data:
+            for key in candidates:
+                data = less_than_therhold_value[key]
+                if data["score"] > max_score:
+                    max_score = data["score"]
+                    selected_json_id = key
+                    data["score"] = 100
+                    selected_json_data = data
+            if selected_json_id is not None:
                 word_label = []
+                labelled = set()
                 for _word in selected_json_data["word"]:
-                    label_word = self._get_label_and_type(focus_words, _word)
-                    if label_word[1] == "ENTITY":
-                        if not any(item["word"] == _word for item in word_label):
-                            word_label.append(
-                                {"word": _word, "entity_name": label_word[0]}
-                            )
+                    label_word = self._get_label_and_type(label_index, _word)
+                    if label_word[1] == "ENTITY" and _word not in labelled:
+                        labelled.add(_word)
+                        word_label.append({"word": _word, "entity_name": label_word[0]})
                 selected_json_data["label"] = word_label
                 results[selected_json_id] = selected_json_data
                 found_word.append(word)
@@ -279,26 +1117,213 @@ class Inference:
         ]
 
     # ------------------------------------------------------------------ #
-    #  LLM pipeline
+    #  Streaming
     # ------------------------------------------------------------------ #
 
-    def _run_llm(self, cite_item, messages=None) -> RagCitationOutput:
-        """Execute the LLM-based citation pipeline."""
-        if messages:
-            citation_response = self._llm_citation.generate_from_messages(
-                messages=messages,
-                answer=cite_item.answer,
-                context=cite_item.context,
+    def _prepare_stream(self, context: list) -> dict:
+        """
+        Split and embed the context documents of a stream once.
+
+        Returns:
+            The stream state: the validated CiteItem, the sentences of each
+            document, the embeddings of every document sentence and the offset of
+            the first answer character not yet cited.
+        """
+        if self.method != "non-llm":
+            raise ValueError("Streaming is only supported with method='non-llm'.")
+
+        from rag_citation.cite_item import CiteItem
+
+        # The answer is replaced by each sentence; only the context is kept.
+        stream_item = CiteItem(answer="stream", context=context)
+
+        stored_ids = self._stored_source_ids(stream_item)
+        document_sentences = self._stored_document_sentences(stored_ids) or [
+            None
+        ] * len(stream_item.context)
+        documents = list(
+            dict.fromkeys(
+                document_data["document"]
+                for document_data, sentences in zip(
+                    stream_item.context, document_sentences
+                )
+                if sentences is None
+            )
+        )
+        sentences_by_document = dict(
+            zip(documents, self._generate_pair.split_sentences(documents))
+        )
+        document_sentences = [
+            (
+                sentences_by_document[document_data["document"]]
+                if sentences is None
+                else sentences
+            )
+            for document_data, sentences in zip(stream_item.context, document_sentences)
+        ]
+
+        embeddings = self._stored_sentence_embeddings([stored_ids]) or {}
+        to_encode = list(
+            dict.fromkeys(
+                sentence
+                for sentences in document_sentences
+                for sentence in sentences
+                if sentence not in embeddings
+            )
+        )
+        if to_encode:
+            embeddings.update(
+                zip(to_encode, self._embedding_model.embed_batch(to_encode))
+            )
+
+        return {
+            "cite_item": stream_item,
+            "document_sentences": document_sentences,
+            "embeddings": embeddings,
+            "offset": 0,
+        }
+
+    def _cite_closed_sentences(
+        self, state: dict, text: str, final: bool = False
+    ) -> List[Dict]:
+        """
+        Cite the sentences of the streamed text that are closed.
+
+        A sentence is closed once the parse of the pending text starts another
+        sentence after it, or when `final` is set.
+        """
+        from rag_citation.cite_item import CiteItem
+
+        pending = CiteItem._clean_text(text)[state["offset"] :]
+        if not pending.strip() or not (final or _SENTENCE_END.search(pending)):
+            return []
+
+        sents = list(self._focus_word.nlp(pending).sents)
+        closed = sents if final else sents[:-1]
+        if not final and closed:
+            state["offset"] += sents[len(closed)].start_char
+
+        return [
+            self._cite_stream_sentence(state, sent)
+            for sent in closed
+            if sent.text.strip()
+        ]
+
+    def _cite_stream_sentence(self, state: dict, sent) -> Dict:
+        """Cite one closed answer sentence against the prepared context."""
+        sentence_item = copy.copy(state["cite_item"])
+        sentence_item.answer = sent.text
+
+        focus_words = self._focus_word.get_focus_word_from_doc(sent)
+        if self._pairing == "top-k":
+            embedded = self._embed_sentences(
+                self._item_sentences([sent.text], state["document_sentences"]),
+                state["embeddings"],
+            )
+            pair = self._top_k_pairs(
+                focus_words,
+                sentence_item,
+                [sent.text],
+                state["document_sentences"],
+                embedded,
             )
         else:
-            citation_response = self._llm_citation.generate(
-                answer=cite_item.answer,
-                context=cite_item.context,
+            pair = self._generate_pair.pair(
+                focus_words,
+                sentence_item,
+                answer_sentences=[sent.text],
+                document_sentences=state["document_sentences"],
             )
+            embedded = self._embed_pair_sentences(pair, state["embeddings"])
+        output = self._resolve_citations(sentence_item, focus_words, pair, embedded)
+
+        return {
+            "answer_sentences": sent.text,
+            "cite_document": [
+                cite_document
+                for citation in output.citation
+                for cite_document in citation["cite_document"]
+            ],
+            "missing_word": output.missing_word,
+        }
+
+    # ------------------------------------------------------------------ #
+    #  LLM pipeline
+    # ------------------------------------------------------------------ #
+
+    def _run_llm(self, cite_item, messages=None, answer=None) -> RagCitationOutput:
+        """
+        Execute the LLM-based citation pipeline.
+
+        `answer` overrides the text to cite (defaults to `cite_item.answer`).
+        """
+        answer = cite_item.answer if answer is None else answer
+        context, snippet_sources = self._llm_context(cite_item, answer)
+        with metrics.stage("llm"):
+            if messages:
+                citation_response = self._llm_citation.generate_from_messages(
+                    messages=messages,
+                    answer=answer,
+                    context=context,
+                )
+            else:
+                citation_response = self._llm_citation.generate(
+                    answer=answer,
+                    context=context,
+                )
+
+        return self._llm_output(citation_response, cite_item, snippet_sources)
+
+    async def _arun_llm(
+        self, cite_item, messages=None, answer=None
+    ) -> RagCitationOutput:
+        """Async version of `_run_llm`."""
+        answer = cite_item.answer if answer is None else answer
+        context, snippet_sources = self._llm_context(cite_item, answer)
+        with metrics.stage("llm"):
+            if messages:
+                citation_response = await self._llm_citation.agenerate_from_messages(
+                    messages=messages,
+                    answer=answer,
+                    context=context,
+                )
+            else:
+                citation_response = await self._llm_citation.agenerate(
+                    answer=answer,
+                    context=context,
+                )
+
+        return self._llm_output(citation_response, cite_item, snippet_sources)
+
+    def _llm_context(self, cite_item, answer: str) -> tuple:
+        """
+        Context sent to the LLM: the full documents, or the pruned snippets when
+        a token budget is set.
+
+        Returns:
+            A tuple of (context, snippet_sources) where snippet_sources maps snippet
+            ids back to source_ids, or is None when the context is not pruned.
+        """
+        if self._llm_token_budget is None:
+            return cite_item.context, None
 
+        from rag_citation.llm.prune import prune_context
+
+        return prune_context(
+            answer,
+            cite_item.context,
+            token_budget=self._llm_token_budget,
+            window=self._llm_prune_window,
+        )
+
+    def _llm_output(
+        self, citation_response, cite_item, snippet_sources: Optional[dict] = None
+    ) -> RagCitationOutput:
         logger.info(f"LLM citations: {citation_response}")
 
-        citation_output = self._format_llm_citations(citation_response, cite_item)
+        citation_output = self._format_llm_citations(
+            citation_response, cite_item, snippet_sources
+        )
 
         return RagCitationOutput(
             citation=citation_output,
@@ -306,24 +1331,43 @@ class Inference:
             hallucination=False,
         )
 
-    def _format_llm_citations(self, citation_response, cite_item) -> list:
+    def _format_llm_citations(
+        self, citation_response, cite_item, snippet_sources: Optional[dict] = None
+    ) -> list:
         """
         Convert LLM CitationResponse into the same output format as the
         non-LLM method for consistency.
+
+        When the context was pruned, snippet ids returned by the LLM are mapped
+        back to their source_id through `snippet_sources`, and to the document
+        they were cut from, even when several documents share a source_id.
         """
+        from rag_citation.llm.prune import snippet_document_index
+
         grouped = defaultdict(list)
         for item in citation_response.citations:
-            grouped[item.sentence].append(item.source_document)
+            source_id = item.source_document
+            document_index = None
+            if snippet_sources is not None:
+                if source_id in snippet_sources:
+                    document_index = snippet_document_index(source_id)
+                    source_id = snippet_sources[source_id]
+                if (source_id, document_index) in grouped[item.sentence]:
+                    continue
+            grouped[item.sentence].append((source_id, document_index))
 
         output = []
-        for sentence, source_ids in grouped.items():
+        for sentence, sources in grouped.items():
             cite_documents = []
-            for source_id in source_ids:
+            for source_id, document_index in sources:
                 doc_text = ""
-                for ctx in cite_item.context:
-                    if ctx.get("source_id") == source_id:
-                        doc_text = ctx.get("document", "")
-                        break
+                if document_index is not None:
+                    doc_text = cite_item.context[document_index].get("document", "")
+                else:
+                    for ctx in cite_item.context:
+                        if ctx.get("source_id") == source_id:
+                            doc_text = ctx.get("document", "")
+                            break
                 cite_documents.append(
                     {
                         "document": doc_text,
@@ -341,3 +1385,104 @@ class Inference:
             )
 
         return output
+
+    # ------------------------------------------------------------------ #
+    #  Hybrid pipeline
+    # ------------------------------------------------------------------ #
+
+    def _run_hybrid(self, cite_item, messages=None) -> RagCitationOutput:
+        """
+        Non-LLM pipeline first, then the LLM for the unresolved sentences.
+
+        The fallback goes through `_run_llm`, so its context is pruned by
+        `_llm_context` (llm_token_budget, llm_prune_window) against the
+        unresolved sentences rather than the whole answer.
+        """
+        output, unresolved = self._run_hybrid_non_llm(cite_item)
+        if not unresolved:
+            return output
+
+        llm_output = self._run_llm(cite_item, messages, answer=" ".join(unresolved))
+        return self._merge_hybrid(output, llm_output, unresolved)
+
+    async def _arun_hybrid(self, cite_item, messages=None) -> RagCitationOutput:
+        """Async version of `_run_hybrid`."""
+        loop = asyncio.get_running_loop()
+        # Run in a copy of the context so the executor thread records the metrics.
+        output, unresolved = await loop.run_in_executor(
+            None, contextvars.copy_context().run, self._run_hybrid_non_llm, cite_item
+        )
+        if not unresolved:
+            return output
+
+        llm_output = await self._arun_llm(
+            cite_item, messages, answer=" ".join(unresolved)
+        )
+        return self._merge_hybrid(output, llm_output, unresolved)
+
+    def _run_hybrid_non_llm(self, cite_item) -> tuple:
+        """
+        Run the non-LLM pipeline and find the answer sentences it left unresolved.
+
+        Returns:
+            A tuple of (output, unresolved) where unresolved lists the answer
+            sentences that are uncited or contain a missing word.
+        """
+        with metrics.stage("focus_word"):
+            answer_doc = self._focus_word.nlp(cite_item.answer)
+        output = self._run_non_llm(cite_item, answer_doc)
+        for citation in output.citation:
+            for cite_document in citation["cite_document"]:
+                cite_document["engine"] = "non-llm"
+
+        cited = {citation["answer_sentences"] for citation in output.citation}
+        unresolved = [
+            sent.text
+            for sent in answer_doc.sents
+            if sent.text not in cited
+            or any(word in sent.text for word in output.missing_word)
+        ]
+        return output, unresolved
+
+    def _merge_hybrid(
+        self, output: RagCitationOutput, llm_output: RagCitationOutput, unresolved
+    ) -> RagCitationOutput:
+        """
+        Merge LLM citations into the non-LLM output.
+
+        Missing words inside sentences the LLM cited are considered resolved.
+        """
+        citations = {
+            citation["answer_sentences"]: citation for citation in output.citation
+        }
+        for llm_citation in llm_output.citation:
+            for cite_document in llm_citation["cite_document"]:
+                cite_document["engine"] = "llm"
+            sentence = llm_citation["answer_sentences"]
+            if sentence in citations:
+                citations[sentence]["cite_document"].extend(
+                    llm_citation["cite_document"]
+                )
+            else:
+                citations[sentence] = llm_citation
+
+        llm_cited = [
+            sentence
+            for sentence in unresolved
+            if any(
+                sentence in llm_citation["answer_sentences"]
+                or llm_citation["answer_sentences"] in sentence
+                for llm_citation in llm_output.citation
+            )
+        ]
+        missing_word = [
+            word
+            for word in output.missing_word
+            if not any(word in sentence for sentence in llm_cited)
+        ]
+
+        return RagCitationOutput(
+            citation=list(citations.values()),
+            missing_word=missing_word,
+            hallucination=len(missing_word) > 0,
+        )
@@ -1,4 +1,18 @@
 from rag_citation.llm.citation import LLMCitation
 from rag_citation.llm.schema import CitationItem, CitationResponse
+from rag_citation.llm.cache import (
+    BaseCitationCache,
+    InMemoryCitationCache,
+    SqliteCitationCache,
+)
+from rag_citation.llm.prune import prune_context
 
-__all__ = ["LLMCitation", "CitationItem", "CitationResponse"]
+__all__ = [
+    "LLMCitation",
+    "CitationItem",
+    "CitationResponse",
+    "BaseCitationCache",
+    "InMemoryCitationCache",
+    "SqliteCitationCache",
+    "prune_context",
+]
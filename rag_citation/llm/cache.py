@@ -0,0 +1,187 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+
+def citation_cache_key(model: str, temperature: float, messages: list) -> str:
+    """
+    Build the cache key of an LLM citation request.
+
+    Args:
+        model: LiteLLM model identifier.
+        temperature: LLM temperature.
+        messages: The messages sent to the LLM.
+
+    Returns:
+        A sha256 hex digest of the model, temperature and serialized messages.
+    """
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BaseCitationCache(ABC):
+    """
+    Interface of a cache for validated CitationResponse JSON.
+
+    `blocking` caches do I/O in `get` and `set`, so the async LLM path calls them
+    in an executor rather than on the event loop. Set it to False in caches that
+    only touch memory.
+
+    Args:
+        ttl (float, optional): Seconds an entry stays valid. Defaults to None (no expiry).
+    """
+
+    blocking = True
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self.ttl = ttl
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached CitationResponse JSON for a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            The cached JSON, or None if missing or expired.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a CitationResponse JSON under a key.
+
+        Args:
+            key (str): The cache key.
+            value (str): The validated CitationResponse JSON.
+        """
+        pass
+
+
+class InMemoryCitationCache(BaseCitationCache):
+    """
+    In-memory LRU cache of CitationResponse JSON.
+
+    Args:
+        max_size (int, optional): Maximum number of entries. Defaults to 1024.
+        ttl (float, optional): Seconds an entry stays valid. Defaults to None (no expiry).
+    """
+
+    blocking = False
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None) -> None:
+        super().__init__(ttl)
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        with self._lock:
+            state = self.__dict__.copy()
+            state["_entries"] = self._entries.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if self._expired(created_at):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class SqliteCitationCache(BaseCitationCache):
+    """
+    Sqlite-backed cache of CitationResponse JSON that survives restarts.
+
+    Args:
+        path (str): Path of the sqlite file.
+        ttl (float, optional): Seconds an entry stays valid. Defaults to None (no expiry).
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None) -> None:
+        super().__init__(ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = self._connect(path)
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS citations "
+            "(key TEXT PRIMARY KEY, created_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        db.commit()
+        return db
+
+    def __getstate__(self) -> dict:
+        # The lock and connection are reopened from `path`, e.g. in spawned workers.
+        state = self.__dict__.copy()
+        del state["_lock"], state["_db"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._db = self._connect(self.path)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created_at, value FROM citations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            created_at, value = row
+            if self._expired(created_at):
+                self._db.execute("DELETE FROM citations WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO citations (key, created_at, value) "
+                "VALUES (?, ?, ?)",
+                (key, time.time(), value),
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        """Close the sqlite connection."""
+        with self._lock:
+            self._db.close()
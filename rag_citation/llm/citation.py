@@ -1,6 +1,9 @@
+import asyncio
 import logging
 from typing import Optional
 
+from rag_citation import metrics
+from rag_citation.llm.cache import BaseCitationCache, citation_cache_key
 from rag_citation.llm.prompt import build_citation_prompt, CITATION_USER_TEMPLATE
 from rag_citation.llm.schema import CitationResponse
 
@@ -18,6 +21,8 @@ class LLMCitation:
                  environment variables (OPENAI_API_KEY, ANTHROPIC_API_KEY, etc.).
         temperature: LLM temperature for citation generation (default 0.0).
         max_tokens: Maximum tokens for the LLM response.
+        cache: Optional BaseCitationCache. Responses are cached by model, temperature
+               and a hash of the messages, so identical prompts skip the LLM call.
         **litellm_kwargs: Additional LiteLLM parameters (e.g., api_base, api_version).
     """
 
@@ -27,11 +32,12 @@ class LLMCitation:
         api_key: Optional[str] = None,
         temperature: float = 0.0,
         max_tokens: int = 4096,
+        cache: Optional[BaseCitationCache] = None,
         **litellm_kwargs,
     ):
-        try:
-            import litellm
-        except ImportError:
+        import importlib.util
+
+        if importlib.util.find_spec("litellm") is None:
             raise ImportError(
                 "The 'litellm' package is required for LLM-based citations. "
                 "Install it with: pip install rag-citation[llm]"
@@ -41,19 +47,28 @@ class LLMCitation:
         self.api_key = api_key
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.cache = cache
         self.litellm_kwargs = litellm_kwargs
-        self._litellm = litellm
+        # litellm is imported on the first call, not at construction time.
+        self._litellm = None
 
-    def _call_llm(self, messages: list) -> CitationResponse:
-        """
-        Call LiteLLM with structured output and return parsed CitationResponse.
+    def __getstate__(self) -> dict:
+        # The litellm module cannot be pickled, e.g. for spawned pool workers. It
+        # is imported again on the first call of each copy.
+        state = self.__dict__.copy()
+        state["_litellm"] = None
+        return state
 
-        Args:
-            messages: List of message dicts for litellm.completion().
+    def _client(self):
+        """Return the litellm module, importing it on first use."""
+        if self._litellm is None:
+            import litellm
 
-        Returns:
-            CitationResponse parsed from the LLM's structured output.
-        """
+            self._litellm = litellm
+        return self._litellm
+
+    def _completion_kwargs(self, messages: list) -> dict:
+        """Build the keyword arguments shared by litellm.completion() and acompletion()."""
         completion_kwargs = {
             "model": self.model,
             "messages": messages,
@@ -66,13 +81,114 @@ class LLMCitation:
         if self.api_key:
             completion_kwargs["api_key"] = self.api_key
 
-        response = self._litellm.completion(**completion_kwargs)
+        return completion_kwargs
+
+    def _parse_response(self, response) -> CitationResponse:
+        """Parse the structured output of a LiteLLM response into a CitationResponse."""
         raw_content = response.choices[0].message.content
 
         logger.info(f"LLM citation raw response: {raw_content}")
 
+        metrics.count("llm_response_chars", len(raw_content or ""))
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            metrics.count("llm_prompt_tokens", getattr(usage, "prompt_tokens", 0) or 0)
+            metrics.count(
+                "llm_completion_tokens", getattr(usage, "completion_tokens", 0) or 0
+            )
+
         return CitationResponse.model_validate_json(raw_content)
 
+    def _call_llm(self, messages: list) -> CitationResponse:
+        """
+        Call LiteLLM with structured output and return parsed CitationResponse.
+
+        Args:
+            messages: List of message dicts for litellm.completion().
+
+        Returns:
+            CitationResponse parsed from the LLM's structured output.
+        """
+        cache_key, cached = self._cache_lookup(messages)
+        if cached is not None:
+            return cached
+
+        self._count_request(messages)
+        response = self._client().completion(**self._completion_kwargs(messages))
+        return self._cache_store(cache_key, self._parse_response(response))
+
+    async def _acall_llm(self, messages: list) -> CitationResponse:
+        """
+        Async version of `_call_llm`, built on litellm.acompletion().
+
+        Args:
+            messages: List of message dicts for litellm.acompletion().
+
+        Returns:
+            CitationResponse parsed from the LLM's structured output.
+        """
+        cache_key, cached = await self._acache_lookup(messages)
+        if cached is not None:
+            return cached
+
+        self._count_request(messages)
+        response = await self._client().acompletion(**self._completion_kwargs(messages))
+        return await self._acache_store(cache_key, self._parse_response(response))
+
+    def _count_request(self, messages: list) -> None:
+        metrics.count("llm_calls")
+        metrics.count(
+            "llm_prompt_chars",
+            sum(len(str(message.get("content") or "")) for message in messages),
+        )
+
+    def _cache_lookup(self, messages: list) -> tuple:
+        """Return (cache_key, cached CitationResponse or None)."""
+        if self.cache is None:
+            return None, None
+
+        cache_key = citation_cache_key(self.model, self.temperature, messages)
+        return cache_key, self._cached_response(self.cache.get(cache_key))
+
+    async def _acache_lookup(self, messages: list) -> tuple:
+        """
+        Async version of `_cache_lookup`. Blocking caches are read in the default
+        executor, so a sqlite read does not stall the event loop.
+        """
+        if self.cache is None:
+            return None, None
+
+        cache_key = citation_cache_key(self.model, self.temperature, messages)
+        if self.cache.blocking:
+            cached = await asyncio.get_running_loop().run_in_executor(
+                None, self.cache.get, cache_key
+            )
+        else:
+            cached = self.cache.get(cache_key)
+        return cache_key, self._cached_response(cached)
+
+    def _cached_response(self, cached: Optional[str]) -> Optional[CitationResponse]:
+        if cached is None:
+            return None
+
+        logger.info("LLM citation served from cache")
+        metrics.count("llm_cache_hits")
+        return CitationResponse.model_validate_json(cached)
+
+    def _cache_store(self, cache_key, citation_response: CitationResponse):
+        if cache_key is not None:
+            self.cache.set(cache_key, citation_response.model_dump_json())
+        return citation_response
+
+    async def _acache_store(self, cache_key, citation_response: CitationResponse):
+        """Async version of `_cache_store`, writing blocking caches in an executor."""
+        if cache_key is not None and self.cache.blocking:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.cache.set, cache_key, citation_response.model_dump_json()
+            )
+            return citation_response
+        return self._cache_store(cache_key, citation_response)
+
     def generate(self, answer: str, context: list) -> CitationResponse:
         """
         Generate citations by calling an LLM via LiteLLM.
@@ -87,6 +203,20 @@ class LLMCitation:
         messages = build_citation_prompt(answer, context)
         return self._call_llm(messages)
 
+    async def agenerate(self, answer: str, context: list) -> CitationResponse:
+        """
+        Async version of `generate`.
+
+        Args:
+            answer: The LLM-generated answer text.
+            context: List of dicts with 'source_id' and 'document' keys.
+
+        Returns:
+            CitationResponse with list of CitationItem.
+        """
+        messages = build_citation_prompt(answer, context)
+        return await self._acall_llm(messages)
+
     def generate_from_messages(
         self, messages: list, answer: str, context: list
     ) -> CitationResponse:
@@ -105,6 +235,26 @@ class LLMCitation:
         Returns:
             CitationResponse with list of CitationItem.
         """
+        return self._call_llm(self._augment_messages(messages, answer, context))
+
+    async def agenerate_from_messages(
+        self, messages: list, answer: str, context: list
+    ) -> CitationResponse:
+        """
+        Async version of `generate_from_messages`.
+
+        Args:
+            messages: Existing conversation messages (list of role/content dicts).
+            answer: The LLM-generated answer text.
+            context: List of dicts with 'source_id' and 'document' keys.
+
+        Returns:
+            CitationResponse with list of CitationItem.
+        """
+        return await self._acall_llm(self._augment_messages(messages, answer, context))
+
+    def _augment_messages(self, messages: list, answer: str, context: list) -> list:
+        """Append the citation instructions to an existing conversation."""
         documents_text = ""
         for item in context:
             source_id = item.get("source_id", "unknown")
@@ -116,8 +266,4 @@ class LLMCitation:
             documents=documents_text.strip(),
         )
 
-        augmented_messages = list(messages) + [
-            {"role": "user", "content": citation_instruction}
-        ]
-
-        return self._call_llm(augmented_messages)
+        return list(messages) + [{"role": "user", "content": citation_instruction}]
@@ -0,0 +1,140 @@
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+SNIPPET_ID_SEPARATOR = "#"
+SNIPPET_DOCUMENT_SEPARATOR = ":"
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\w+")
+
+STOPWORDS = frozenset(
+    """a an and are as at be been but by for from had has have he her his i in
+    is it its of on or she that the their them they this to was were which who
+    will with you your not no so than then there these those into about over
+    also after before more most such can could would should may might do does
+    did""".split()
+)
+
+
+def approximate_token_count(text: str) -> int:
+    """Cheap token estimate of about four characters per token."""
+    return len(text) // 4 + 1
+
+
+def _content_words(text: str) -> set:
+    return {word for word in _WORD.findall(text.lower()) if word not in STOPWORDS}
+
+
+def _split_windows(document: str, max_window_words: int) -> List[str]:
+    """Split a document into sentences, cutting overly long ones into word windows."""
+    windows = []
+    for sentence in _SENTENCE_BOUNDARY.split(document):
+        words = sentence.split()
+        if not words:
+            continue
+        for start in range(0, len(words), max_window_words):
+            windows.append(" ".join(words[start : start + max_window_words]))
+    return windows
+
+
+def prune_context(
+    answer: str,
+    context: list,
+    token_budget: int,
+    window: int = 0,
+    max_window_words: int = 80,
+    min_overlap: int = 1,
+    token_counter: Optional[Callable[[str], int]] = None,
+) -> Tuple[list, Dict[str, str]]:
+    """
+    Keep only the parts of each document that share words with the answer.
+
+    Every document is split into sentences (long sentences into windows of
+    `max_window_words` words) without SpaCy. Each window is scored by the number
+    of distinct non-stopword answer words it contains. The best windows,
+    extended by `window` neighbours on each side, are kept until `token_budget`
+    is reached. Kept snippets get stable ids "<position>:<source_id>#<index>",
+    where position is the index of the document in `context` and index is the
+    position of their first window in the document. The position keeps ids unique
+    when documents share a source_id or have none.
+
+    Args:
+        answer: The LLM-generated answer text.
+        context: List of dicts with 'source_id' and 'document' keys.
+        token_budget: Maximum number of document tokens kept.
+        window: Number of neighbouring windows kept on each side of a match. Defaults to 0.
+        max_window_words: Maximum number of words per window. Defaults to 80.
+        min_overlap: Minimum number of shared words for a window to be kept. Defaults to 1.
+        token_counter: Callable returning the token count of a text. Defaults to
+                       `approximate_token_count`.
+
+    Returns:
+        A tuple of (pruned_context, snippet_sources). pruned_context is a list of
+        dicts with 'source_id' (the snippet id) and 'document' (the snippet text),
+        in document order. snippet_sources maps each snippet id to its source_id
+        ("unknown" for documents without one). Use `snippet_document_index` to
+        get the position of a snippet's document in `context`.
+    """
+    token_counter = token_counter or approximate_token_count
+    answer_words = _content_words(answer)
+
+    candidates = []
+    windows_by_document = []
+    for document_index, item in enumerate(context):
+        windows = _split_windows(item.get("document", ""), max_window_words)
+        windows_by_document.append(windows)
+        for window_index, text in enumerate(windows):
+            overlap = len(answer_words & _content_words(text))
+            if overlap >= min_overlap:
+                candidates.append((overlap, document_index, window_index))
+
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1], candidate[2]))
+
+    kept = [set() for _ in context]
+    used_tokens = 0
+    for _, document_index, window_index in candidates:
+        windows = windows_by_document[document_index]
+        span = range(
+            max(0, window_index - window),
+            min(len(windows), window_index + window + 1),
+        )
+        new_indices = [index for index in span if index not in kept[document_index]]
+        cost = sum(token_counter(windows[index]) for index in new_indices)
+        if used_tokens + cost > token_budget:
+            continue
+        kept[document_index].update(new_indices)
+        used_tokens += cost
+
+    pruned_context = []
+    snippet_sources = {}
+    for document_index, item in enumerate(context):
+        source_id = item.get("source_id", "unknown")
+        windows = windows_by_document[document_index]
+
+        # Merge consecutive windows into one snippet.
+        runs = []
+        for index in sorted(kept[document_index]):
+            if runs and runs[-1][-1] == index - 1:
+                runs[-1].append(index)
+            else:
+                runs.append([index])
+
+        for run in runs:
+            snippet_id = (
+                f"{document_index}{SNIPPET_DOCUMENT_SEPARATOR}"
+                f"{source_id}{SNIPPET_ID_SEPARATOR}{run[0]}"
+            )
+            snippet_sources[snippet_id] = source_id
+            pruned_context.append(
+                {
+                    "source_id": snippet_id,
+                    "document": " ".join(windows[index] for index in run),
+                }
+            )
+
+    return pruned_context, snippet_sources
+
+
+def snippet_document_index(snippet_id: str) -> int:
+    """The position in the pruned context of the document a snippet id comes from."""
+    return int(snippet_id.split(SNIPPET_DOCUMENT_SEPARATOR, 1)[0])
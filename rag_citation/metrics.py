@@ -0,0 +1,109 @@
+import contextvars
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict
+
+# Metrics of the citation running in the current thread or asyncio task.
+_current = contextvars.ContextVar("rag_citation_metrics", default=None)
+
+
+@dataclass
+class CitationMetrics:
+    """
+    Dataclass to store the per-stage timings and counters of one citation.
+
+    Stages, in seconds of wall time:
+        - focus_word: parsing the answer and extracting its focus words.
+        - pair: splitting the documents and matching focus words into pairs.
+        - embed: embedding the sentences of the pairs.
+        - cite: scoring the pairs and applying the threshold.
+        - find_label: the below-threshold fallback for uncited entities.
+        - making_cite_pair: grouping the citations per answer sentence.
+        - llm: the LLM round trip, including the cache lookup.
+
+    Counters (only those that occurred are present):
+        - pairs: pairs generated.
+        - cited_pairs: pairs at or above the threshold.
+        - skipped_pairs: pairs left out by the IDF filter and the per-word cap.
+        - sentences_embedded: sentences sent to the embedding model.
+        - stored_embeddings: sentences whose embedding came from the context store.
+        - embedding_cache_hits: sentences served by a CachedEmbeddingModel.
+        - llm_calls, llm_cache_hits: LLM requests sent, and served from the cache.
+        - llm_prompt_chars, llm_response_chars: sizes of the LLM messages and reply.
+        - llm_prompt_tokens, llm_completion_tokens: token usage reported by the provider.
+
+    Attributes:
+        method: The Inference method ("non-llm", "llm" or "hybrid").
+        items: Number of cite items covered; more than 1 for `Inference.batch`.
+        total: Wall time of the whole call, in seconds.
+        timings: Seconds spent in each stage.
+        counters: The counters above.
+    """
+
+    method: str
+    items: int = 1
+    total: float = 0.0
+    timings: Dict[str, float] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+
+
+class _Recorder:
+    def __init__(self, method: str, items: int) -> None:
+        self.method = method
+        self.items = items
+        self.timings = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.start = time.perf_counter()
+
+    def result(self) -> CitationMetrics:
+        return CitationMetrics(
+            method=self.method,
+            items=self.items,
+            total=time.perf_counter() - self.start,
+            timings=dict(self.timings),
+            counters=dict(self.counters),
+        )
+
+
+@contextmanager
+def record(method: str, items: int = 1):
+    """
+    Collects the metrics of the stages run inside the block.
+
+    Yields a callable that returns the CitationMetrics collected so far. Nested
+    blocks add to the outermost one, whose callable returns None.
+    """
+    if _current.get() is not None:
+        yield lambda: None
+        return
+
+    recorder = _Recorder(method, items)
+    token = _current.set(recorder)
+    try:
+        yield recorder.result
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """Adds the wall time of the block to a stage, when metrics are collected."""
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.timings[name] += time.perf_counter() - start
+
+
+def count(name: str, value: int = 1) -> None:
+    """Adds to a counter, when metrics are collected."""
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.counters[name] += value
@@ -0,0 +1,11 @@
+from rag_citation.onnx.embedding_model import OnnxEmbeddingModel, default_onnx_dir
+from rag_citation.onnx.export import export_onnx_model
+from rag_citation.onnx.parity import ParityReport, check_parity
+
+__all__ = [
+    "OnnxEmbeddingModel",
+    "default_onnx_dir",
+    "export_onnx_model",
+    "ParityReport",
+    "check_parity",
+]
@@ -0,0 +1,94 @@
+"""
+Export GIST embedding models to ONNX and check them against the torch backend.
+
+Usage:
+    python -m rag_citation.onnx export --embedding-model sm --quantize
+    python -m rag_citation.onnx check --embedding-model sm --quantize --input items.jsonl
+
+The check input is a JSON Lines file where each line has an "answer" and a
+"context" key, as in CiteItem.
+"""
+
+import argparse
+import json
+import sys
+
+from rag_citation.cite_item import CiteItem
+from rag_citation.onnx.embedding_model import OnnxEmbeddingModel
+from rag_citation.onnx.export import export_onnx_model
+from rag_citation.onnx.parity import check_parity
+
+
+def _read_cite_items(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                yield CiteItem(answer=item["answer"], context=item["context"])
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m rag_citation.onnx",
+        description="Export embedding models to ONNX and check their parity.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Export a model to ONNX.")
+    export.add_argument(
+        "--embedding-model",
+        default="sm",
+        help='"sm", "md", "lg" or a SentenceTransformer name or path.',
+    )
+    export.add_argument("--output", help="Directory to write. Defaults to the cache.")
+    export.add_argument(
+        "--quantize", action="store_true", help="Also write an int8 model."
+    )
+    export.add_argument(
+        "--allow-download",
+        action="store_true",
+        help="Download the model if it is not cached locally.",
+    )
+
+    check = commands.add_parser("check", help="Compare ONNX and torch citations.")
+    check.add_argument("--input", required=True, help="JSON Lines CiteItem file.")
+    check.add_argument(
+        "--embedding-model",
+        default="sm",
+        help='The exported model, also used as the torch reference: "sm", "md", '
+        '"lg" or a SentenceTransformer name or path.',
+    )
+    check.add_argument("--path", help="Directory of the export. Defaults to the cache.")
+    check.add_argument("--quantize", action="store_true")
+    check.add_argument("--spacy-model", default="sm", choices=["sm", "md", "lg"])
+    check.add_argument("--therhold-value", type=float, default=0.88)
+    check.add_argument("--tolerance", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        output_dir = export_onnx_model(
+            args.embedding_model,
+            output_dir=args.output,
+            quantize=args.quantize,
+            local_files_only=not args.allow_download,
+        )
+        print(f"Exported {args.embedding_model} to {output_dir}")
+        return
+
+    report = check_parity(
+        _read_cite_items(args.input),
+        OnnxEmbeddingModel(
+            args.embedding_model, path=args.path, quantize=args.quantize
+        ),
+        torch_model=args.embedding_model,
+        spacy_model=args.spacy_model,
+        therhold_value=args.therhold_value,
+        tolerance=args.tolerance,
+    )
+    print(json.dumps(report.__dict__, indent=2))
+    if not report.passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
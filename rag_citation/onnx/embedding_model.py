@@ -0,0 +1,200 @@
+import importlib.util
+import json
+import os
+from typing import List, Optional
+
+from rag_citation.base_model.base import BaseEmbeddingModel
+from rag_citation.base_model.embedding_model import EMBEDDING_MODELS
+from rag_citation.base_model.registry import registry
+
+CONFIG_FILE = "rag_citation_onnx.json"
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model.int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+def default_onnx_dir(embedding_model: str = "sm") -> str:
+    """
+    Returns the default directory of an exported ONNX model.
+
+    Args:
+        embedding_model (str, optional): Size of the embedding model ("sm", "md",
+                                         "lg") or a SentenceTransformer name.
+                                         Defaults to "sm".
+
+    Returns:
+        str: ~/.cache/rag_citation/onnx/<model name>, or $RAG_CITATION_CACHE/onnx/<model name>.
+    """
+    model_name = EMBEDDING_MODELS.get(embedding_model, embedding_model)
+    cache_dir = os.environ.get(
+        "RAG_CITATION_CACHE",
+        os.path.join(os.path.expanduser("~"), ".cache", "rag_citation"),
+    )
+    return os.path.join(cache_dir, "onnx", model_name.replace("/", "__"))
+
+
+def require_onnxruntime() -> None:
+    """Raises an ImportError with an install hint when onnxruntime is missing."""
+    for package in ("onnxruntime", "tokenizers"):
+        if importlib.util.find_spec(package) is None:
+            raise ImportError(
+                f"The '{package}' package is required for the ONNX embedding backend. "
+                "Install it with: pip install rag-citation[onnx]"
+            )
+
+
+class OnnxEmbeddingModel(BaseEmbeddingModel):
+    """
+    Embedding model that runs an exported GIST model with ONNX Runtime on CPU.
+
+    The model must be exported once with `python -m rag_citation.onnx export`,
+    optionally with `--quantize` for a dynamically int8-quantized copy. Sentences
+    are tokenized with the `tokenizers` library and encoded in batches sorted by
+    length, so little time is spent on padding. Pooling and normalization follow
+    the exported SentenceTransformer.
+
+    The ONNX Runtime session is shared through the model registry, so it is
+    created once per process, on first use.
+
+    Attributes:
+        model_name (str): The SentenceTransformer name, suffixed with "+onnx" or
+                          "+onnx-int8" so caches and context stores built with
+                          another backend are told apart.
+
+    Args:
+        embedding_model (str, optional): Size of the embedding model ("sm", "md",
+                                         "lg") or a SentenceTransformer name.
+                                         Defaults to "sm".
+        path (str, optional): Directory of the exported model. Defaults to
+                              `default_onnx_dir(embedding_model)`.
+        quantize (bool, optional): Use the int8-quantized model. Defaults to False.
+        batch_size (int, optional): Sentences per ONNX Runtime call. Defaults to 32.
+        intra_op_num_threads (int, optional): Threads per ONNX Runtime call.
+                                              Defaults to None (ONNX Runtime default).
+        providers (List[str], optional): ONNX Runtime execution providers.
+                                         Defaults to ["CPUExecutionProvider"].
+
+    Example:
+        >>> model = OnnxEmbeddingModel("sm", quantize=True)
+        >>> inference = Inference(embedding_model=model)
+    """
+
+    def __init__(
+        self,
+        embedding_model: str = "sm",
+        path: Optional[str] = None,
+        quantize: bool = False,
+        batch_size: int = 32,
+        intra_op_num_threads: Optional[int] = None,
+        providers: Optional[List[str]] = None,
+    ):
+        require_onnxruntime()
+
+        self.path = path or default_onnx_dir(embedding_model)
+        config_path = os.path.join(self.path, CONFIG_FILE)
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(
+                f"No exported ONNX model in '{self.path}'. Export it with: "
+                f"python -m rag_citation.onnx export --embedding-model {embedding_model}"
+                + (" --quantize" if quantize else "")
+            )
+        with open(config_path, "r", encoding="utf-8") as f:
+            self.config = json.load(f)
+
+        self.model_file = os.path.join(
+            self.path, QUANTIZED_MODEL_FILE if quantize else MODEL_FILE
+        )
+        if not os.path.exists(self.model_file):
+            raise FileNotFoundError(
+                f"'{self.model_file}' does not exist. Export it with: "
+                f"python -m rag_citation.onnx export --embedding-model {embedding_model}"
+                " --quantize"
+            )
+
+        self.model_name = self.config["model_name"] + (
+            "+onnx-int8" if quantize else "+onnx"
+        )
+        self.quantize = quantize
+        self.batch_size = batch_size
+        self.intra_op_num_threads = intra_op_num_threads
+        self.providers = list(providers or ["CPUExecutionProvider"])
+
+    @property
+    def registry_key(self) -> tuple:
+        """The key of the ONNX Runtime session in the model registry."""
+        return (
+            "onnxruntime",
+            self.model_file,
+            tuple(self.providers),
+            self.intra_op_num_threads,
+        )
+
+    def _load(self) -> tuple:
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        options = onnxruntime.SessionOptions()
+        if self.intra_op_num_threads is not None:
+            options.intra_op_num_threads = self.intra_op_num_threads
+        session = onnxruntime.InferenceSession(
+            self.model_file, sess_options=options, providers=self.providers
+        )
+
+        tokenizer = Tokenizer.from_file(os.path.join(self.path, TOKENIZER_FILE))
+        tokenizer.enable_truncation(max_length=self.config["max_seq_length"])
+        tokenizer.enable_padding(
+            pad_id=self.config["pad_token_id"], pad_token=self.config["pad_token"]
+        )
+        return session, tokenizer
+
+    def _encode(self, session, tokenizer, sentences: List[str]):
+        import numpy as np
+
+        encodings = tokenizer.encode_batch(sentences)
+        attention_mask = np.array(
+            [encoding.attention_mask for encoding in encodings], dtype=np.int64
+        )
+        inputs = {
+            "input_ids": np.array(
+                [encoding.ids for encoding in encodings], dtype=np.int64
+            ),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array(
+                [encoding.type_ids for encoding in encodings], dtype=np.int64
+            ),
+        }
+        hidden = session.run(
+            None, {name: inputs[name] for name in self.config["input_names"]}
+        )[0]
+
+        if self.config["pooling"] == "cls":
+            embeddings = hidden[:, 0]
+        else:
+            mask = attention_mask[:, :, None].astype(hidden.dtype)
+            embeddings = (hidden * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+
+        if self.config["normalize"]:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        return embeddings.astype(np.float32)
+
+    def embedding(self, sentence: str):
+        return self.embed_batch([sentence])
+
+    def embed_batch(self, sentences: List[str]):
+        import numpy as np
+        import torch
+
+        session, tokenizer = registry.get(self.registry_key, self._load)
+
+        # Encode sentences of similar length together to limit padding.
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+        embeddings = np.empty((len(sentences), self.config["dim"]), dtype=np.float32)
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start : start + self.batch_size]
+            embeddings[indices] = self._encode(
+                session, tokenizer, [sentences[i] for i in indices]
+            )
+        return torch.from_numpy(embeddings)
@@ -0,0 +1,137 @@
+import inspect
+import json
+import os
+from typing import Optional
+
+from rag_citation.base_model.embedding_model import EMBEDDING_MODELS
+from rag_citation.onnx.embedding_model import (
+    CONFIG_FILE,
+    MODEL_FILE,
+    QUANTIZED_MODEL_FILE,
+    default_onnx_dir,
+)
+
+
+def export_onnx_model(
+    embedding_model: str = "sm",
+    output_dir: Optional[str] = None,
+    quantize: bool = False,
+    local_files_only: bool = True,
+    opset_version: int = 14,
+) -> str:
+    """
+    Exports a SentenceTransformer model to ONNX for OnnxEmbeddingModel.
+
+    The transformer is exported with dynamic batch and sequence axes. Pooling
+    and normalization are read from the SentenceTransformer modules and stored
+    in the export's config, along with the tokenizer. With `quantize`, a
+    dynamically int8-quantized copy is written next to the float model.
+
+    Args:
+        embedding_model (str, optional): Size of the embedding model ("sm", "md",
+                                         "lg") or a SentenceTransformer name or path.
+                                         Defaults to "sm".
+        output_dir (str, optional): Where to write the export. Defaults to
+                                    `default_onnx_dir(embedding_model)`.
+        quantize (bool, optional): Also write the int8-quantized model. Defaults to False.
+        local_files_only (bool, optional): Only use a locally cached model, without
+                                           downloading. Defaults to True.
+        opset_version (int, optional): ONNX opset. Defaults to 14.
+
+    Returns:
+        str: The output directory.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer, models
+
+    model_name = EMBEDDING_MODELS.get(embedding_model, embedding_model)
+    output_dir = output_dir or default_onnx_dir(embedding_model)
+    os.makedirs(output_dir, exist_ok=True)
+
+    sentence_transformer = SentenceTransformer(
+        model_name, device="cpu", local_files_only=local_files_only
+    )
+    transformer = sentence_transformer[0]
+    if not isinstance(transformer, models.Transformer):
+        raise ValueError(
+            f"'{model_name}' does not start with a Transformer module and cannot be exported."
+        )
+
+    pooling = "cls"
+    normalize = False
+    for module in sentence_transformer:
+        if isinstance(module, models.Pooling):
+            pooling_config = module.get_config_dict()
+            if pooling_config["pooling_mode_cls_token"]:
+                pooling = "cls"
+            elif pooling_config["pooling_mode_mean_tokens"]:
+                pooling = "mean"
+            else:
+                raise ValueError(
+                    f"Unsupported pooling for ONNX export: {pooling_config}. "
+                    "Only CLS and mean pooling are supported."
+                )
+        elif isinstance(module, models.Normalize):
+            normalize = True
+
+    tokenizer = transformer.tokenizer
+    tokenizer.save_pretrained(output_dir)
+    sample = tokenizer(["rag citation"], return_tensors="pt")
+    input_names = [
+        name
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in sample
+    ]
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    export_kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False
+
+    model_path = os.path.join(output_dir, MODEL_FILE)
+    auto_model = transformer.auto_model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(auto_model),
+            tuple(sample[name] for name in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                **{name: {0: "batch", 1: "sequence"} for name in input_names},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=opset_version,
+            **export_kwargs,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(
+            model_path,
+            os.path.join(output_dir, QUANTIZED_MODEL_FILE),
+            weight_type=QuantType.QInt8,
+        )
+
+    config = {
+        "model_name": model_name,
+        "dim": sentence_transformer.get_sentence_embedding_dimension(),
+        "max_seq_length": sentence_transformer.max_seq_length,
+        "pooling": pooling,
+        "normalize": normalize,
+        "input_names": input_names,
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+    }
+    with open(os.path.join(output_dir, CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+
+    return output_dir
@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from rag_citation.base_model.embedding_model import EMBEDDING_MODELS, EmbeddingModel
+
+
+@dataclass
+class ParityReport:
+    """
+    Dataclass to store the result of an ONNX vs torch parity check.
+
+    Attributes:
+        pairs: Number of answer/document sentence pairs compared.
+        max_score_diff: Largest absolute difference between the cosine scores of
+                        the two backends.
+        mismatches: Number of pairs cited by one backend and not by the other.
+        borderline: Number of mismatches whose torch score is within the
+                    tolerance of the threshold.
+        passed: True when max_score_diff is within the tolerance and every
+                mismatch is borderline.
+    """
+
+    pairs: int
+    max_score_diff: float
+    mismatches: int
+    borderline: int
+    passed: bool
+
+
+class _NamedEmbeddingModel(EmbeddingModel):
+    """
+    EmbeddingModel of any SentenceTransformer name or path.
+
+    EmbeddingModel only accepts "sm", "md" and "lg" and falls back to "sm" for
+    other names, while the exporter accepts any name.
+    """
+
+    def __init__(self, model_name: str, device: Optional[str] = None):
+        self.model_name = model_name
+        self.device = device
+
+
+def _reference_model(torch_model):
+    """Resolves the torch reference the same way `export_onnx_model` does."""
+    if isinstance(torch_model, str):
+        return _NamedEmbeddingModel(EMBEDDING_MODELS.get(torch_model, torch_model))
+    return torch_model
+
+
+def check_parity(
+    cite_items: Iterable,
+    onnx_model,
+    torch_model="sm",
+    spacy_model: str = "sm",
+    therhold_value: float = 0.88,
+    tolerance: float = 0.02,
+) -> ParityReport:
+    """
+    Checks that the ONNX backend takes the same citation decisions as torch.
+
+    The pairs of each item are generated once and scored with both embedding
+    models. A pair is cited when its score reaches `therhold_value`.
+
+    Args:
+        cite_items (Iterable[CiteItem]): The items to compare on.
+        onnx_model (OnnxEmbeddingModel): The ONNX model to check.
+        torch_model (optional): The reference model: "sm", "md", "lg", any
+                                SentenceTransformer name or path, as in
+                                `export_onnx_model`, or a BaseEmbeddingModel.
+                                Defaults to "sm".
+        spacy_model (str, optional): Size of the SpaCy model. Defaults to "sm".
+        therhold_value (float, optional): The citation threshold. Defaults to 0.88.
+        tolerance (float, optional): Allowed absolute score difference. Defaults to 0.02.
+
+    Returns:
+        ParityReport: The comparison counters.
+    """
+    from rag_citation.inference import Inference
+
+    reference = Inference(
+        spacy_model=spacy_model,
+        embedding_model=_reference_model(torch_model),
+        therhold_value=therhold_value,
+    )
+    candidate = Inference(
+        spacy_model=spacy_model,
+        embedding_model=onnx_model,
+        therhold_value=therhold_value,
+    )
+
+    pairs = 0
+    max_score_diff = 0.0
+    mismatches = 0
+    borderline = 0
+    for cite_item in cite_items:
+        answer_doc = reference._focus_word.nlp(cite_item.answer)
+        focus_words = reference._focus_word.get_focus_word_from_doc(answer_doc)
+        pair = reference._generate_pair.pair(
+            focus_words,
+            cite_item,
+            answer_sentences=[sent.text for sent in answer_doc.sents],
+        )
+
+        reference_scores, reference_cited = reference._score_pairs(pair)
+        candidate_scores, candidate_cited = candidate._score_pairs(pair)
+        for reference_score, candidate_score, is_cited, onnx_cited in zip(
+            reference_scores, candidate_scores, reference_cited, candidate_cited
+        ):
+            pairs += 1
+            max_score_diff = max(max_score_diff, abs(reference_score - candidate_score))
+            if is_cited != onnx_cited:
+                mismatches += 1
+                if abs(reference_score - therhold_value) <= tolerance:
+                    borderline += 1
+
+    return ParityReport(
+        pairs=pairs,
+        max_score_diff=max_score_diff,
+        mismatches=mismatches,
+        borderline=borderline,
+        passed=max_score_diff <= tolerance and mismatches == borderline,
+    )
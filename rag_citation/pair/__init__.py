@@ -1,3 +1,6 @@
 from rag_citation.pair.generate_pair import GeneratePair
+from rag_citation.pair.idf import IdfTable
+from rag_citation.pair.matcher import FocusWordMatcher
+from rag_citation.pair.schema import Pair
 
-__all__ = ["GeneratePair"]
+__all__ = ["GeneratePair", "FocusWordMatcher", "IdfTable", "Pair"]
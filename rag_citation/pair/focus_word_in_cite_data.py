@@ -1,7 +1,9 @@
-import re
-import spacy
-from typing import List, Dict
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
 from rag_citation.base_model.spacy_model import SpacyBaseModel
+from rag_citation.pair.matcher import FocusWordMatcher
+
+SENTENCE_SPLITTERS = ("full", "parser", "sentencizer")
 
 
 class FindFocusWordInCiteData(SpacyBaseModel):
@@ -12,17 +14,155 @@ class FindFocusWordInCiteData(SpacyBaseModel):
     methods for finding occurrences of focus words in a list of documents and within
     a single answer string.
 
+    Documents only need sentence boundaries, so they are split with a trimmed pipeline
+    chosen by `sentence_splitter`:
+        - "full": the complete SpaCy pipeline.
+        - "parser" (default): the SpaCy pipeline with every component except the
+          tok2vec and parser disabled. Sentence boundaries are the same as "full".
+        - "sentencizer": SpaCy's rule-based sentencizer. Fastest, but boundaries
+          may differ from the dependency parser's.
+
+    Documents longer than `window_chars` are parsed in windows of about that many
+    characters, cut at a line break or a space, so that memory stays bounded and
+    SpaCy's `max_length` is never reached. The last sentence of each window is
+    parsed again at the start of the next one, so sentences are not cut by the
+    window boundaries. Only a sentence longer than `window_chars` is split.
+
     Args:
         spacy_model (str, optional): Size of the SpaCy model to load.
                                      Choose from "sm" (small), "md" (medium), or "lg" (large).
                                      Defaults to "sm".
+        sentence_splitter (str, optional): "full", "parser" or "sentencizer". Defaults to "parser".
+        n_process (int, optional): Number of processes `nlp.pipe` uses to split documents.
+                                   Worth raising for large contexts. Defaults to 1.
+        window_chars (int, optional): Length of the windows long documents are parsed in.
+                                      At most half of SpaCy's `max_length`. Defaults to 100,000.
     """
 
-    def __init__(self, spacy_model="sm") -> None:
+    def __init__(
+        self,
+        spacy_model="sm",
+        sentence_splitter="parser",
+        n_process=1,
+        window_chars: int = 100_000,
+    ) -> None:
         super().__init__(spacy_model)
+        if sentence_splitter not in SENTENCE_SPLITTERS:
+            raise ValueError(
+                f"Unknown sentence_splitter '{sentence_splitter}'. "
+                f"Choose one of: {', '.join(SENTENCE_SPLITTERS)}."
+            )
+        if window_chars < 1:
+            raise ValueError(f"window_chars must be at least 1, got {window_chars}.")
+        self.sentence_splitter = sentence_splitter
+        self.n_process = n_process
+        self.window_chars = window_chars
+
+    @property
+    def _sentence_nlp(self):
+        if self.sentence_splitter == "sentencizer":
+            return self.load_sentencizer()
+        return self.nlp
+
+    @property
+    def _sentence_disable(self) -> List[str]:
+        if self.sentence_splitter != "parser" or "parser" not in self.nlp.pipe_names:
+            return []
+        return [
+            name for name in self.nlp.pipe_names if name not in ("tok2vec", "parser")
+        ]
+
+    def split_sentences(
+        self, texts: List[str], batch_size: int = 64
+    ) -> List[List[str]]:
+        """
+        Splits many texts into sentences with a single `nlp.pipe` pass.
+
+        Args:
+            texts (List[str]): The texts to split.
+            batch_size (int, optional): Number of texts SpaCy processes per batch. Defaults to 64.
+
+        Returns:
+            List[List[str]]: The sentences of each text, in input order.
+        """
+        short_texts = [text for text in texts if len(text) <= self.window_chars]
+        n_process = self.n_process if len(short_texts) > 1 else 1
+        split = iter(
+            [
+                [sent.text for sent in doc.sents]
+                for doc in self._sentence_nlp.pipe(
+                    short_texts,
+                    batch_size=batch_size,
+                    disable=self._sentence_disable,
+                    n_process=n_process,
+                )
+            ]
+        )
+        return [
+            (
+                next(split)
+                if len(text) <= self.window_chars
+                else [
+                    sentence
+                    for window in self.iter_sentence_windows(text)
+                    for sentence in window
+                ]
+            )
+            for text in texts
+        ]
+
+    def _window_end(self, text: str, start: int) -> int:
+        """End of the window starting at `start`, after a line break or a space if possible."""
+        end = start + self.window_chars
+        if end >= len(text):
+            return len(text)
+        for separator in ("\n", " "):
+            cut = text.rfind(separator, start + self.window_chars // 2, end)
+            if cut != -1:
+                return cut + 1
+        return end
+
+    def iter_sentence_windows(self, text: str) -> Iterator[List[str]]:
+        """
+        Splits a text into sentences, parsing at most about `2 * window_chars`
+        characters at a time.
+
+        Args:
+            text (str): The text to split.
+
+        Yields:
+            List[str]: The sentences completed by each window, in text order.
+        """
+        nlp = self._sentence_nlp
+        disable = self._sentence_disable
+        if len(text) <= self.window_chars:
+            yield [sent.text for sent in nlp(text, disable=disable).sents]
+            return
+
+        pending = ""
+        start = 0
+        while start < len(text):
+            end = self._window_end(text, start)
+            window = pending + text[start:end]
+            start = end
+
+            sents = list(nlp(window, disable=disable).sents)
+            pending = ""
+            if start < len(text) and len(sents) > 1:
+                # The last sentence may go on in the next window: parse it again there,
+                # unless it is already too long to carry.
+                tail = window[sents[-1].start_char :]
+                if len(tail) <= self.window_chars:
+                    pending = tail
+                    sents = sents[:-1]
+            yield [sent.text for sent in sents]
 
     def find_focus_words_in_document(
-        self, focus_words: List[Dict], documents: List[Dict]
+        self,
+        focus_words: List[Dict],
+        documents: List[Dict],
+        document_sentences: Optional[List[List[str]]] = None,
+        matcher: Optional[FocusWordMatcher] = None,
     ) -> List[Dict]:
         """
         Finds occurrences of focus words within a list of documents.
@@ -32,56 +172,80 @@ class FindFocusWordInCiteData(SpacyBaseModel):
                                     keys representing the focus word data.
             documents (List[Dict]): A list of dictionaries, each containing "source_id" and "document" keys
                                    representing a document.
+            document_sentences (List[List[str]], optional): Pre-split sentences of each document, aligned
+                                   with `documents`. Documents without pre-split sentences (None, or
+                                   all of them when not given) are split with the sentence pipeline
+                                   and matched window by window, so only the sentences containing a
+                                   focus word are kept.
+            matcher (FocusWordMatcher, optional): A matcher compiled from `focus_words`. If not given,
+                                   one is compiled.
 
         Returns:
             List[Dict]: A list of dictionaries, each containing information about the focus word and its
                         occurrences in the documents.
         """
+        return self._find_focus_words_in_documents(
+            focus_words, documents, document_sentences, matcher
+        )[0]
+
+    def _find_focus_words_in_documents(
+        self,
+        focus_words: List[Dict],
+        documents: List[Dict],
+        document_sentences: Optional[List[Optional[List[str]]]] = None,
+        matcher: Optional[FocusWordMatcher] = None,
+    ) -> Tuple[List[Dict], int]:
+        """`find_focus_words_in_document`, also returning the number of document sentences."""
         results = []
-        for document_data in documents:
+        sentence_count = 0
+        if matcher is None:
+            matcher = FocusWordMatcher([item["words"] for item in focus_words])
+
+        for index, document_data in enumerate(documents):
             source_id = document_data["source_id"]
             document = document_data["document"]
 
-            doc = self.nlp(document)
-            sentences = [sent.text for sent in doc.sents]
+            sentences = None
+            if document_sentences is not None:
+                sentences = document_sentences[index]
+            if sentences is not None:
+                windows = [sentences]
+            else:
+                windows = self.iter_sentence_windows(document)
+
+            occurrences = defaultdict(list)
+            for sentences in windows:
+                sentence_count += len(sentences)
+                for word, hits in matcher.find(sentences).items():
+                    occurrences[word].extend(
+                        {
+                            "sentence": sentences[sentence_index],
+                            "word_range": {"starting": start, "ending": end},
+                            "source_id": source_id,
+                        }
+                        for sentence_index, start, end in hits
+                    )
 
             for focus_word_data in focus_words:
                 word = focus_word_data["words"]
-                label = focus_word_data["label"]
-                word_type = focus_word_data["type"]
-
-                word_occurrences = []
-
-                for sentence in sentences:
-                    start = 0
-                    while True:
-                        start = sentence.find(word, start)
-                        if start == -1:
-                            break
-                        end = start + len(word)
-                        word_occurrences.append(
-                            {
-                                "sentence": sentence,
-                                "word_range": {"starting": start, "ending": end},
-                                "source_id": source_id,
-                            }
-                        )
-                        start += len(word)
-
-                if word_occurrences:
+                if word in occurrences:
                     results.append(
                         {
-                            "type": word_type,
-                            "label": label,
+                            "type": focus_word_data["type"],
+                            "label": focus_word_data["label"],
                             "word": word,
-                            "sentences": word_occurrences,
+                            "sentences": list(occurrences[word]),
                         }
                     )
 
-        return results
+        return results, sentence_count
 
     def find_focus_words_in_answer(
-        self, focus_words: List[Dict], document: str
+        self,
+        focus_words: List[Dict],
+        document: str,
+        sentences: Optional[List[str]] = None,
+        matcher: Optional[FocusWordMatcher] = None,
     ) -> List[Dict]:
         """
         Finds occurrences of focus words within a single answer string.
@@ -90,44 +254,43 @@ class FindFocusWordInCiteData(SpacyBaseModel):
             focus_words (List[Dict]): A list of dictionaries, each containing "words", "label", and "type"
                                         keys representing the focus word data.
             document (str): The answer string to search.
+            sentences (List[str], optional): Pre-split sentences of the answer. If not given, the answer
+                                        is parsed with SpaCy.
+            matcher (FocusWordMatcher, optional): A matcher compiled from `focus_words`. If not given,
+                                        one is compiled.
 
         Returns:
             List[Dict]: A list of dictionaries, each containing information about the focus word and its
                         occurrences in the answer.
         """
         results = []
-        doc = self.nlp(document)
-        sentences = [sent.text for sent in doc.sents]
+        if sentences is None:
+            doc = self.nlp(document)
+            sentences = [sent.text for sent in doc.sents]
+
+        if matcher is None:
+            matcher = FocusWordMatcher([item["words"] for item in focus_words])
+
+        occurrences = {
+            word: [
+                {
+                    "sentence": sentences[sentence_index],
+                    "word_range": {"starting": start, "ending": end},
+                }
+                for sentence_index, start, end in hits
+            ]
+            for word, hits in matcher.find(sentences).items()
+        }
 
         for focus_word_data in focus_words:
             word = focus_word_data["words"]
-            label = focus_word_data["label"]
-            word_type = focus_word_data["type"]
-
-            word_occurrences = []
-
-            for sentence in sentences:
-                start = 0
-                while True:
-                    start = sentence.find(word, start)
-                    if start == -1:
-                        break
-                    end = start + len(word)
-                    word_occurrences.append(
-                        {
-                            "sentence": sentence,
-                            "word_range": {"starting": start, "ending": end},
-                        }
-                    )
-                    start += len(word)
-
-            if word_occurrences:
+            if word in occurrences:
                 results.append(
                     {
-                        "type": word_type,
-                        "label": label,
+                        "type": focus_word_data["type"],
+                        "label": focus_word_data["label"],
                         "word": word,
-                        "sentences": word_occurrences,
+                        "sentences": list(occurrences[word]),
                     }
                 )
 
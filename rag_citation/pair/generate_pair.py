@@ -1,8 +1,14 @@
+import logging
+
+from rag_citation import metrics
 from rag_citation.pair.focus_word_in_cite_data import FindFocusWordInCiteData
-from rag_citation.pair.schema import FocusWordDataType, CiteItem
+from rag_citation.pair.idf import IdfTable, smooth_idf
+from rag_citation.pair.matcher import FocusWordMatcher
+from rag_citation.pair.schema import FocusWordDataType, CiteItem, Pair
 from collections import defaultdict
-import uuid
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
 
 
 class GeneratePair(FindFocusWordInCiteData):
@@ -17,10 +23,152 @@ class GeneratePair(FindFocusWordInCiteData):
         type (str, optional): Size of the SpaCy model to load.
                              Choose from "sm" (small), "md" (medium), or "lg" (large).
                              Defaults to "sm".
+        sentence_splitter (str, optional): Pipeline used to split documents into sentences:
+                             "full", "parser" or "sentencizer". Defaults to "parser".
+        n_process (int, optional): Number of processes used to split documents. Defaults to 1.
+        idf_filter (str or IdfTable, optional): Drops focus nouns with an IDF below `min_idf`
+                             before pairing. "context" computes the IDF over the sentences of
+                             the context documents; an IdfTable holds precomputed corpus
+                             frequencies. Entities are never dropped. Defaults to None (no filter).
+        min_idf (float, optional): Smallest IDF of a kept noun with `idf_filter`. Defaults to 2.0,
+                             i.e. nouns found in more than about a third of the sentences are dropped.
+        max_pairs_per_word (int, optional): Maximum pairs each focus noun contributes to, over all
+                             answer sentences. The pairs sharing the most focus words are kept.
+                             Entities are never capped. Defaults to None (no cap).
+        window_chars (int, optional): Documents longer than this are parsed in windows of about
+                             this many characters. Defaults to 100,000.
     """
 
-    def __init__(self, type="sm") -> None:
-        super().__init__(type)
+    def __init__(
+        self,
+        type="sm",
+        sentence_splitter="parser",
+        n_process=1,
+        idf_filter: Optional[Union[str, IdfTable]] = None,
+        min_idf: float = 2.0,
+        max_pairs_per_word: Optional[int] = None,
+        window_chars: int = 100_000,
+    ) -> None:
+        super().__init__(
+            type,
+            sentence_splitter=sentence_splitter,
+            n_process=n_process,
+            window_chars=window_chars,
+        )
+        if idf_filter is not None and not (
+            idf_filter == "context" or isinstance(idf_filter, IdfTable)
+        ):
+            raise ValueError(
+                f"Unknown idf_filter '{idf_filter}'. Choose 'context' or an IdfTable."
+            )
+        if max_pairs_per_word is not None and max_pairs_per_word < 1:
+            raise ValueError(
+                f"max_pairs_per_word must be at least 1, got {max_pairs_per_word}."
+            )
+        self.idf_filter = idf_filter
+        self.min_idf = min_idf
+        self.max_pairs_per_word = max_pairs_per_word
+
+    def split_documents(
+        self,
+        cite_item: CiteItem,
+        document_sentences: Optional[List[List[str]]] = None,
+        keep_long_documents: bool = False,
+    ) -> List[List[str]]:
+        """
+        Returns the sentences of each context document.
+
+        Args:
+            cite_item (CiteItem): Citation data containing the relevant documents.
+            document_sentences (List[List[str]], optional): Pre-split sentences of each context document.
+                                   Documents without pre-split sentences (None) are parsed,
+                                   each distinct document text once.
+            keep_long_documents (bool, optional): Leave documents longer than `window_chars` without
+                                   pre-split sentences as None, to be split while they are
+                                   matched. Defaults to False.
+
+        Returns:
+            List[List[str]]: The sentences of each context document, in context order.
+        """
+        documents = [item["document"] for item in cite_item.context]
+        if document_sentences is None:
+            document_sentences = [None] * len(documents)
+
+        unique_documents = list(
+            dict.fromkeys(
+                document
+                for document, sentences in zip(documents, document_sentences)
+                if sentences is None
+                and not (keep_long_documents and len(document) > self.window_chars)
+            )
+        )
+        if not unique_documents:
+            return document_sentences
+
+        sentences_by_document = dict(
+            zip(unique_documents, self.split_sentences(unique_documents))
+        )
+        return [
+            sentences_by_document.get(document) if sentences is None else sentences
+            for document, sentences in zip(documents, document_sentences)
+        ]
+
+    def pair_candidates(
+        self,
+        focus_words: FocusWordDataType,
+        answer_sentences: List[str],
+        documents: List[Tuple[str, str]],
+        candidates: List[List[int]],
+    ) -> List[Pair]:
+        """
+        Pairs each answer sentence with those of its candidate document sentences
+        that share a focus word with it.
+
+        Unlike `pair`, which pairs every answer sentence with every document
+        sentence sharing a focus word, only the given candidates are searched,
+        e.g. the document sentences most similar to each answer sentence.
+
+        Args:
+            focus_words (FocusWordDataType): Extracted focus words from the answer.
+            answer_sentences (List[str]): The sentences of the answer.
+            documents (List[Tuple[str, str]]): The (source_id, sentence) of every
+                                               document sentence.
+            candidates (List[List[int]]): For each answer sentence, the indices in
+                                          `documents` of its candidate sentences.
+
+        Returns:
+            List[Pair]: The pairs, ordered by answer sentence and then by document
+                        sentence, with ids numbered from 0 in list order.
+        """
+        matcher = FocusWordMatcher([item["words"] for item in focus_words.combine])
+
+        answer_words = [[] for _ in answer_sentences]
+        for word, hits in matcher.find(answer_sentences).items():
+            for index in dict.fromkeys(hit[0] for hit in hits):
+                answer_words[index].append(word)
+
+        rows = sorted({row for item_rows in candidates for row in item_rows})
+        document_words = defaultdict(set)
+        for word, hits in matcher.find([documents[row][1] for row in rows]).items():
+            for index, _, _ in hits:
+                document_words[rows[index]].add(word)
+
+        word_groups = {}
+        for answer_sentence, words, item_rows in zip(
+            answer_sentences, answer_words, candidates
+        ):
+            for row in sorted(item_rows):
+                common_words = [word for word in words if word in document_words[row]]
+                if common_words:
+                    source_id, document_sentence = documents[row]
+                    word_groups.setdefault(
+                        (answer_sentence, document_sentence, source_id), common_words
+                    )
+
+        return [
+            Pair(index, words, key[0], key[1], key[2])
+            for index, (key, words) in enumerate(word_groups.items())
+        ]
 
     def _find_common_words(
         self, answer: List[Dict], document: List[Dict]
@@ -56,22 +204,87 @@ class GeneratePair(FindFocusWordInCiteData):
 
         return common_words
 
-    def _generate_uniqueid(self, length=4):
+    @staticmethod
+    def _pair_key(row: Dict) -> tuple:
+        return (row["answer_sentences"], row["document_sentences"], row["source_id"])
+
+    def _word_idf(self, document: List[Dict], sentence_count: int) -> Dict[str, float]:
         """
-        Generates a unique ID of a specified length.
+        The IDF of each focus word found in the documents.
 
-        Args:
-            length (int, optional): The desired length of the unique ID. Defaults to 4.
+        With idf_filter="context", a word's document frequency is the number of
+        distinct context sentences containing it.
+        """
+        if isinstance(self.idf_filter, IdfTable):
+            return {
+                entry["word"]: self.idf_filter.idf(entry["word"]) for entry in document
+            }
 
-        Returns:
-            str: A unique ID string.
+        sentences = defaultdict(set)
+        for entry in document:
+            for occurrence in entry["sentences"]:
+                sentences[entry["word"]].add(
+                    (occurrence["source_id"], occurrence["sentence"])
+                )
+        return {
+            word: smooth_idf(len(word_sentences), sentence_count)
+            for word, word_sentences in sentences.items()
+        }
+
+    def _cap_pairs_per_word(self, data: List[Dict]) -> List[Dict]:
+        """
+        Keeps, for each focus noun, the `max_pairs_per_word` pairs sharing the most
+        focus words. Ties keep the answer and context order. Entities are not capped.
         """
-        uuid_int = uuid.uuid4().int
-        uuid_str = str(uuid_int)
-        unique_id = uuid_str[:length]
-        return unique_id
+        shared_words = defaultdict(set)
+        candidates = defaultdict(dict)
+        for item in data:
+            key = self._pair_key(item)
+            shared_words[key].add(item["word"])
+            if item["type"] == "WORD":
+                candidates[item["word"]].setdefault(key, None)
+
+        kept = set()
+        for word, keys in candidates.items():
+            ranked = sorted(keys, key=lambda key: -len(shared_words[key]))
+            kept.update((word, key) for key in ranked[: self.max_pairs_per_word])
 
-    def _combine_words(self, data: List[Dict]) -> List[Dict]:
+        return [
+            item
+            for item in data
+            if item["type"] != "WORD" or (item["word"], self._pair_key(item)) in kept
+        ]
+
+    def _filter_common_words(
+        self,
+        data: List[Dict],
+        document: List[Dict],
+        sentence_count: int,
+    ) -> List[Dict]:
+        """
+        Applies the IDF filter and the per-word cap to the common words. The pairs
+        left out are counted as the "skipped_pairs" metric, when metrics are
+        collected, and always logged at debug level.
+        """
+        pair_keys = {self._pair_key(item) for item in data}
+
+        if self.idf_filter is not None:
+            word_idf = self._word_idf(document, sentence_count)
+            data = [
+                item
+                for item in data
+                if item["type"] != "WORD" or word_idf[item["word"]] >= self.min_idf
+            ]
+        if self.max_pairs_per_word is not None:
+            data = self._cap_pairs_per_word(data)
+
+        skipped = len(pair_keys) - len({self._pair_key(item) for item in data})
+        if skipped:
+            metrics.count("skipped_pairs", skipped)
+            logger.debug(f"Skipped {skipped} of {len(pair_keys)} pairs.")
+        return data
+
+    def _combine_words(self, data: List[Dict]) -> List[Pair]:
         """
         Combines words that share the same answer sentence, document sentence, and source ID.
 
@@ -79,7 +292,8 @@ class GeneratePair(FindFocusWordInCiteData):
             data (List[Dict]): A list of dictionaries containing common word data.
 
         Returns:
-            List[Dict]: A list of dictionaries where words sharing the same context are grouped together.
+            List[Pair]: One pair per group of words sharing the same context, with
+                        ids numbered from 0 in list order.
         """
 
         word_groups = defaultdict(list)
@@ -93,38 +307,53 @@ class GeneratePair(FindFocusWordInCiteData):
             word_groups[key].append(item["word"])
 
         combined_words = [
-            {
-                "_id": self._generate_uniqueid(),
-                "word": words,
-                "answer_sentences": key[0],
-                "document_sentences": key[1],
-                "source_id": key[2],
-            }
-            for key, words in word_groups.items()
+            Pair(index, words, key[0], key[1], key[2])
+            for index, (key, words) in enumerate(word_groups.items())
         ]
 
         return combined_words
 
-    def pair(self, focus_words: FocusWordDataType, cite_item: CiteItem) -> List[Dict]:
+    def pair(
+        self,
+        focus_words: FocusWordDataType,
+        cite_item: CiteItem,
+        answer_sentences: Optional[List[str]] = None,
+        document_sentences: Optional[List[List[str]]] = None,
+    ) -> List[Pair]:
         """
         Pairs focus words from the answer with occurrences in the cited documents.
 
         Args:
             focus_words (FocusWordDataType): Extracted focus words from the answer.
             cite_item (CiteItem): Citation data containing the answer and relevant documents.
+            answer_sentences (List[str], optional): Pre-split sentences of the answer.
+            document_sentences (List[List[str]], optional): Pre-split sentences of each context document.
+                                   Documents without pre-split sentences (None) are parsed,
+                                   each distinct document text once. Documents longer than
+                                   `window_chars` are parsed and matched window by window.
 
         Returns:
-            List[Dict]: A list of paired word data, including unique IDs, words, and associated sentences.
+            List[Pair]: The pairs, each with its integer id, words, and associated sentences.
         """
 
+        document_sentences = self.split_documents(
+            cite_item, document_sentences, keep_long_documents=True
+        )
+
+        matcher = FocusWordMatcher([item["words"] for item in focus_words.combine])
+
         focus_answer = self.find_focus_words_in_answer(
-            focus_words.combine, cite_item.answer
+            focus_words.combine, cite_item.answer, answer_sentences, matcher
         )
-        focus_context = self.find_focus_words_in_document(
-            focus_words.combine, cite_item.context
+        focus_context, sentence_count = self._find_focus_words_in_documents(
+            focus_words.combine, cite_item.context, document_sentences, matcher
         )
 
         common_words = self._find_common_words(focus_answer, focus_context)
+        if self.idf_filter is not None or self.max_pairs_per_word is not None:
+            common_words = self._filter_common_words(
+                common_words, focus_context, sentence_count
+            )
 
         combined_output = self._combine_words(common_words)
 
@@ -0,0 +1,73 @@
+import json
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable
+
+_WORD = re.compile(r"\w+")
+
+
+def smooth_idf(document_frequency: int, texts: int) -> float:
+    """
+    Smoothed inverse document frequency: ln((1 + texts) / (1 + df)) + 1.
+
+    A word found in every text scores 1, and the score grows as the word gets rarer.
+    """
+    return math.log((1 + texts) / (1 + document_frequency)) + 1
+
+
+class IdfTable:
+    """
+    Precomputed inverse document frequencies of the words of a corpus.
+
+    Used with `Inference(idf_filter=...)` to drop focus nouns that are common in the
+    corpus before pairing. Words are lowercased; words absent from the table score
+    as if they were in no text.
+
+    Args:
+        document_frequencies (Dict[str, int]): Number of texts containing each word.
+        texts (int): Number of texts of the corpus.
+
+    Example:
+        >>> table = IdfTable.from_texts(document["document"] for document in corpus)
+        >>> table.save("idf.json")
+        >>> inference = Inference(idf_filter=IdfTable.load("idf.json"), min_idf=2.0)
+    """
+
+    def __init__(self, document_frequencies: Dict[str, int], texts: int) -> None:
+        self.document_frequencies = {
+            word.lower(): count for word, count in document_frequencies.items()
+        }
+        self.texts = texts
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str]) -> "IdfTable":
+        """Counts the texts containing each word, after lowercasing."""
+        document_frequencies = Counter()
+        count = 0
+        for text in texts:
+            document_frequencies.update(set(_WORD.findall(text.lower())))
+            count += 1
+        return cls(dict(document_frequencies), count)
+
+    def idf(self, word: str) -> float:
+        """The smoothed IDF of a word."""
+        return smooth_idf(self.document_frequencies.get(word.lower(), 0), self.texts)
+
+    def save(self, path: str) -> None:
+        """Writes the table to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "texts": self.texts,
+                    "document_frequencies": self.document_frequencies,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "IdfTable":
+        """Reads a table written by `save`."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["document_frequencies"], data["texts"])
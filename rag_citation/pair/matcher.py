@@ -0,0 +1,71 @@
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+SENTENCE_SEPARATOR = "\x00"
+
+
+class FocusWordMatcher:
+    """
+    Finds every focus word in a list of sentences with one scan per word.
+
+    The matcher is compiled once per answer from its focus words and can then be
+    applied to the answer and to each document. The sentences of a text are
+    joined into one string so that each word is located with a single `str.find`
+    scan over the whole text, and each hit is mapped back to its sentence with a
+    binary search over the sentence offsets. This replaces one `find` loop per
+    word and per sentence.
+
+    Matching is still one scan per word, O(words x text length), not a single
+    multi-pattern pass. That is deliberate: a pure-Python Aho-Corasick automaton
+    steps through the text one character at a time in the interpreter, and a
+    regex alternation tries every word at every position. Both measured slower
+    than C-level `str.find` scans on long documents with a few dozen focus words.
+
+    For each word, occurrences are reported left to right without overlap, the
+    same as repeatedly calling `str.find` from the end of the previous match.
+
+    Args:
+        words (List[str]): The focus words to match. Duplicates, empty strings and
+                           words containing a NUL character are ignored.
+    """
+
+    def __init__(self, words: List[str]) -> None:
+        self.words = list(
+            dict.fromkeys(
+                word for word in words if word and SENTENCE_SEPARATOR not in word
+            )
+        )
+
+    def find(self, sentences: List[str]) -> Dict[str, List[Tuple[int, int, int]]]:
+        """
+        Finds the occurrences of every focus word in a list of sentences.
+
+        Args:
+            sentences (List[str]): The sentences of an answer or a document.
+
+        Returns:
+            Dict[str, List[Tuple[int, int, int]]]: A mapping from each word found to
+                its (sentence index, starting, ending) occurrences, in text order.
+        """
+        matches = {}
+        if not self.words or not sentences:
+            return matches
+
+        offsets = []
+        offset = 0
+        for sentence in sentences:
+            offsets.append(offset)
+            offset += len(sentence) + len(SENTENCE_SEPARATOR)
+        text = SENTENCE_SEPARATOR.join(sentences)
+
+        for word in self.words:
+            start = text.find(word)
+            while start != -1:
+                index = bisect_right(offsets, start) - 1
+                starting = start - offsets[index]
+                matches.setdefault(word, []).append(
+                    (index, starting, starting + len(word))
+                )
+                start = text.find(word, start + len(word))
+
+        return matches
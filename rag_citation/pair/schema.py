@@ -26,3 +26,25 @@ class CiteItem:
     def __init__(self):
         self.answer = None
         self.context = None
+
+
+class Pair:
+    """
+    Focus words shared by one answer sentence and one document sentence.
+
+    Attributes:
+        id (int): Position of the pair in the list returned by GeneratePair.pair().
+        word (List[str]): The shared focus words, one entry per occurrence.
+        answer_sentences (str): The answer sentence.
+        document_sentences (str): The document sentence.
+        source_id (str): The source_id of the document.
+    """
+
+    __slots__ = ("id", "word", "answer_sentences", "document_sentences", "source_id")
+
+    def __init__(self, id, word, answer_sentences, document_sentences, source_id):
+        self.id = id
+        self.word = word
+        self.answer_sentences = answer_sentences
+        self.document_sentences = document_sentences
+        self.source_id = source_id
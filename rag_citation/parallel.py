@@ -0,0 +1,121 @@
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from typing import Iterable, Iterator, Optional
+
+# The Inference instance of a pool worker, set once by `_init_worker`.
+_worker_inference = None
+
+
+def _init_worker(inference, threads_per_worker: Optional[int]) -> None:
+    """
+    Pool initializer: keeps the Inference instance and loads its models.
+
+    With the "fork" start method the instance, and every model the parent had
+    already loaded, are inherited copy-on-write instead of being pickled.
+    """
+    global _worker_inference
+
+    if threads_per_worker is not None and inference.method != "llm":
+        import torch
+
+        torch.set_num_threads(threads_per_worker)
+
+    _worker_inference = inference.warmup()
+
+
+def _cite_chunk(args: tuple) -> list:
+    cite_items, batch_size = args
+    return _worker_inference.batch(cite_items, batch_size=batch_size)
+
+
+def _chunks(cite_items: Iterable, chunksize: int) -> Iterator[list]:
+    iterator = iter(cite_items)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def imap_citations(
+    inference,
+    cite_items: Iterable,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    batch_size: int = 64,
+    start_method: Optional[str] = None,
+    threads_per_worker: Optional[int] = 1,
+) -> Iterator:
+    """
+    Cites many items in a pool of worker processes, with results in input order.
+
+    Each worker loads the models of `inference` once, in the pool initializer,
+    and then cites chunks of `chunksize` items with `Inference.batch`.
+
+    Args:
+        inference (Inference): The configured instance to run in each worker.
+        cite_items (Iterable[CiteItem]): The items to cite. Read as the results
+                                         are consumed, at most `2 * workers`
+                                         chunks ahead, so it can be unbounded.
+        workers (int, optional): Number of worker processes. Defaults to the
+                                 number of CPUs. With 1, items are cited in
+                                 the current process.
+        chunksize (int, optional): Items sent to a worker at a time. Defaults to 16.
+        batch_size (int, optional): `batch_size` of `Inference.batch` in the
+                                    workers. Defaults to 64.
+        start_method (str, optional): multiprocessing start method ("fork",
+                                      "spawn" or "forkserver"). Defaults to the
+                                      platform default. Use "spawn" with CUDA.
+        threads_per_worker (int, optional): Torch threads per worker, so workers
+                                            do not oversubscribe the cores. None
+                                            keeps the torch default. Defaults to 1.
+
+    Returns:
+        Iterator[RagCitationOutput]: One output per item, in input order.
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, got {chunksize}.")
+
+    workers = workers or os.cpu_count() or 1
+    return _imap(
+        inference,
+        cite_items,
+        workers,
+        chunksize,
+        batch_size,
+        start_method,
+        threads_per_worker,
+    )
+
+
+def _imap(
+    inference,
+    cite_items: Iterable,
+    workers: int,
+    chunksize: int,
+    batch_size: int,
+    start_method: Optional[str],
+    threads_per_worker: Optional[int],
+) -> Iterator:
+    if workers == 1:
+        for chunk in _chunks(cite_items, chunksize):
+            yield from inference.batch(chunk, batch_size=batch_size)
+        return
+
+    context = multiprocessing.get_context(start_method)
+    with context.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(inference, threads_per_worker),
+    ) as pool:
+        # Pool.imap would read the whole input ahead, so chunks are submitted one
+        # at a time, with at most `2 * workers` in flight.
+        pending = deque()
+        for chunk in _chunks(cite_items, chunksize):
+            pending.append(pool.apply_async(_cite_chunk, ((chunk, batch_size),)))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from rag_citation.metrics import CitationMetrics
 
 
 @dataclass
@@ -11,8 +13,11 @@ class RagCitationOutput:
         citation: A list of dictionaries, each representing a citation.
         missing_word: A list of dictionaries, each representing a missing word.
         hallucination: A boolean indicating whether the model hallucinated any information.
+        metrics: Per-stage timings and counters of the call, when the Inference
+                 instance collects metrics. None otherwise.
     """
 
     citation: List[Dict]
     missing_word: List[Dict]
     hallucination: bool
+    metrics: Optional[CitationMetrics] = None
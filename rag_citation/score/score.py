@@ -1,11 +1,6 @@
-import torch.nn.functional as F
-from sentence_transformers import SentenceTransformer
-import torch
-
-
 class Score:
     """
-    Calculates the cosine similarity score between two text embeddings.
+    Calculates cosine similarity scores between text embeddings.
     """
 
     def cosine_score(self, embeddings1, embeddings2):
@@ -19,5 +14,25 @@ class Score:
         Returns:
             float: The cosine similarity score between the two embeddings.
         """
+        import torch.nn.functional as F
+
         scores = F.cosine_similarity(embeddings1, embeddings2, dim=-1)
         return scores.tolist()[0]
+
+    def cosine_matrix(self, embeddings1, embeddings2):
+        """
+        Calculates the cosine similarity between every row of two embedding matrices.
+
+        Args:
+            embeddings1 (torch.Tensor): Answer sentence embeddings of shape (n, dim).
+            embeddings2 (torch.Tensor): Document sentence embeddings of shape (m, dim).
+
+        Returns:
+            torch.Tensor: A (n, m) tensor where entry [i, j] is the cosine similarity
+                          between row i of embeddings1 and row j of embeddings2.
+        """
+        import torch.nn.functional as F
+
+        embeddings1 = F.normalize(embeddings1, p=2, dim=-1)
+        embeddings2 = F.normalize(embeddings2, p=2, dim=-1)
+        return embeddings1 @ embeddings2.T
@@ -0,0 +1,4 @@
+from rag_citation.batcher import MicroBatcher, MicroBatcherStats
+from rag_citation.server.app import CitationServer, serve
+
+__all__ = ["CitationServer", "MicroBatcher", "MicroBatcherStats", "serve"]
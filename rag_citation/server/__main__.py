@@ -0,0 +1,89 @@
+"""
+Serve rag_citation over HTTP.
+
+Serves the non-LLM method, plus the LLM and hybrid methods when --model is given.
+
+Usage:
+    python -m rag_citation.server --port 8000 --spacy-model sm --embedding-model sm
+    python -m rag_citation.server --model gpt-4o --max-batch-size 64 --max-wait-ms 10
+"""
+
+import argparse
+import logging
+
+from rag_citation.inference import Inference
+from rag_citation.server.app import serve
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m rag_citation.server",
+        description="Serve citations over HTTP with micro-batching.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=("non-llm", "llm", "hybrid"),
+        help="Methods to serve. Defaults to non-llm, plus llm and hybrid when "
+        "--model is given.",
+    )
+    parser.add_argument("--spacy-model", default="sm", choices=["sm", "md", "lg"])
+    parser.add_argument("--embedding-model", default="sm")
+    parser.add_argument("--therhold-value", type=float, default=0.88)
+    parser.add_argument(
+        "--sentence-splitter",
+        default="parser",
+        choices=["full", "parser", "sentencizer"],
+    )
+    parser.add_argument("--context-store", help="ContextStore directory.")
+    parser.add_argument("--device", help='Embedding device, e.g. "cpu" or "cuda".')
+    parser.add_argument("--model", help="LiteLLM model for the llm and hybrid methods.")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-queue", type=int, default=256)
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--no-warmup", action="store_true", help="Load models on the first request."
+    )
+    args = parser.parse_args(argv)
+
+    methods = args.methods or (
+        ["non-llm", "llm", "hybrid"] if args.model else ["non-llm"]
+    )
+    if args.model is None and any(method != "non-llm" for method in methods):
+        parser.error("--model is required for the llm and hybrid methods.")
+
+    non_llm_kwargs = {
+        "spacy_model": args.spacy_model,
+        "embedding_model": args.embedding_model,
+        "therhold_value": args.therhold_value,
+        "sentence_splitter": args.sentence_splitter,
+        "context_store": args.context_store,
+        "device": args.device,
+    }
+    inferences = []
+    for method in methods:
+        kwargs = {} if method == "llm" else dict(non_llm_kwargs)
+        if method != "non-llm":
+            kwargs["model"] = args.model
+        inferences.append(Inference(method=method, **kwargs))
+
+    logging.basicConfig(level=logging.INFO)
+    serve(
+        inferences,
+        host=args.host,
+        port=args.port,
+        warmup=not args.no_warmup,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_queue=args.max_queue,
+        max_concurrency=args.max_concurrency,
+        request_timeout=args.request_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+from rag_citation.batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+
+class CitationServer(ThreadingHTTPServer):
+    """
+    HTTP server exposing one or more Inference instances as JSON endpoints.
+
+    Endpoints:
+        - POST /cite/<method>: cites {"answer": ..., "context": [...]} with the
+          instance of that method ("non-llm", "llm" or "hybrid"). The LLM and
+          hybrid methods also accept "messages". Responds with the
+          RagCitationOutput as JSON.
+        - GET /health: {"status": "ok", "methods": [...]}.
+        - GET /metrics: request, rejection and batching counters.
+
+    Non-LLM requests are merged by a MicroBatcher: requests arriving within
+    `max_wait_ms` of each other are cited with one `Inference.batch` call, so
+    they share embedding batches. If that call fails, the requests are cited one
+    by one, so only the failing ones get an error. LLM and hybrid requests are cited on their
+    request thread, at most `max_concurrency` at a time per method.
+
+    When the batch queue is full, or `max_concurrency` requests are in flight,
+    requests are rejected right away with 503 and a Retry-After header.
+
+    Args:
+        address (Tuple[str, int]): The (host, port) to listen on.
+        inferences (List[Inference]): The instances to serve, at most one per method.
+        max_batch_size (int, optional): Maximum non-LLM requests per batch. Defaults to 32.
+        max_wait_ms (float, optional): How long a batch waits for more requests.
+                                       Defaults to 5.
+        max_queue (int, optional): Maximum non-LLM requests waiting to be batched.
+                                   Defaults to 256.
+        max_concurrency (int, optional): Maximum LLM or hybrid requests in flight
+                                         per method. Defaults to 32.
+        request_timeout (float, optional): Seconds before a request waiting for its
+                                           batch fails with 504. Defaults to 60.
+        max_body_bytes (int, optional): Largest accepted request body. Defaults to 10 MB.
+
+    Example:
+        >>> server = CitationServer(("127.0.0.1", 8000), [Inference()])
+        >>> server.serve_forever()
+    """
+
+    daemon_threads = True
+    # The socketserver default of 5 pending connections resets clients under load.
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        inferences: List,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_queue: int = 256,
+        max_concurrency: int = 32,
+        request_timeout: float = 60.0,
+        max_body_bytes: int = 10 * 1024 * 1024,
+    ) -> None:
+        self.inferences = {}
+        for inference in inferences:
+            if inference.method in self.inferences:
+                raise ValueError(f"More than one Inference for '{inference.method}'.")
+            self.inferences[inference.method] = inference
+        if not self.inferences:
+            raise ValueError("At least one Inference is required.")
+
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+
+        self.batcher = None
+        if "non-llm" in self.inferences:
+            self.batcher = MicroBatcher(
+                self._cite_batch,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+                max_queue=max_queue,
+            )
+        self._slots = {
+            method: threading.BoundedSemaphore(max_concurrency)
+            for method in self.inferences
+            if method != "non-llm"
+        }
+
+        self._started = time.monotonic()
+        self._counters = Counter()
+        self._latency = Counter()
+        self._lock = threading.Lock()
+
+        super().__init__(address, _CitationHandler)
+
+    def _cite_batch(self, cite_items: list) -> list:
+        inference = self.inferences["non-llm"]
+        try:
+            return inference.batch(cite_items, batch_size=len(cite_items))
+        except Exception:
+            if len(cite_items) == 1:
+                raise
+            logger.warning(
+                f"Batch of {len(cite_items)} requests failed, citing them one by one."
+            )
+
+        # Only the failing requests get the error, not those batched with them.
+        outputs = []
+        for cite_item in cite_items:
+            try:
+                outputs.append(inference(cite_item))
+            except Exception as e:
+                outputs.append(e)
+        return outputs
+
+    def cite(self, method: str, payload: dict) -> Tuple[int, dict]:
+        """
+        Cites one request payload.
+
+        Returns:
+            Tuple[int, dict]: The HTTP status and the JSON response.
+        """
+        from rag_citation.cite_item import CiteItem
+
+        inference = self.inferences[method]
+        try:
+            cite_item = CiteItem(
+                answer=payload.get("answer"), context=payload.get("context")
+            )
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        if method == "non-llm":
+            try:
+                future = self.batcher.submit(cite_item)
+            except queue.Full:
+                self._count("rejected")
+                return 503, {"error": "Too many requests are queued."}
+            try:
+                output = future.result(timeout=self.request_timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                self._count("timeouts")
+                return 504, {"error": "The request timed out."}
+        else:
+            slots = self._slots[method]
+            if not slots.acquire(blocking=False):
+                self._count("rejected")
+                return 503, {"error": "Too many requests are in flight."}
+            try:
+                output = inference(cite_item, payload.get("messages"))
+            finally:
+                slots.release()
+
+        return 200, asdict(output)
+
+    def health(self) -> dict:
+        """The server status and the methods it serves."""
+        return {"status": "ok", "methods": list(self.inferences)}
+
+    def metrics(self) -> dict:
+        """Request counters, latency per method and batcher counters."""
+        with self._lock:
+            counters = dict(self._counters)
+            latency = {
+                method: {
+                    "count": self._latency[method, "count"],
+                    "mean_ms": (
+                        1000
+                        * self._latency[method, "total"]
+                        / self._latency[method, "count"]
+                    ),
+                }
+                for method in self.inferences
+                if self._latency[method, "count"]
+            }
+
+        metrics = {
+            "uptime_s": time.monotonic() - self._started,
+            "requests": {
+                method: counters.get(("requests", method), 0)
+                for method in self.inferences
+            },
+            "rejected": counters.get("rejected", 0),
+            "timeouts": counters.get("timeouts", 0),
+            "errors": counters.get("errors", 0),
+            "latency": latency,
+        }
+        if self.batcher is not None:
+            stats = asdict(self.batcher.stats)
+            stats["mean_batch_size"] = (
+                stats["items"] / stats["batches"] if stats["batches"] else 0.0
+            )
+            metrics["batcher"] = stats
+        return metrics
+
+    def _count(self, key) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _observe(self, method: str, seconds: float) -> None:
+        with self._lock:
+            self._latency[method, "count"] += 1
+            self._latency[method, "total"] += seconds
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.batcher is not None:
+            self.batcher.close()
+
+
+class _CitationHandler(BaseHTTPRequestHandler):
+    server_version = "rag-citation"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, self.server.health())
+        elif self.path == "/metrics":
+            self._send(200, self.server.metrics())
+        else:
+            self._send(404, {"error": f"Unknown path '{self.path}'."})
+
+    def do_POST(self) -> None:
+        method = self.path[len("/cite/") :] if self.path.startswith("/cite/") else None
+        if method not in self.server.inferences:
+            self._discard_body()
+            self._send(404, {"error": f"Unknown path '{self.path}'."})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.server.max_body_bytes:
+            self.close_connection = True
+            self._send(413, {"error": "The request body is too large."})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length))
+            if not isinstance(payload, dict):
+                raise ValueError("The request body must be a JSON object.")
+        except ValueError as e:
+            self._send(400, {"error": f"Invalid JSON: {e}"})
+            return
+
+        self.server._count(("requests", method))
+        start = time.perf_counter()
+        try:
+            status, body = self.server.cite(method, payload)
+        except Exception as e:
+            logger.exception(f"Citation failed for '{method}'.")
+            self.server._count("errors")
+            status, body = 500, {"error": str(e)}
+        if status == 200:
+            self.server._observe(method, time.perf_counter() - start)
+        self._send(status, body)
+
+    def _discard_body(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= self.server.max_body_bytes:
+            self.rfile.read(length)
+        else:
+            self.close_connection = True
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def serve(
+    inferences: List,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    warmup: bool = True,
+    **options,
+) -> None:
+    """
+    Serves Inference instances over HTTP until interrupted.
+
+    Args:
+        inferences (List[Inference]): The instances to serve, at most one per method.
+        host (str, optional): Interface to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on. Defaults to 8000.
+        warmup (bool, optional): Load the models before accepting requests.
+                                 Defaults to True.
+        **options: The options of CitationServer.
+    """
+    if warmup:
+        for inference in inferences:
+            inference.warmup()
+
+    server = CitationServer((host, port), inferences, **options)
+    logger.info(f"Serving {', '.join(server.inferences)} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
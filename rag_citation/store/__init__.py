@@ -0,0 +1,3 @@
+from rag_citation.store.context_store import ContextStore
+
+__all__ = ["ContextStore"]
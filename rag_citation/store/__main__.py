@@ -0,0 +1,56 @@
+"""
+Build a ContextStore from a JSON Lines corpus.
+
+Each input line is a JSON object with "source_id", "document" and optional "meta"
+keys, as in CiteItem context.
+
+Usage:
+    python -m rag_citation.store --input corpus.jsonl --output corpus_store \
+        --spacy-model sm --embedding-model sm
+"""
+
+import argparse
+import json
+
+from rag_citation.store.context_store import ContextStore
+
+
+def _read_jsonl(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m rag_citation.store",
+        description="Precompute sentences and sentence embeddings for a corpus.",
+    )
+    parser.add_argument("--input", required=True, help="JSON Lines corpus file.")
+    parser.add_argument("--output", required=True, help="Store directory to write.")
+    parser.add_argument("--spacy-model", default="sm", choices=["sm", "md", "lg"])
+    parser.add_argument("--embedding-model", default="sm", choices=["sm", "md", "lg"])
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument(
+        "--sentence-splitter",
+        default="parser",
+        choices=["full", "parser", "sentencizer"],
+    )
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    store = ContextStore.build(
+        args.output,
+        _read_jsonl(args.input),
+        spacy_model=args.spacy_model,
+        embedding_model=args.embedding_model,
+        batch_size=args.batch_size,
+        sentence_splitter=args.sentence_splitter,
+        n_process=args.n_process,
+    )
+    print(f"Stored {len(store)} documents in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
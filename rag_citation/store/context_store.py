@@ -0,0 +1,381 @@
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from rag_citation.cite_item import CiteItem
+
+MANIFEST_FILE = "manifest.json"
+INDEX_FILE = "index.sqlite"
+SENTENCES_FILE = "sentences.bin"
+SENTENCE_OFFSETS_FILE = "sentence_offsets.npy"
+DOCUMENTS_FILE = "documents.bin"
+EMBEDDINGS_FILE = "embeddings.npy"
+
+
+class ContextStore:
+    """
+    Memory-mapped store of pre-split sentences and sentence embeddings per source_id.
+
+    A store is a directory built once with `ContextStore.build()` (or
+    `python -m rag_citation.store`). It holds:
+        - manifest.json: the embedding model identity.
+        - index.sqlite: per source_id, its sentence range, document byte range,
+          content hash and meta.
+        - sentences.bin / sentence_offsets.npy: UTF-8 sentences and their byte offsets.
+        - documents.bin: the original document texts.
+        - embeddings.npy: a float32 (n_sentences, dim) matrix, one row per sentence.
+
+    The binary files are memory-mapped and the index is queried per source_id, so
+    opening a store does not grow with the corpus size and only the rows and texts
+    of the source_ids actually requested are read from disk.
+
+    Each entry keeps the SHA-256 of the cleaned document it was split from. Use
+    `matches()` to check that a document is the stored version before using its
+    sentences; Inference falls back to splitting documents that changed.
+
+    Args:
+        path (str): The directory of a store built with `ContextStore.build()`.
+
+    Example:
+        >>> store = ContextStore("corpus_store")
+        >>> inference = Inference(embedding_model="sm", context_store=store)
+        >>> cite_item = store.cite_item(answer, ["doc1", "doc2"])
+        >>> output = inference(cite_item)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        self.model_id = manifest["model_id"]
+        self.dim = manifest["dim"]
+
+        index_path = os.path.join(path, INDEX_FILE)
+        if not os.path.exists(index_path):
+            raise ValueError(
+                f"{path} has no {INDEX_FILE}. It was built by an older version of "
+                "rag_citation; rebuild it with `ContextStore.build()`."
+            )
+        # Shared by the threads of a server; sqlite3 calls are serialized by the lock.
+        self._index = sqlite3.connect(
+            f"file:{index_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._index_lock = threading.Lock()
+
+        self._sentence_offsets = np.load(
+            os.path.join(path, SENTENCE_OFFSETS_FILE), mmap_mode="r"
+        )
+        self._embeddings = np.load(os.path.join(path, EMBEDDINGS_FILE), mmap_mode="r")
+        self._sentences_blob = self._open_blob(os.path.join(path, SENTENCES_FILE))
+        self._documents_blob = self._open_blob(os.path.join(path, DOCUMENTS_FILE))
+
+    @staticmethod
+    def _open_blob(path: str):
+        if os.path.getsize(path) == 0:
+            return b""
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __getstate__(self) -> dict:
+        # The index connection and mmaps are reopened from the path, e.g. in spawned
+        # pool workers.
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["path"])
+
+    def _query(self, sql: str, parameters: tuple = ()) -> Optional[tuple]:
+        with self._index_lock:
+            return self._index.execute(sql, parameters).fetchone()
+
+    def _entry(self, source_id: str, columns: str) -> tuple:
+        row = self._query(
+            f"SELECT {columns} FROM documents WHERE source_id = ?", (source_id,)
+        )
+        if row is None:
+            raise KeyError(source_id)
+        return row
+
+    def __contains__(self, source_id) -> bool:
+        return (
+            self._query("SELECT 1 FROM documents WHERE source_id = ?", (source_id,))
+            is not None
+        )
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM documents")[0]
+
+    def matches(self, source_id: str, document: str) -> bool:
+        """
+        Whether the store holds `source_id` split from this exact document text.
+
+        Args:
+            source_id (str): The source_id of the document.
+            document (str): The document text, cleaned as in CiteItem.
+
+        Returns:
+            bool: False if the source_id is unknown or its text has changed since
+                  the store was built.
+        """
+        row = self._query(
+            "SELECT content_hash FROM documents WHERE source_id = ?", (source_id,)
+        )
+        return row is not None and row[0] == _content_hash(document)
+
+    def sentences(self, source_id: str) -> List[str]:
+        """Returns the sentences of a document, as split at ingestion time."""
+        start, end = self._entry(source_id, "sentence_start, sentence_end")
+        offsets = self._sentence_offsets[start : end + 1].tolist()
+        return [
+            self._sentences_blob[offsets[i] : offsets[i + 1]].decode("utf-8")
+            for i in range(end - start)
+        ]
+
+    def embeddings(self, source_id: str) -> np.ndarray:
+        """Returns the (n_sentences, dim) embedding rows of a document."""
+        start, end = self._entry(source_id, "sentence_start, sentence_end")
+        return np.array(self._embeddings[start:end])
+
+    def document(self, source_id: str) -> str:
+        """Returns the original text of a document."""
+        start, end = self._entry(source_id, "document_start, document_end")
+        return self._documents_blob[start:end].decode("utf-8")
+
+    def meta(self, source_id: str):
+        """Returns the meta stored with a document."""
+        return json.loads(self._entry(source_id, "meta")[0])
+
+    def cite_item(self, answer: str, source_ids: List[str]) -> CiteItem:
+        """
+        Builds a CiteItem whose context is resolved from the store.
+
+        Args:
+            answer (str): The answer to cite.
+            source_ids (List[str]): The source_ids of the retrieved documents.
+
+        Returns:
+            CiteItem: The answer with the stored documents and meta as context.
+        """
+        context = [
+            {
+                "source_id": source_id,
+                "document": self.document(source_id),
+                "meta": self.meta(source_id),
+            }
+            for source_id in source_ids
+        ]
+        return CiteItem(answer=answer, context=context)
+
+    def sentence_embeddings(self, source_ids: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Maps every stored sentence of the given documents to its embedding.
+
+        Args:
+            source_ids (Iterable[str]): The documents to look up. Unknown ids are
+                                        skipped. Check `matches()` first if the
+                                        documents may have changed.
+
+        Returns:
+            Dict[str, np.ndarray]: A mapping from sentence text to its embedding row.
+        """
+        vectors = {}
+        for source_id in dict.fromkeys(source_ids):
+            if source_id in self:
+                vectors.update(
+                    zip(self.sentences(source_id), self.embeddings(source_id))
+                )
+        return vectors
+
+    @classmethod
+    def build(
+        cls,
+        path: str,
+        context: Iterable[Dict],
+        spacy_model: str = "sm",
+        embedding_model="sm",
+        batch_size: int = 256,
+        sentence_splitter: str = "parser",
+        n_process: int = 1,
+    ) -> "ContextStore":
+        """
+        Splits and embeds a corpus once and writes it as a memory-mapped store.
+
+        Documents are cleaned the same way as in CiteItem, split with the SpaCy
+        pipeline and embedded in batches of `batch_size`, so peak memory does not
+        grow with the corpus size.
+
+        Args:
+            path (str): The directory to write. It is created if needed.
+            context (Iterable[Dict]): Dictionaries with "source_id", "document" and
+                                      optional "meta" keys, as in CiteItem.
+            spacy_model (str, optional): Size of the SpaCy model. Defaults to "sm".
+            embedding_model (optional): The embedding model size or a custom
+                                        BaseEmbeddingModel instance. Defaults to "sm".
+            batch_size (int, optional): Documents parsed and sentences embedded per
+                                        batch. Defaults to 256.
+            sentence_splitter (str, optional): "full", "parser" or "sentencizer".
+                                        Defaults to "parser".
+            n_process (int, optional): Number of processes used to split documents.
+                                        Defaults to 1.
+
+        Returns:
+            ContextStore: The opened store.
+
+        Raises:
+            ValueError: If a document has no source_id, or the same source_id as
+                        an earlier document.
+        """
+        from rag_citation.pair.focus_word_in_cite_data import FindFocusWordInCiteData
+
+        if isinstance(embedding_model, str):
+            from rag_citation.base_model import EmbeddingModel
+
+            embedding_model = EmbeddingModel(embedding_model)
+        splitter = FindFocusWordInCiteData(
+            spacy_model, sentence_splitter=sentence_splitter, n_process=n_process
+        )
+
+        os.makedirs(path, exist_ok=True)
+        # A store left by a failed build must not open with a stale manifest.
+        for name in (MANIFEST_FILE, INDEX_FILE):
+            if os.path.exists(os.path.join(path, name)):
+                os.remove(os.path.join(path, name))
+        index_path = os.path.join(path, INDEX_FILE)
+        index = sqlite3.connect(index_path)
+        index.execute(
+            "CREATE TABLE documents (source_id TEXT PRIMARY KEY, sentence_start "
+            "INTEGER, sentence_end INTEGER, document_start INTEGER, document_end "
+            "INTEGER, content_hash TEXT, meta TEXT)"
+        )
+        sentence_offsets = [0]
+
+        try:
+            with index, open(
+                os.path.join(path, SENTENCES_FILE), "wb"
+            ) as sentences_file, open(
+                os.path.join(path, DOCUMENTS_FILE), "wb"
+            ) as documents_file:
+                for chunk in _chunks(context, batch_size):
+                    cleaned = [CiteItem._clean_text(item) for item in chunk]
+                    split = splitter.split_sentences(
+                        [item["document"] for item in cleaned], batch_size=batch_size
+                    )
+                    for item, clean_item, sentences in zip(chunk, cleaned, split):
+                        encoded_sentences = [
+                            sentence.encode("utf-8") for sentence in sentences
+                        ]
+                        encoded_document = item["document"].encode("utf-8")
+                        first_sentence = len(sentence_offsets) - 1
+                        document_start = documents_file.tell()
+                        if clean_item.get("source_id") is None:
+                            raise ValueError(
+                                "Every document of a context store needs a source_id."
+                            )
+                        try:
+                            index.execute(
+                                "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (
+                                    clean_item["source_id"],
+                                    first_sentence,
+                                    first_sentence + len(encoded_sentences),
+                                    document_start,
+                                    document_start + len(encoded_document),
+                                    _content_hash(clean_item["document"]),
+                                    json.dumps(item.get("meta")),
+                                ),
+                            )
+                        except sqlite3.IntegrityError:
+                            raise ValueError(
+                                f"Duplicate source_id {clean_item['source_id']!r} "
+                                "in the context. Every document must have a "
+                                "distinct source_id."
+                            ) from None
+
+                        for encoded in encoded_sentences:
+                            sentences_file.write(encoded)
+                            sentence_offsets.append(sentence_offsets[-1] + len(encoded))
+                        documents_file.write(encoded_document)
+        finally:
+            index.close()
+
+        np.save(
+            os.path.join(path, SENTENCE_OFFSETS_FILE),
+            np.asarray(sentence_offsets, dtype=np.int64),
+        )
+        dim = _write_embeddings(path, embedding_model, sentence_offsets, batch_size)
+
+        manifest = {
+            "model_id": getattr(
+                embedding_model, "model_name", type(embedding_model).__qualname__
+            ),
+            "dim": dim,
+        }
+        with open(os.path.join(path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        return cls(path)
+
+
+def _content_hash(document: str) -> str:
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def _chunks(items: Iterable, size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _to_numpy(embeddings) -> np.ndarray:
+    if hasattr(embeddings, "detach"):
+        embeddings = embeddings.detach().cpu().numpy()
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def _write_embeddings(
+    path: str, embedding_model, sentence_offsets: List[int], batch_size: int
+) -> int:
+    n_sentences = len(sentence_offsets) - 1
+    embeddings_path = os.path.join(path, EMBEDDINGS_FILE)
+    if n_sentences == 0:
+        np.save(embeddings_path, np.zeros((0, 0), dtype=np.float32))
+        return 0
+
+    matrix = None
+    with open(os.path.join(path, SENTENCES_FILE), "rb") as f:
+        blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for start in range(0, n_sentences, batch_size):
+                end = min(start + batch_size, n_sentences)
+                sentences = [
+                    blob[sentence_offsets[i] : sentence_offsets[i + 1]].decode("utf-8")
+                    for i in range(start, end)
+                ]
+                rows = _to_numpy(embedding_model.embed_batch(sentences))
+                if matrix is None:
+                    matrix = np.lib.format.open_memmap(
+                        embeddings_path,
+                        mode="w+",
+                        dtype=np.float32,
+                        shape=(n_sentences, rows.shape[1]),
+                    )
+                matrix[start:end] = rows
+        finally:
+            blob.close()
+
+    matrix.flush()
+    dim = matrix.shape[1]
+    del matrix
+    return dim
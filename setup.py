@@ -10,6 +10,7 @@ setup(
     install_requires=["spacy==3.7.5", "sentence_transformers==3.0.1"],
     extras_require={
         "llm": ["litellm>=1.40.0", "pydantic>=2.0.0"],
+        "onnx": ["onnxruntime>=1.16.0", "onnx>=1.14.0"],
     },
     description="RAG Citation is an project that combines Retrieval-Augmented Generation (RAG) with automatic citation generation. This tool is designed to enhance the credibility of AI-generated content by providing relevant citations for the information used in generating responses.",
     long_description=open("README.md").read(),
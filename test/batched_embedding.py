@@ -0,0 +1,40 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+import torch
+
+from rag_citation.base_model import BatchedEmbeddingModel
+
+# Offline models, see benchmarks/stubs.py: no model download is needed.
+from stubs import StubEmbeddingModel
+
+wrapped = StubEmbeddingModel(dim=64)
+model = BatchedEmbeddingModel(wrapped, max_wait_ms=20)
+
+print("------ START --------")
+# No worker thread is started by stats or empty calls.
+assert model.stats.submitted == 0 and model._batcher is None, model.stats
+assert model.embed_batch([]).shape == (0, 64)
+assert model._batcher is None
+
+# Concurrent calls are coalesced and each gets its own rows.
+requests = [[f"sentence {i}", "shared"] if i % 2 else [] for i in range(16)]
+with ThreadPoolExecutor(8) as executor:
+    results = list(executor.map(model.embed_batch, requests))
+for sentences, embeddings in zip(requests, results):
+    # Empty calls have the (0, dim) shape of the wrapped model's embed_batch([]).
+    assert embeddings.shape == (len(sentences), 64), embeddings.shape
+    if sentences:
+        assert torch.allclose(embeddings, wrapped.embed_batch(sentences))
+print(model.stats)
+assert model.stats.largest_batch > 1, model.stats
+
+model.close()
+assert model.stats.submitted == 0, model.stats
+assert model.embed_batch([]).shape == (0, 64)
+print("------ OK --------")
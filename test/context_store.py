@@ -0,0 +1,109 @@
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+from rag_citation import CiteItem, Inference
+from rag_citation.store import ContextStore
+
+# Offline models, see benchmarks/stubs.py: no model download is needed.
+from stubs import StubEmbeddingModel, install_stub_spacy
+from workload import WORKLOADS, generate_cite_items
+
+
+class RecordingEmbeddingModel(StubEmbeddingModel):
+    """StubEmbeddingModel that records the sentences it encodes."""
+
+    def __init__(self, dim: int = 384) -> None:
+        super().__init__(dim)
+        self.encoded = []
+
+    def embed_batch(self, sentences):
+        self.encoded.extend(sentences)
+        return super().embed_batch(sentences)
+
+
+class CountingContextStore(ContextStore):
+    """ContextStore that counts the documents it hashes."""
+
+    hashed = 0
+
+    def matches(self, source_id, document) -> bool:
+        CountingContextStore.hashed += 1
+        return super().matches(source_id, document)
+
+
+install_stub_spacy("sm")
+cite_items = generate_cite_items(WORKLOADS["small"])[:8]
+corpus = list(
+    {
+        document["source_id"]: document
+        for cite_item in cite_items
+        for document in cite_item.context
+    }.values()
+)
+plain = Inference(
+    spacy_model="sm", embedding_model=StubEmbeddingModel(), therhold_value=0.6
+)
+
+print("------ START --------")
+with tempfile.TemporaryDirectory() as directory:
+    store = ContextStore.build(
+        directory,
+        corpus,
+        spacy_model="sm",
+        embedding_model=StubEmbeddingModel(),
+        sentence_splitter="full",
+        batch_size=4,
+    )
+    assert len(store) == len(corpus)
+    store = CountingContextStore(directory)
+    embedding_model = RecordingEmbeddingModel()
+    stored = Inference(
+        spacy_model="sm",
+        embedding_model=embedding_model,
+        therhold_value=0.6,
+        context_store=store,
+    )
+
+    # Stored documents give the same citations, and only the answers are embedded.
+    for cite_item in cite_items:
+        assert stored(cite_item) == plain(cite_item)
+    assert stored.batch(cite_items) == plain.batch(cite_items)
+    answers = " ".join(cite_item.answer for cite_item in cite_items)
+    assert all(sentence in answers for sentence in embedding_model.encoded)
+
+    # Every document is hashed once per item, not once per lookup.
+    CountingContextStore.hashed = 0
+    stored(cite_items[0])
+    assert CountingContextStore.hashed == len(cite_items[0].context)
+
+    # A document edited since the build is split and embedded again.
+    edited = cite_items[0].context[0]["document"] + " Zyxwv opened in 1999."
+    stale = CiteItem(
+        answer=cite_items[0].answer + " Zyxwv was founded in 1999.",
+        context=[dict(cite_items[0].context[0], document=edited)]
+        + cite_items[0].context[1:],
+    )
+    assert not store.matches(stale.context[0]["source_id"], edited)
+    assert stored(stale) == plain(stale)
+    assert "Zyxwv opened in 1999." in embedding_model.encoded
+
+    # Duplicate or missing source_ids are rejected instead of left as dead data.
+    for context in (corpus[:2] + corpus[:1], corpus[:1] + [{"document": "No id."}]):
+        try:
+            ContextStore.build(
+                directory,
+                context,
+                spacy_model="sm",
+                embedding_model=StubEmbeddingModel(),
+                sentence_splitter="full",
+            )
+        except ValueError as e:
+            print(e)
+        else:
+            raise AssertionError("build accepted the context")
+print("------ OK --------")
@@ -15,6 +15,7 @@ from torch import Tensor
 ## ---- Custom Embedding Model ----
 ## Implement BaseEmbeddingModel to use any embedding model you want.
 ## The embedding() method must accept a sentence string and return a tensor.
+## Optionally implement embed_batch() to encode a list of sentences in one pass.
 
 class CustomEmbeddingModel(BaseEmbeddingModel):
     def __init__(self):
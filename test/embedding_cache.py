@@ -0,0 +1,89 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+import torch
+
+from rag_citation import Inference
+from rag_citation.base_model import CachedEmbeddingModel
+
+# Offline models, see benchmarks/stubs.py: no model download is needed.
+from stubs import StubEmbeddingModel, install_stub_spacy
+from workload import WORKLOADS, generate_cite_items
+
+
+class CountingEmbeddingModel(StubEmbeddingModel):
+    """StubEmbeddingModel that counts the sentences it encodes."""
+
+    def __init__(self, dim: int = 384) -> None:
+        super().__init__(dim)
+        self.encoded = 0
+
+    def embed_batch(self, sentences):
+        self.encoded += len(sentences)
+        return super().embed_batch(sentences)
+
+
+print("------ START --------")
+
+# LRU eviction: only the `max_size` most recently used sentences stay in memory.
+wrapped = CountingEmbeddingModel()
+model = CachedEmbeddingModel(wrapped, max_size=2)
+model.embed_batch(["a b", "c d", "e f"])
+assert model.stats.size == 2 and model.stats.evictions == 1, model.stats
+model.embed_batch(["e f"])
+assert model.stats.hits == 1 and wrapped.encoded == 3, model.stats
+model.embed_batch(["a b"])
+assert model.stats.misses == 4 and wrapped.encoded == 4, model.stats
+
+# Cached vectors are the wrapped model's, including duplicates within a batch.
+sentences = ["a b", "x y z", "a b"]
+assert torch.allclose(model.embed_batch(sentences), wrapped.embed_batch(sentences))
+
+# Each LRU entry owns its row, so `max_size` bounds the memory retained.
+model = CachedEmbeddingModel(StubEmbeddingModel(dim=1024), max_size=10)
+for batch in range(50):
+    model.embed_batch([f"batch {batch} sentence {i}" for i in range(1000)])
+retained = sum(vector.untyped_storage().nbytes() for vector in model._cache.values())
+print(f"retained {retained} bytes")
+assert retained == 10 * 1024 * 4, retained
+
+# Disk persistence: a new instance on the same file encodes nothing.
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, "embeddings.db")
+    model = CachedEmbeddingModel(CountingEmbeddingModel(), path=path)
+    first = model.embed_batch(["a b", "c d"])
+    model.close()
+
+    wrapped = CountingEmbeddingModel()
+    model = CachedEmbeddingModel(wrapped, path=path)
+    assert torch.equal(model.embed_batch(["a b", "c d"]), first)
+    assert wrapped.encoded == 0 and model.stats.disk_hits == 2, model.stats
+
+    # Another model identity does not read the entries of the first one.
+    other = CachedEmbeddingModel(wrapped, path=path, model_id="other")
+    other.embed_batch(["a b"])
+    assert wrapped.encoded == 1, wrapped.encoded
+    model.close()
+    other.close()
+
+# Citations are the same with and without the cache, and the second pass is all hits.
+install_stub_spacy("sm")
+cite_items = generate_cite_items(WORKLOADS["small"])[:8]
+plain = Inference(
+    spacy_model="sm", embedding_model=StubEmbeddingModel(), therhold_value=0.6
+)
+model = CachedEmbeddingModel(StubEmbeddingModel())
+cached = Inference(spacy_model="sm", embedding_model=model, therhold_value=0.6)
+expected = [plain(cite_item) for cite_item in cite_items]
+assert [cached(cite_item) for cite_item in cite_items] == expected
+misses = model.stats.misses
+assert [cached(cite_item) for cite_item in cite_items] == expected
+assert model.stats.misses == misses, model.stats
+print(model.stats)
+print("------ OK --------")
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+from rag_citation import Inference
+
+# Offline models, see benchmarks/stubs.py: no model download is needed.
+from stubs import StubEmbeddingModel, install_stub_spacy
+
+install_stub_spacy("sm")
+inference = Inference(spacy_model="sm", embedding_model=StubEmbeddingModel())
+label_index = {"apple": ("ORG", "ENTITY"), "apple inc": ("ORG", "ENTITY")}
+
+
+def below_threshold() -> dict:
+    return {
+        0: {"word": ["Apple Inc"], "score": 0.5},
+        1: {"word": ["Apple"], "score": 0.4},
+        2: {"word": ["Banana"], "score": 0.9},
+    }
+
+
+print("------ START --------")
+# A pair whose word contains the entity competes with a pair with the word itself:
+# the best score wins, whichever kind of match it is.
+results, not_found, found_word = inference._find_label(
+    label_index, ["Apple"], below_threshold()
+)
+print(list(results), not_found, found_word)
+assert list(results) == [0], results
+assert results[0]["label"] == [{"word": "Apple Inc", "entity_name": "ORG"}]
+assert not_found == [] and found_word == ["Apple"]
+
+# Matching ignores case, and a word no pair contains stays not found.
+results, not_found, found_word = inference._find_label(
+    label_index, ["apple inc", "Cherry"], below_threshold()
+)
+assert list(results) == [0] and not_found == ["Cherry"], (results, not_found)
+print("------ OK --------")
@@ -0,0 +1,67 @@
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+from rag_citation import Inference
+from rag_citation.llm import prune_context
+from rag_citation.llm.prompt import build_citation_prompt
+
+# Offline models, see benchmarks/stubs.py: no model download or API key is needed.
+from stubs import StubEmbeddingModel, StubLiteLLM, install_stub_spacy
+from workload import WORKLOADS, generate_cite_items
+
+
+class RecordingLiteLLM(StubLiteLLM):
+    """StubLiteLLM that keeps the messages of every call."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = []
+
+    def _response(self, messages: list):
+        self.calls.append(messages)
+        return super()._response(messages)
+
+
+def fallback_prompt(cite_item, llm_token_budget=None) -> list:
+    """The messages the hybrid method sends to the LLM for an item."""
+    inference = Inference(
+        method="hybrid",
+        spacy_model="sm",
+        embedding_model=StubEmbeddingModel(),
+        therhold_value=0.6,
+        model="test/stub",
+        llm_token_budget=llm_token_budget,
+    )
+    litellm = RecordingLiteLLM()
+    inference._llm_citation._litellm = litellm
+    inference(cite_item)
+    asyncio.run(inference.acall(cite_item))
+    # The sync and async fallbacks send the same prompt.
+    assert len(litellm.calls) == 2, litellm.calls
+    assert litellm.calls[0] == litellm.calls[1]
+    return litellm.calls[0]
+
+
+install_stub_spacy("sm")
+cite_item = generate_cite_items(WORKLOADS["medium"])[0]
+# A sentence no document supports, so the non-LLM pipeline leaves it to the LLM.
+cite_item.answer += " The weather was pleasant on Tuesday."
+
+print("------ START --------")
+full = fallback_prompt(cite_item)
+pruned = fallback_prompt(cite_item, llm_token_budget=64)
+print(len(full[1]["content"]), len(pruned[1]["content"]))
+assert len(pruned[1]["content"]) < len(full[1]["content"])
+
+# The fallback prunes against the unresolved sentences it sends, not the full answer.
+reduced_answer = pruned[1]["content"].split("\n\nSource Documents:")[0]
+reduced_answer = reduced_answer[len("Answer:\n") :]
+assert reduced_answer != cite_item.answer
+context, _ = prune_context(reduced_answer, cite_item.context, token_budget=64)
+assert pruned == build_citation_prompt(reduced_answer, context), pruned
+print("------ OK --------")
@@ -0,0 +1,69 @@
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+from rag_citation import Inference
+from rag_citation.base_model import CachedEmbeddingModel
+from rag_citation.llm import InMemoryCitationCache, SqliteCitationCache
+
+# Offline models, see benchmarks/stubs.py: no model download or API key is needed.
+from stubs import StubEmbeddingModel, StubLiteLLM, install_stub_spacy
+from workload import WORKLOADS, generate_cite_items
+
+# At import time, so spawned workers, which import this module, use the stub too.
+install_stub_spacy("sm")
+
+
+def main() -> None:
+    cite_items = generate_cite_items(WORKLOADS["small"])[:12]
+
+    print("------ START --------")
+    with tempfile.TemporaryDirectory() as directory:
+        embedding_model = CachedEmbeddingModel(
+            StubEmbeddingModel(), path=f"{directory}/embeddings.db"
+        )
+        inference = Inference(
+            spacy_model="sm", embedding_model=embedding_model, therhold_value=0.6
+        )
+        expected = [inference(cite_item) for cite_item in cite_items]
+
+        # Spawned workers get a pickled copy, which reopens the sqlite file.
+        outputs = inference.map(
+            cite_items, workers=2, chunksize=3, start_method="spawn"
+        )
+        assert outputs == expected
+        embedding_model.close()
+
+        # The LLM pipelines pickle after a call, once litellm is imported.
+        for cache in (
+            InMemoryCitationCache(),
+            SqliteCitationCache(f"{directory}/citations.db"),
+        ):
+            inference = Inference(
+                method="hybrid",
+                spacy_model="sm",
+                embedding_model=StubEmbeddingModel(),
+                therhold_value=0.6,
+                model="test/stub",
+                llm_cache=cache,
+            )
+            # Imports and keeps the litellm module, as the first LLM call does.
+            inference._llm_citation._client()
+            copy = pickle.loads(pickle.dumps(inference))
+            assert copy._llm_citation._litellm is None
+
+            inference._llm_citation._litellm = StubLiteLLM()
+            copy._llm_citation._litellm = StubLiteLLM()
+            assert copy(cite_items[0]) == inference(cite_items[0])
+            print(type(cache).__name__, "pickled")
+    print("------ OK --------")
+
+
+# Spawned workers import this module, so the work is guarded by __main__.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import json
+import sys
+import types
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+from rag_citation import CiteItem, Inference
+from rag_citation.llm import prune_context
+from rag_citation.llm.prune import snippet_document_index
+
+# Offline LLM, see benchmarks/stubs.py: no API key is needed.
+from stubs import StubLiteLLM
+
+answer = "Tesla makes electric cars. SpaceX builds rockets."
+context = [
+    {"source_id": "shared", "document": "Tesla makes electric cars in Texas."},
+    {"source_id": "shared", "document": "SpaceX builds rockets in Florida."},
+    {"document": "Tesla sells electric cars worldwide."},
+    {"document": "SpaceX builds rockets for NASA."},
+]
+
+print("------ START --------")
+pruned, snippet_sources = prune_context(answer, context, token_budget=1000)
+snippet_ids = [snippet["source_id"] for snippet in pruned]
+print(snippet_ids)
+# One snippet per document, with ids unique even when source_ids are shared or missing.
+assert len(set(snippet_ids)) == len(context), snippet_ids
+assert [snippet_document_index(snippet_id) for snippet_id in snippet_ids] == [
+    0,
+    1,
+    2,
+    3,
+]
+assert [snippet_sources[snippet_id] for snippet_id in snippet_ids] == [
+    "shared",
+    "shared",
+    "unknown",
+    "unknown",
+]
+
+
+class CitingLiteLLM(StubLiteLLM):
+    """StubLiteLLM citing the second sentence with the second snippet it was sent."""
+
+    def _response(self, messages: list):
+        response = super()._response(messages)
+        snippet_id = snippet_ids[1]
+        assert f"[source_id: {snippet_id}]" in messages[1]["content"], messages[1][
+            "content"
+        ]
+        response.choices[0].message.content = json.dumps(
+            {
+                "citations": [
+                    {
+                        "sentence": "SpaceX builds rockets.",
+                        "source_document": snippet_id,
+                    }
+                ]
+            }
+        )
+        return response
+
+
+inference = Inference(method="llm", model="test/stub", llm_token_budget=1000)
+inference._llm_citation._litellm = CitingLiteLLM()
+output = inference(CiteItem(answer=answer, context=context))
+cite_document = output.citation[0]["cite_document"]
+print(cite_document)
+# Attributed to the second document, not to the first one with the same source_id.
+assert [document["source_id"] for document in cite_document] == ["shared"]
+assert cite_document[0]["document"] == context[1]["document"]
+print("------ OK --------")
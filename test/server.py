@@ -0,0 +1,72 @@
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+from rag_citation import Inference
+from rag_citation.server import CitationServer
+
+# Offline models, see benchmarks/stubs.py: no model download is needed.
+from stubs import StubEmbeddingModel, install_stub_spacy
+from workload import WORKLOADS, generate_cite_items
+
+install_stub_spacy("sm")
+inference = Inference(
+    spacy_model="sm", embedding_model=StubEmbeddingModel(), therhold_value=0.6
+)
+server = CitationServer(
+    ("127.0.0.1", 0), [inference.warmup()], max_batch_size=32, max_wait_ms=50
+)
+port = server.server_address[1]
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def post(payload: dict) -> tuple:
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/cite/non-llm",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+payloads = [
+    {"answer": cite_item.answer, "context": cite_item.context}
+    for cite_item in generate_cite_items(WORKLOADS["small"])[:16]
+]
+# Valid for CiteItem, but the pipeline needs a "source_id" in every context entry.
+bad = {
+    "answer": payloads[0]["answer"],
+    "context": [
+        {"document": document["document"]} for document in payloads[0]["context"]
+    ],
+}
+
+print("------ START --------")
+with ThreadPoolExecutor(len(payloads) + 1) as executor:
+    responses = list(executor.map(post, payloads[:8] + [bad] + payloads[8:]))
+statuses = [status for status, _ in responses]
+print(statuses)
+
+assert statuses.count(200) == len(payloads), statuses
+assert statuses[8] == 500, statuses[8]
+assert responses[0][1] == post(payloads[0])[1]
+
+metrics = json.loads(urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read())
+print(metrics["batcher"])
+# The bad request was batched with good ones.
+assert metrics["batcher"]["largest_batch"] > 1, metrics["batcher"]
+server.shutdown()
+server.server_close()
+print("------ OK --------")
@@ -0,0 +1,76 @@
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+from rag_citation import Inference
+
+# Offline models, see benchmarks/stubs.py: no model download is needed.
+from stubs import StubEmbeddingModel, install_stub_spacy
+from workload import WORKLOADS, generate_cite_items
+
+# Fallback citations of entities left uncited get this score instead of a cosine.
+FALLBACK_SCORE = 100
+
+
+def chunks(text: str, size: int) -> list:
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+async def achunks(text: str, size: int):
+    for chunk in chunks(text, size):
+        yield chunk
+
+
+async def astream(inference, text: str, size: int, context: list) -> list:
+    return [entry async for entry in inference.astream(achunks(text, size), context)]
+
+
+def scored(cite_documents: list) -> list:
+    """The above-threshold citations, rounded: batch composition moves the last digits."""
+    return sorted(
+        (cite_document["source_id"], round(cite_document["score"], 4))
+        for cite_document in cite_documents
+        if cite_document["score"] != FALLBACK_SCORE
+    )
+
+
+install_stub_spacy("sm")
+inference = Inference(
+    spacy_model="sm", embedding_model=StubEmbeddingModel(), therhold_value=0.6
+)
+cite_items = generate_cite_items(WORKLOADS["small"])[:10]
+cite_items += generate_cite_items(WORKLOADS["medium"])[:10]
+
+print("------ START --------")
+for cite_item in cite_items:
+    output = inference(cite_item)
+    expected = {
+        citation["answer_sentences"]: scored(citation["cite_document"])
+        for citation in output.citation
+    }
+
+    entries = list(inference.stream(chunks(cite_item.answer, 7), cite_item.context))
+    # Every sentence closes once, whatever the chunk size, and async is the same.
+    assert entries == list(
+        inference.stream(chunks(cite_item.answer, 50), cite_item.context)
+    )
+    assert entries == asyncio.run(
+        astream(inference, cite_item.answer, 3, cite_item.context)
+    )
+    assert " ".join(entry["answer_sentences"] for entry in entries).split() == (
+        cite_item.answer.split()
+    )
+
+    # Sentences above the threshold are cited as with the whole answer. Fallback
+    # citations can differ: a sentence cannot know which entities later ones cite.
+    streamed = {
+        entry["answer_sentences"]: scored(entry["cite_document"]) for entry in entries
+    }
+    for sentence in set(expected) | set(streamed):
+        assert streamed.get(sentence, []) == expected.get(sentence, []), sentence
+print(f"{len(cite_items)} items")
+print("------ OK --------")